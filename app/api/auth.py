@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 
 from app.core import app_logger, security, settings
+from app.core.response_cache import cached_response
 from app.models.user import Token, User
 
 # Create a router for authentication endpoints
@@ -12,27 +13,53 @@ router = APIRouter(
 )
 
 
+# This is a placeholder - in a real app, users would live in a database.
+# The demo user's password is "password" (bcrypt, cost 12).
+fake_users_db = {
+    "demo": {
+        "hashed_password": "$2b$12$mPMmIC0lrEJ73JpzDv3mCeHZON9atUPnY21Do6E7eiysTm8e5J92O",
+        "roles": ["user"],
+    },
+}
+
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     """OAuth2 compatible token login, get an access token for future requests."""
-    # This is a placeholder - in a real app, you would verify against a database
-    # For demo purposes, we'll accept a hardcoded user
-    if form_data.username != "demo" or form_data.password != "password":
-        app_logger.warning(f"Failed login attempt for user: {form_data.username}")
+    user = fake_users_db.get(form_data.username)
+    try:
+        verified, new_hash = await security.check_password(
+            form_data.password, user["hashed_password"] if user else None
+        )
+    except security.PasswordPoolSaturated:
+        app_logger.warning("Login rejected: password pool is saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
+        )
+    
+    if not verified:
+        app_logger.warning("Failed login attempt for user: %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if new_hash is not None:
+        # The configured bcrypt cost changed; store the upgraded hash
+        user["hashed_password"] = new_hash
+        app_logger.info("Rehashed password of user %s with the current cost", form_data.username)
+    
     # Create access token with configured expiration time
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = security.create_access_token(
-        data={"sub": form_data.username, "roles": ["user"]},
+        data={"sub": form_data.username, "roles": user["roles"]},
         expires_delta=access_token_expires
     )
     
-    app_logger.info(f"User {form_data.username} logged in successfully")
+    app_logger.info("User %s logged in successfully", form_data.username)
     
     return {
         "access_token": access_token,
@@ -41,7 +68,14 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     }
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(security.oauth2_scheme)):
+    """Revoke the caller's access token before it expires."""
+    await security.revoke_token(token)
+
+
 @router.get("/me", response_model=User)
+@cached_response(ttl=30, vary_on=lambda params: params["current_user"].username)
 async def read_users_me(current_user = Depends(security.get_current_active_user)):
     """Get current user information."""
     # This is a placeholder - in a real app, you would fetch from a database
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.core import app_logger, security
+from app.core.response_cache import cached_response
+from app.models.example import ExampleModel, ExampleResponse
+
+# Create a router for the example endpoints
+router = APIRouter(
+    prefix="/examples",
+    tags=["examples"],
+)
+
+
+# This is a placeholder - in a real app, examples would live in a database.
+fake_examples_db: Dict[int, Dict[str, Any]] = {
+    1: {
+        "id": 1,
+        "title": "Example 1",
+        "description": "This is example 1",
+        "owner": "demo",
+        "created_at": datetime(2023, 1, 1),
+        "updated_at": None,
+    },
+    2: {
+        "id": 2,
+        "title": "Example 2",
+        "description": "This is example 2",
+        "owner": "demo",
+        "created_at": datetime(2023, 1, 2),
+        "updated_at": None,
+    },
+}
+
+
+@router.get("/", response_model=List[ExampleResponse])
+@cached_response(ttl=30, stale_ttl=60, vary_on_auth=False)
+async def list_examples(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100)):
+    """List examples; public, so one cached page serves every caller."""
+    return list(fake_examples_db.values())[skip:skip + limit]
+
+
+@router.get("/{example_id}", response_model=ExampleResponse)
+async def read_example(example_id: int):
+    """Get a single example by id."""
+    example = fake_examples_db.get(example_id)
+    if example is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Example not found")
+    return example
+
+
+@router.post("/", response_model=ExampleResponse, status_code=status.HTTP_201_CREATED)
+async def create_example(example: ExampleModel, current_user = Depends(security.get_current_active_user)):
+    """Create an example owned by the current user."""
+    example_id = max(fake_examples_db, default=0) + 1
+    fake_examples_db[example_id] = {
+        "id": example_id,
+        "title": example.title,
+        "description": example.description,
+        "owner": current_user.username,
+        "created_at": datetime.now(),
+        "updated_at": None,
+    }
+    # The cached list no longer matches
+    list_examples.cache.clear()
+    app_logger.info("User %s created example %s", current_user.username, example_id)
+    return fake_examples_db[example_id]
@@ -1,118 +1,221 @@
-"""Portfolio UI components for the AI Engineer portfolio"""
+"""Portfolio UI components for the AI Engineer portfolio
+
+Static markup for every section is produced by ``build_html`` helpers and kept
+in the shared render cache, so each visitor only instantiates the few live
+elements that carry event handlers (buttons and the contact form).
+"""
 
 from nicegui import ui
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from app.core.assets import ImageAsset
+from app.core.image_derivatives import picture_html
+from app.core.render_cache import render_cache
 
 
 class HeroSection:
     """Hero section component with professional imagery"""
-    
+
     @staticmethod
-    def render(assets: Dict[str, List[ImageAsset]]):
+    def render(assets: Dict[str, List[ImageAsset]], portfolio_service=None):
         """Render the hero section"""
         with ui.element('div').classes('hero-section'):
-            ui.element('div').classes('hero-background')
+            # Markup rather than .style(): NiceGUI splits styles on ";", which
+            # breaks the data: URI of the inline placeholder
+            ui.html(render_cache.get('hero-background', lambda: HeroSection.build_background_html(assets)))
             with ui.element('div').classes('hero-content'):
-                ui.html('<h1 class="hero-title">AI Engineer & ML Specialist</h1>')
-                ui.html('<p class="hero-subtitle">Transforming Data into Intelligent Solutions</p>')
-                ui.html('''
-                <p class="hero-description">
-                    Passionate about building cutting-edge AI systems that solve real-world problems. 
-                    Specialized in machine learning, deep learning, and scalable AI architectures.
-                </p>
-                ''')
+                ui.html(render_cache.get('hero', HeroSection.build_html))
+                if portfolio_service is not None:
+                    HeroSection._render_cta_buttons(portfolio_service)
+
+    @staticmethod
+    def build_html() -> str:
+        """Build the static hero markup"""
+        return '''
+        <h1 class="hero-title">AI Engineer & ML Specialist</h1>
+        <p class="hero-subtitle">Transforming Data into Intelligent Solutions</p>
+        <p class="hero-description">
+            Passionate about building cutting-edge AI systems that solve real-world problems.
+            Specialized in machine learning, deep learning, and scalable AI architectures.
+        </p>
+        '''
+
+    @staticmethod
+    def build_background_html(assets: Dict[str, List[ImageAsset]]) -> str:
+        """Build the hero background element"""
+        return f'<div class="hero-background" style="{HeroSection.build_background_style(assets)}"></div>'
+
+    @staticmethod
+    def build_background_style(assets: Dict[str, List[ImageAsset]]) -> str:
+        """Layer the dark overlay, the hero image and its inline placeholder"""
+        hero_assets = assets.get('hero', [])
+        if not hero_assets:
+            return ''
+
+        asset = hero_assets[0]
+        layers = ['linear-gradient(rgba(0,0,0,0.4), rgba(0,0,0,0.6))', f"url('{asset.local_url}')"]
+        if asset.placeholder:
+            layers.append(f"url('{asset.placeholder}')")
+        color = asset.dominant_color or 'transparent'
+        return f"background: {', '.join(layers)}; background-color: {color}; background-size: cover; background-position: center;"
+
+    @staticmethod
+    def _render_cta_buttons(portfolio_service):
+        """Render the call-to-action buttons"""
+        with ui.element('div').classes('cta-buttons'):
+            ui.button('View My Work', on_click=lambda: ui.run_javascript('document.querySelector(".projects-section").scrollIntoView({behavior: "smooth"})')).classes('btn-primary')
+            ui.button('Download Resume', on_click=lambda: portfolio_service.download_resume()).classes('btn-secondary')
 
 
 class AboutSection:
     """About section with professional imagery"""
-    
+
     @staticmethod
     def render(assets: Dict[str, List[ImageAsset]]):
         """Render the about section"""
-        with ui.element('section').classes('section'):
-            with ui.element('div').classes('portfolio-container'):
-                ui.html('<h2 class="section-title">About Me</h2>')
-                with ui.row().classes('w-full gap-8 items-center'):
-                    with ui.column().classes('flex-1'):
-                        ui.html('''
+        ui.html(render_cache.get('about', lambda: AboutSection.build_html(assets)))
+
+    @staticmethod
+    def build_html(assets: Dict[str, List[ImageAsset]]) -> str:
+        """Build the static about markup"""
+        professional_assets = assets.get('professional', [])
+        image_html = ''
+        if professional_assets:
+            picture = picture_html(
+                professional_assets[0],
+                sizes="(max-width: 768px) 100vw, 400px",
+                css_class="w-full rounded-lg shadow-lg",
+                style="max-width: 400px; height: 300px; object-fit: cover;",
+            )
+            image_html = f'''
+                <div class="flex flex-col flex-1">
+                    {picture}
+                </div>
+            '''
+
+        return f'''
+        <section class="section">
+            <div class="portfolio-container">
+                <h2 class="section-title">About Me</h2>
+                <div class="flex flex-row flex-wrap w-full gap-8 items-center">
+                    <div class="flex flex-col flex-1">
                         <div style="font-size: 1.1rem; line-height: 1.8; color: #555;">
                             <p style="margin-bottom: 1.5rem;">
-                                I'm a passionate AI Engineer with 5+ years of experience in developing and deploying 
-                                machine learning solutions at scale. My expertise spans across computer vision, 
+                                I'm a passionate AI Engineer with 5+ years of experience in developing and deploying
+                                machine learning solutions at scale. My expertise spans across computer vision,
                                 natural language processing, and predictive analytics.
                             </p>
                             <p style="margin-bottom: 1.5rem;">
-                                I've led cross-functional teams to deliver AI-powered products that have impacted 
+                                I've led cross-functional teams to deliver AI-powered products that have impacted
                                 millions of users, from recommendation systems to autonomous decision-making platforms.
                             </p>
                             <p>
-                                When I'm not coding, you'll find me contributing to open-source projects, 
+                                When I'm not coding, you'll find me contributing to open-source projects,
                                 writing technical blogs, or exploring the latest research in AI/ML.
                             </p>
                         </div>
-                        ''')
+                    </div>
+                    {image_html}
+                </div>
+            </div>
+        </section>
+        '''
 
 
 class SkillsSection:
     """Skills section with technology visualizations"""
-    
+
+    SKILLS = [
+        {
+            "icon": "fas fa-brain",
+            "title": "Machine Learning",
+            "description": "Advanced expertise in supervised, unsupervised, and reinforcement learning algorithms.",
+            "technologies": ["Scikit-learn", "XGBoost", "LightGBM", "Feature Engineering"]
+        },
+        {
+            "icon": "fas fa-network-wired",
+            "title": "Deep Learning",
+            "description": "Building and optimizing neural networks for computer vision and NLP applications.",
+            "technologies": ["TensorFlow", "PyTorch", "Keras", "Transformers"]
+        },
+        {
+            "icon": "fas fa-cloud",
+            "title": "MLOps & Deployment",
+            "description": "End-to-end ML pipeline development and production deployment at scale.",
+            "technologies": ["Docker", "Kubernetes", "MLflow", "AWS/GCP"]
+        },
+        {
+            "icon": "fas fa-database",
+            "title": "Data Engineering",
+            "description": "Building robust data pipelines and infrastructure for ML workloads.",
+            "technologies": ["Apache Spark", "Airflow", "PostgreSQL", "Redis"]
+        }
+    ]
+
     @staticmethod
     def render(assets: Dict[str, List[ImageAsset]]):
         """Render the skills section"""
-        with ui.element('section').classes('section').style('background: #f8f9fa;'):
-            with ui.element('div').classes('portfolio-container'):
-                ui.html('<h2 class="section-title">Technical Expertise</h2>')
-                with ui.element('div').classes('skills-grid'):
-                    SkillsSection._render_skill_cards()
-    
+        ui.html(render_cache.get('skills', SkillsSection.build_html))
+
     @staticmethod
-    def _render_skill_cards():
-        """Render individual skill cards"""
-        skills = [
-            {
-                "icon": "fas fa-brain",
-                "title": "Machine Learning",
-                "description": "Advanced expertise in supervised, unsupervised, and reinforcement learning algorithms.",
-                "technologies": ["Scikit-learn", "XGBoost", "LightGBM", "Feature Engineering"]
-            },
-            {
-                "icon": "fas fa-network-wired",
-                "title": "Deep Learning",
-                "description": "Building and optimizing neural networks for computer vision and NLP applications.",
-                "technologies": ["TensorFlow", "PyTorch", "Keras", "Transformers"]
-            },
-            {
-                "icon": "fas fa-cloud",
-                "title": "MLOps & Deployment",
-                "description": "End-to-end ML pipeline development and production deployment at scale.",
-                "technologies": ["Docker", "Kubernetes", "MLflow", "AWS/GCP"]
-            },
-            {
-                "icon": "fas fa-database",
-                "title": "Data Engineering",
-                "description": "Building robust data pipelines and infrastructure for ML workloads.",
-                "technologies": ["Apache Spark", "Airflow", "PostgreSQL", "Redis"]
-            }
-        ]
-        
-        for skill in skills:
-            with ui.element('div').classes('skill-card'):
-                ui.html(f'<i class="{skill["icon"]} skill-icon"></i>')
-                ui.html(f'<h3 style="font-size: 1.3rem; font-weight: 600; margin-bottom: 1rem;">{skill["title"]}</h3>')
-                ui.html(f'''
+    def build_html() -> str:
+        """Build the static skills markup"""
+        return f'''
+        <section class="section" style="background: #f8f9fa;">
+            <div class="portfolio-container">
+                <h2 class="section-title">Technical Expertise</h2>
+                <div class="skills-grid">
+                    {SkillsSection._build_skill_cards()}
+                </div>
+            </div>
+        </section>
+        '''
+
+    @staticmethod
+    def _build_skill_cards() -> str:
+        """Build individual skill cards"""
+        cards = []
+        for skill in SkillsSection.SKILLS:
+            cards.append(f'''
+            <div class="skill-card">
+                <i class="{skill["icon"]} skill-icon"></i>
+                <h3 style="font-size: 1.3rem; font-weight: 600; margin-bottom: 1rem;">{skill["title"]}</h3>
                 <p style="color: #666; margin-bottom: 1rem;">
                     {skill["description"]}
                 </p>
                 <div style="display: flex; flex-wrap: wrap; gap: 0.5rem;">
                     {"".join([f'<span class="tech-tag">{tech}</span>' for tech in skill["technologies"]])}
                 </div>
-                ''')
+            </div>
+            ''')
+        return "".join(cards)
 
 
 class ProjectsSection:
     """Projects section with interactive galleries"""
-    
+
+    PROJECTS = [
+        {
+            "title": "Intelligent Document Processing System",
+            "description": "Built an end-to-end document processing system using computer vision and NLP to extract and classify information from unstructured documents with 95% accuracy.",
+            "technologies": ["PyTorch", "OpenCV", "Transformers", "FastAPI"],
+            "image_index": 0
+        },
+        {
+            "title": "Real-time Recommendation Engine",
+            "description": "Developed a scalable recommendation system serving 10M+ users with sub-100ms latency using collaborative filtering and deep learning techniques.",
+            "technologies": ["TensorFlow", "Redis", "Kafka", "Kubernetes"],
+            "image_index": 1
+        },
+        {
+            "title": "Conversational AI Assistant",
+            "description": "Created an intelligent chatbot using large language models and RAG architecture to provide accurate responses to complex technical queries.",
+            "technologies": ["LangChain", "OpenAI API", "Vector DB", "Streamlit"],
+            "image_index": 2
+        }
+    ]
+
+    PLACEHOLDER_IMAGE = 'https://via.placeholder.com/350x200/667eea/ffffff?text=AI+Project'
+
     @staticmethod
     def render(assets: Dict[str, List[ImageAsset]]):
         """Render the projects section"""
@@ -121,97 +224,124 @@ class ProjectsSection:
                 ui.html('<h2 class="section-title">Featured Projects</h2>')
                 with ui.element('div').classes('projects-grid'):
                     ProjectsSection._render_project_cards(assets)
-    
+
     @staticmethod
     def _render_project_cards(assets: Dict[str, List[ImageAsset]]):
         """Render individual project cards"""
-        projects = [
-            {
-                "title": "Intelligent Document Processing System",
-                "description": "Built an end-to-end document processing system using computer vision and NLP to extract and classify information from unstructured documents with 95% accuracy.",
-                "technologies": ["PyTorch", "OpenCV", "Transformers", "FastAPI"],
-                "image_index": 0
-            },
-            {
-                "title": "Real-time Recommendation Engine",
-                "description": "Developed a scalable recommendation system serving 10M+ users with sub-100ms latency using collaborative filtering and deep learning techniques.",
-                "technologies": ["TensorFlow", "Redis", "Kafka", "Kubernetes"],
-                "image_index": 1
-            },
-            {
-                "title": "Conversational AI Assistant",
-                "description": "Created an intelligent chatbot using large language models and RAG architecture to provide accurate responses to complex technical queries.",
-                "technologies": ["LangChain", "OpenAI API", "Vector DB", "Streamlit"],
-                "image_index": 2
-            }
-        ]
-        
         project_assets = assets.get('projects', [])
-        
-        for i, project in enumerate(projects):
+
+        for i, project in enumerate(ProjectsSection.PROJECTS):
+            # Use project image if available, otherwise use placeholder
+            asset = project_assets[i] if i < len(project_assets) else None
+
             with ui.element('div').classes('project-card'):
-                # Use project image if available, otherwise use placeholder
-                if i < len(project_assets):
-                    ui.image(project_assets[i].primary_url).classes('project-image')
-                else:
-                    ui.image('https://via.placeholder.com/350x200/667eea/ffffff?text=AI+Project').classes('project-image')
-                
-                with ui.element('div').classes('project-content'):
-                    ui.html(f'<h3 class="project-title">{project["title"]}</h3>')
-                    ui.html(f'<p class="project-description">{project["description"]}</p>')
-                    
-                    with ui.element('div').classes('project-tech'):
-                        for tech in project["technologies"]:
-                            ui.html(f'<span class="tech-tag">{tech}</span>')
-                    
-                    ui.button('View Details', 
+                ui.html(render_cache.get(
+                    f'project-card-{i}',
+                    lambda: ProjectsSection.build_card_html(project, asset)
+                ))
+
+                with ui.element('div').classes('project-content').style('padding-top: 0;'):
+                    ui.button('View Details',
                              on_click=lambda p=project: ui.notify(f'Details for {p["title"]} would open here')
-                             ).classes('btn-primary').style('margin-top: 1rem;')
+                             ).classes('btn-primary')
+
+    @staticmethod
+    def build_html(assets: Dict[str, List[ImageAsset]]) -> str:
+        """Build the projects section without the per-client buttons"""
+        project_assets = assets.get('projects', [])
+        cards = []
+        for i, project in enumerate(ProjectsSection.PROJECTS):
+            asset = project_assets[i] if i < len(project_assets) else None
+            cards.append(f'<div class="project-card">{ProjectsSection.build_card_html(project, asset)}</div>')
+        return f'''
+        <section class="section projects-section">
+            <div class="portfolio-container">
+                <h2 class="section-title">Featured Projects</h2>
+                <div class="projects-grid">{"".join(cards)}</div>
+            </div>
+        </section>
+        '''
+
+    @staticmethod
+    def build_card_html(project: Dict[str, Any], asset: Optional[ImageAsset]) -> str:
+        """Build the static markup of a single project card"""
+        if asset is not None:
+            # Cards are at most ~400px wide (100vw on mobile), so phones pick the
+            # 320/640w variants instead of the 1200px original
+            image_html = picture_html(
+                asset,
+                sizes="(max-width: 768px) 100vw, 400px",
+                css_class="project-image",
+            )
+        else:
+            image_html = f'<img src="{ProjectsSection.PLACEHOLDER_IMAGE}" alt="AI project" loading="lazy" class="project-image">'
+
+        return f'''
+        {image_html}
+        <div class="project-content" style="padding-bottom: 0;">
+            <h3 class="project-title">{project["title"]}</h3>
+            <p class="project-description">{project["description"]}</p>
+            <div class="project-tech">
+                {"".join([f'<span class="tech-tag">{tech}</span>' for tech in project["technologies"]])}
+            </div>
+        </div>
+        '''
 
 
 class ExperienceSection:
     """Experience section with professional timeline"""
-    
+
+    EXPERIENCES = [
+        {
+            "title": "Senior AI Engineer",
+            "company": "TechCorp Inc.",
+            "period": "2021 - Present",
+            "achievements": [
+                "Led a team of 8 engineers to develop ML-powered features serving 50M+ users",
+                "Improved model accuracy by 23% through advanced feature engineering and ensemble methods",
+                "Reduced inference latency by 40% through model optimization and efficient deployment strategies",
+                "Established MLOps practices reducing model deployment time from weeks to hours"
+            ]
+        },
+        {
+            "title": "Machine Learning Engineer",
+            "company": "DataTech Solutions",
+            "period": "2019 - 2021",
+            "achievements": [
+                "Developed computer vision models for autonomous vehicle perception systems",
+                "Built real-time data processing pipelines handling 1TB+ daily data volume",
+                "Collaborated with product teams to integrate ML capabilities into customer-facing applications",
+                "Mentored junior engineers and established coding standards for the ML team"
+            ]
+        }
+    ]
+
     @staticmethod
     def render():
         """Render the experience section"""
-        with ui.element('section').classes('section').style('background: #f8f9fa;'):
-            with ui.element('div').classes('portfolio-container'):
-                ui.html('<h2 class="section-title">Professional Experience</h2>')
-                with ui.column().classes('w-full max-w-4xl mx-auto'):
-                    ExperienceSection._render_experience_cards()
-    
+        ui.html(render_cache.get('experience', ExperienceSection.build_html))
+
     @staticmethod
-    def _render_experience_cards():
-        """Render individual experience cards"""
-        experiences = [
-            {
-                "title": "Senior AI Engineer",
-                "company": "TechCorp Inc.",
-                "period": "2021 - Present",
-                "achievements": [
-                    "Led a team of 8 engineers to develop ML-powered features serving 50M+ users",
-                    "Improved model accuracy by 23% through advanced feature engineering and ensemble methods",
-                    "Reduced inference latency by 40% through model optimization and efficient deployment strategies",
-                    "Established MLOps practices reducing model deployment time from weeks to hours"
-                ]
-            },
-            {
-                "title": "Machine Learning Engineer",
-                "company": "DataTech Solutions",
-                "period": "2019 - 2021",
-                "achievements": [
-                    "Developed computer vision models for autonomous vehicle perception systems",
-                    "Built real-time data processing pipelines handling 1TB+ daily data volume",
-                    "Collaborated with product teams to integrate ML capabilities into customer-facing applications",
-                    "Mentored junior engineers and established coding standards for the ML team"
-                ]
-            }
-        ]
-        
-        for exp in experiences:
-            with ui.card().classes('w-full mb-6 p-6'):
-                ui.html(f'''
+    def build_html() -> str:
+        """Build the static experience markup"""
+        return f'''
+        <section class="section" style="background: #f8f9fa;">
+            <div class="portfolio-container">
+                <h2 class="section-title">Professional Experience</h2>
+                <div class="flex flex-col w-full max-w-4xl mx-auto">
+                    {ExperienceSection._build_experience_cards()}
+                </div>
+            </div>
+        </section>
+        '''
+
+    @staticmethod
+    def _build_experience_cards() -> str:
+        """Build individual experience cards"""
+        cards = []
+        for exp in ExperienceSection.EXPERIENCES:
+            cards.append(f'''
+            <div class="q-card w-full mb-6 p-6">
                 <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 1rem;">
                     <div>
                         <h3 style="font-size: 1.4rem; font-weight: 600; color: #333;">{exp["title"]}</h3>
@@ -222,12 +352,20 @@ class ExperienceSection:
                 <ul style="color: #555; line-height: 1.6; margin-left: 1rem;">
                     {"".join([f"<li>{achievement}</li>" for achievement in exp["achievements"]])}
                 </ul>
-                ''')
+            </div>
+            ''')
+        return "".join(cards)
 
 
 class ContactSection:
     """Contact section with form and social links"""
-    
+
+    SOCIAL_LINKS = [
+        ('LinkedIn', 'https://linkedin.com/in/ai-engineer'),
+        ('GitHub', 'https://github.com/ai-engineer'),
+        ('Medium', 'https://medium.com/@ai-engineer'),
+    ]
+
     @staticmethod
     def render(portfolio_service):
         """Render the contact section"""
@@ -236,36 +374,55 @@ class ContactSection:
                 ui.html('<h2 class="section-title">Let\'s Connect</h2>')
                 with ui.element('div').classes('contact-form'):
                     ui.html('<p style="text-align: center; margin-bottom: 2rem; font-size: 1.1rem;">Ready to discuss your next AI project? Let\'s talk!</p>')
-                    
+
                     ContactSection._render_contact_form(portfolio_service)
                     ContactSection._render_social_links()
-    
+
     @staticmethod
     def _render_contact_form(portfolio_service):
         """Render the contact form"""
         with ui.element('form'):
             with ui.element('div').classes('form-group'):
                 name_input = ui.input('Your Name').classes('form-input').style('width: 100%;')
-            
+
             with ui.element('div').classes('form-group'):
                 email_input = ui.input('Your Email').classes('form-input').style('width: 100%;')
-            
+
             with ui.element('div').classes('form-group'):
                 subject_input = ui.input('Subject').classes('form-input').style('width: 100%;')
-            
+
             with ui.element('div').classes('form-group'):
                 message_input = ui.textarea('Your Message').classes('form-textarea').style('width: 100%;')
-            
-            ui.button('Send Message', 
+
+            ui.button('Send Message',
                      on_click=lambda: portfolio_service.send_contact_message(
-                         name_input.value, email_input.value, 
+                         name_input.value, email_input.value,
                          subject_input.value, message_input.value
                      )).classes('btn-primary').style('width: 100%; margin-top: 1rem;')
-    
+
     @staticmethod
     def _render_social_links():
         """Render social media links"""
         with ui.row().classes('justify-center gap-4 mt-8'):
-            ui.link('LinkedIn', 'https://linkedin.com/in/ai-engineer', new_tab=True).classes('btn-secondary')
-            ui.link('GitHub', 'https://github.com/ai-engineer', new_tab=True).classes('btn-secondary')
-            ui.link('Medium', 'https://medium.com/@ai-engineer', new_tab=True).classes('btn-secondary')
\ No newline at end of file
+            for label, url in ContactSection.SOCIAL_LINKS:
+                ui.link(label, url, new_tab=True).classes('btn-secondary')
+
+    @staticmethod
+    def build_html(contact_email: str) -> str:
+        """Build the contact section with a mailto link in place of the form"""
+        links = "".join(
+            f'<a href="{url}" class="btn-secondary" target="_blank" rel="noopener">{label}</a>'
+            for label, url in ContactSection.SOCIAL_LINKS
+        )
+        return f'''
+        <section class="section contact-section">
+            <div class="portfolio-container">
+                <h2 class="section-title">Let's Connect</h2>
+                <div class="contact-form">
+                    <p style="text-align: center; margin-bottom: 2rem; font-size: 1.1rem;">Ready to discuss your next AI project? Let's talk!</p>
+                    <p style="text-align: center;"><a href="mailto:{contact_email}" class="btn-primary">{contact_email}</a></p>
+                    <div style="display: flex; justify-content: center; gap: 1rem; margin-top: 2rem;">{links}</div>
+                </div>
+            </div>
+        </section>
+        '''
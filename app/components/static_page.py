@@ -0,0 +1,60 @@
+"""Static HTML snapshot of the portfolio page
+
+Crawlers, link-preview fetchers and visitors without JavaScript cannot use
+the live NiceGUI page, and rendering it for them allocates a client that
+waits for a websocket that never connects. ``build_static_page`` assembles a
+plain HTML document from the same section markup and data as
+``portfolio_components``, without interactive elements or scripts.
+"""
+
+from html import escape
+from typing import Dict, List
+
+from app.components.portfolio_components import (
+    AboutSection, ContactSection, ExperienceSection, HeroSection, ProjectsSection, SkillsSection
+)
+from app.core.assets import ImageAsset
+from app.core.config import settings
+
+DESCRIPTION = "AI Engineer Portfolio - Machine Learning, Deep Learning, and AI Solutions"
+
+
+def build_static_page(assets: Dict[str, List[ImageAsset]], stylesheet_url: str, title: str) -> str:
+    """Render every portfolio section into one self-contained document"""
+
+    hero = f'''
+    <div class="hero-section">
+        {HeroSection.build_background_html(assets)}
+        <div class="hero-content">{HeroSection.build_html()}</div>
+    </div>
+    '''
+    sections = [
+        hero,
+        AboutSection.build_html(assets),
+        SkillsSection.build_html(),
+        ProjectsSection.build_html(assets),
+        ExperienceSection.build_html(),
+        ContactSection.build_html(settings.contact_email),
+    ]
+
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{escape(title)}</title>
+<meta name="description" content="{DESCRIPTION}">
+<meta name="keywords" content="AI Engineer, Machine Learning, Deep Learning, Python, TensorFlow, PyTorch">
+<meta property="og:type" content="website">
+<meta property="og:title" content="{escape(title)}">
+<meta property="og:description" content="{DESCRIPTION}">
+<link rel="canonical" href="/">
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+<link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
+<link href="{stylesheet_url}" rel="stylesheet">
+</head>
+<body>
+{"".join(sections)}
+</body>
+</html>
+'''
@@ -1,16 +1,46 @@
 """Advanced professional visual asset management system with project-specific categories"""
 
 import hashlib
+import json
 import logging
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-import requests
+import mimetypes
+import os
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
+from urllib.parse import quote, unquote
+
+from app.core.circuit_breaker import host_breakers
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    # Imported on first fetch; most requests are served from the disk cache
+    import requests
 
 logger = logging.getLogger(__name__)
 
+# URL prefix of the local image proxy
+IMAGE_PROXY_PATH = "/img"
+
+# Number of images per section in the default manifest
+DEFAULT_SECTIONS_COUNT = 6
 
-@dataclass
+# Frozen section -> assets mapping shared by every page view
+AssetManifest = Mapping[str, Tuple["ImageAsset", ...]]
+
+
+def stable_seed(value: str) -> int:
+    """Derive an image seed that is identical across processes and restarts
+    
+    Python's built-in ``hash()`` is salted per process, which made every worker
+    and every restart produce different image URLs and defeated browser/CDN caches.
+    """
+    return int(hashlib.sha256(value.encode("utf-8")).hexdigest()[:8], 16) % 10000
+
+
+@dataclass(frozen=True)
 class ImageAsset:
     """Represents a professional image asset with fallback options"""
     primary_url: str
@@ -19,6 +49,20 @@ class ImageAsset:
     category: str
     width: int = 1200
     height: int = 800
+    # Low-quality image placeholder (tiny blurred data URI) and dominant colour,
+    # precomputed into the manifest so pages show something before the image loads
+    placeholder: str = ""
+    dominant_color: str = ""
+
+    @property
+    def key(self) -> str:
+        """Stable cache key derived from the source URL"""
+        return hashlib.sha256(self.primary_url.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def local_url(self) -> str:
+        """URL of this image on the local caching proxy"""
+        return f"{IMAGE_PROXY_PATH}/{self.key}"
 
 
 class ProfessionalAssetManager:
@@ -53,13 +97,75 @@ class ProfessionalAssetManager:
         ]
     }
     
-    def __init__(self, cache_dir: Optional[Path] = None):
+    # Source URLs of every asset; {keyword} is URL-encoded, {seed} is stable per asset
+    PRIMARY_URL_TEMPLATE = "https://source.unsplash.com/1200x800/?{keyword}&sig={seed}"
+    FALLBACK_URL_TEMPLATE = "https://picsum.photos/1200/800?random={seed}"
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_cache_bytes: Optional[int] = None):
         """Initialize the asset manager with optional caching"""
-        self.cache_dir = cache_dir or Path("app/static/cache")
+        self.cache_dir = cache_dir or Path(settings.image_cache_path)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Resized variants written by ``DerivativeEngine``, named "<source stem>-<width>.<format>"
+        self.derived_dir = self.cache_dir / "derived"
+        self.max_cache_bytes = max_cache_bytes or settings.image_cache_max_mb * 1024 * 1024
+        
+        # Local image proxy state: known source URLs per key and the
+        # content-addressed file each key resolved to
+        self._sources: Dict[str, Tuple[str, str]] = {}
+        self._index_path = self.cache_dir / "index.json"
+        self._index: Dict[str, str] = self._load_index()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._session: Optional["requests.Session"] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        self._manifest_path = self.cache_dir / "manifest.json"
+        self._manifest: Optional[AssetManifest] = None
+        
+    def get_ai_engineer_assets(self, sections_count: int = DEFAULT_SECTIONS_COUNT) -> AssetManifest:
+        """Get contextually relevant professional images for AI engineer portfolio
+        
+        The default request is answered from the precomputed manifest in O(1);
+        other counts are built on demand.
+        """
+        
+        if sections_count == DEFAULT_SECTIONS_COUNT:
+            return self.get_manifest()
+        return self._build_assets(sections_count)
+    
+    def get_manifest(self) -> AssetManifest:
+        """Return the frozen asset manifest, loading or building it once"""
         
-    def get_ai_engineer_assets(self, sections_count: int = 6) -> Dict[str, List[ImageAsset]]:
-        """Get contextually relevant professional images for AI engineer portfolio"""
+        if self._manifest is None:
+            self._manifest = self._load_manifest() or self.build_manifest()
+        return self._manifest
+    
+    def build_manifest(self, write: bool = True) -> AssetManifest:
+        """Build the default asset manifest and optionally persist it to disk"""
+        
+        manifest = self._build_assets(DEFAULT_SECTIONS_COUNT)
+        if write:
+            self._write_manifest(manifest)
+        self._manifest = manifest
+        return manifest
+    
+    def update_manifest(self, updates: Dict[str, Dict[str, str]]) -> AssetManifest:
+        """Apply precomputed per-asset fields (keyed by asset key) and persist the manifest"""
+        
+        manifest = {
+            section: tuple(
+                replace(asset, **updates[asset.key]) if asset.key in updates else asset
+                for asset in section_assets
+            )
+            for section, section_assets in self.get_manifest().items()
+        }
+        self._manifest = MappingProxyType(manifest)
+        self._write_manifest(self._manifest)
+        return self._manifest
+    
+    def _build_assets(self, sections_count: int) -> AssetManifest:
+        """Create the assets for every category"""
         
         assets = {}
         
@@ -71,26 +177,69 @@ class ProfessionalAssetManager:
                 asset = self._create_image_asset(keyword, section, i)
                 section_assets.append(asset)
             
-            assets[section] = section_assets
+            assets[section] = tuple(section_assets)
         
-        return assets
+        return MappingProxyType(assets)
+    
+    def _manifest_fingerprint(self) -> str:
+        """Digest of the inputs the manifest is derived from"""
+        
+        source = json.dumps(
+            [self.AI_ENGINEER_CATEGORIES, self.PRIMARY_URL_TEMPLATE, self.FALLBACK_URL_TEMPLATE], sort_keys=True
+        )
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    
+    def _write_manifest(self, manifest: AssetManifest) -> None:
+        """Persist a manifest atomically"""
+        
+        payload = {
+            "fingerprint": self._manifest_fingerprint(),
+            "sections": {
+                section: [asdict(asset) for asset in section_assets]
+                for section, section_assets in manifest.items()
+            },
+        }
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp_path.replace(self._manifest_path)
+        logger.info("Wrote asset manifest to %s", self._manifest_path)
+    
+    def _load_manifest(self) -> Optional[AssetManifest]:
+        """Load a persisted manifest if it matches the current categories"""
+        
+        try:
+            payload = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        
+        if payload.get("fingerprint") != self._manifest_fingerprint():
+            logger.info("Asset manifest is stale, rebuilding")
+            return None
+        
+        manifest = {}
+        for section, section_assets in payload["sections"].items():
+            manifest[section] = tuple(ImageAsset(**data) for data in section_assets)
+            for asset in manifest[section]:
+                self.register_asset(asset)
+        
+        return MappingProxyType(manifest)
     
     def _create_image_asset(self, keyword: str, section: str, index: int) -> ImageAsset:
         """Create an image asset with multiple fallback options"""
         
         # Generate consistent seed for reproducible images
-        seed = abs(hash(f"{keyword}_{section}_{index}")) % 10000
+        seed = stable_seed(f"{keyword}_{section}_{index}")
         
         # Primary source: Unsplash with specific keyword
-        primary_url = f"https://source.unsplash.com/1200x800/?{keyword.replace(' ', '+')}&sig={seed}"
+        primary_url = self.PRIMARY_URL_TEMPLATE.format(keyword=keyword.replace(' ', '+'), seed=seed)
         
         # Fallback source: Lorem Picsum with seed
-        fallback_url = f"https://picsum.photos/1200/800?random={seed}"
+        fallback_url = self.FALLBACK_URL_TEMPLATE.format(seed=seed)
         
         # Generate descriptive alt text
         alt_text = f"Professional {keyword} imagery for {section} section"
         
-        return ImageAsset(
+        asset = ImageAsset(
             primary_url=primary_url,
             fallback_url=fallback_url,
             alt_text=alt_text,
@@ -98,6 +247,8 @@ class ProfessionalAssetManager:
             width=1200,
             height=800
         )
+        self.register_asset(asset)
+        return asset
     
     def get_optimized_image_url(self, asset: ImageAsset, width: int = None, height: int = None) -> str:
         """Get optimized image URL for specific dimensions"""
@@ -110,27 +261,219 @@ class ProfessionalAssetManager:
                 return f"{base_url.replace('1200x800', f'{width}x{height}')}?{params}"
             
             # Fallback to Picsum with custom dimensions
-            seed = abs(hash(asset.primary_url)) % 10000
+            seed = stable_seed(asset.primary_url)
             return f"https://picsum.photos/{width}/{height}?random={seed}"
         
         return asset.primary_url
     
     def validate_image_url(self, url: str) -> bool:
-        """Validate if an image URL is accessible"""
+        """Validate if an image URL is accessible
+        
+        This blocks the calling thread for up to five seconds; from async code
+        (NiceGUI handlers) use ``AsyncImageValidator`` instead.
+        """
+        
+        import requests
         
         try:
             response = requests.head(url, timeout=5)
             return response.status_code == 200
         except Exception as e:
-            logger.warning(f"Image validation failed for {url}: {e}")
+            logger.warning("Image validation failed for %s: %s", url, e)
             return False
     
+    def register_asset(self, asset: ImageAsset) -> None:
+        """Make an asset fetchable through the local image proxy"""
+        self._sources[asset.key] = (asset.primary_url, asset.fallback_url)
+    
+    def is_registered(self, key: str) -> bool:
+        """Whether the image proxy knows the sources of a key"""
+        return key in self._sources
+    
+    def get_cached_image(self, key: str) -> Optional[Path]:
+        """Return the cached file for an image key, fetching it on first use
+        
+        Images are stored content-addressed in ``cache_dir``; the primary URL
+        is tried first and the fallback URL second. Returns None when the key
+        is unknown or both sources fail.
+        """
+        
+        path = self._lookup(key)
+        if path is not None:
+            self.cache_hits += 1
+            return path
+        
+        if key not in self._sources:
+            return None
+        
+        # Only one thread downloads a given image; the others wait and reuse it
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            path = self._lookup(key)
+            if path is not None:
+                self.cache_hits += 1
+                return path
+            
+            self.cache_misses += 1
+            return self._fetch_and_store(key)
+    
+    def _lookup(self, key: str) -> Optional[Path]:
+        """Find a cached file for a key and mark it as recently used"""
+        
+        filename = self._index.get(key)
+        if not filename:
+            return None
+        
+        path = self.cache_dir / filename
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def _fetch_and_store(self, key: str) -> Optional[Path]:
+        """Download an image from its primary or fallback source into the cache"""
+        
+        for url in self._sources[key]:
+            # Skip providers whose circuit is open instead of waiting on timeouts
+            breaker = host_breakers.for_url(url)
+            if not breaker.allow():
+                continue
+            
+            try:
+                response = self._get_session().get(url, timeout=10)
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning("Image fetch failed for %s: %s", url, e)
+                breaker.record_failure()
+                continue
+            
+            content_type = response.headers.get("content-type", "").split(";")[0].strip()
+            if not content_type.startswith("image/"):
+                # A page served in place of an image (e.g. a retired API) is a degraded provider
+                logger.warning("Image fetch for %s returned non-image content (%s)", url, content_type or 'unknown')
+                breaker.record_failure()
+                continue
+            
+            breaker.record_success()
+            
+            extension = mimetypes.guess_extension(content_type) or ".img"
+            filename = hashlib.sha256(response.content).hexdigest()[:32] + extension
+            path = self.cache_dir / filename
+            
+            if not path.exists():
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(response.content)
+                tmp_path.replace(path)
+            
+            with self._lock:
+                self._index[key] = filename
+                self._save_index()
+                self._evict()
+            
+            logger.info("Cached image %s from %s (%d bytes)", key, url, len(response.content))
+            return path
+        
+        return None
+    
+    def trim_cache(self) -> None:
+        """Evict least recently used files if the cache grew past its size cap"""
+        
+        with self._lock:
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Remove least recently used images until the cache fits its size cap
+        
+        Derivatives count towards the cap as well, and are removed together
+        with their source image.
+        """
+        
+        stats = {}
+        for directory in (self.cache_dir, self.derived_dir):
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if path.suffix in (".json", ".tmp"):
+                    continue
+                try:
+                    if path.is_file():
+                        stats[path] = path.stat()
+                except FileNotFoundError:
+                    continue
+        total = sum(stat.st_size for stat in stats.values())
+        if total <= self.max_cache_bytes:
+            return
+        
+        removed = set()
+        derived_removed = 0
+        for path, stat in sorted(stats.items(), key=lambda item: item[1].st_mtime):
+            if total <= self.max_cache_bytes:
+                break
+            if path not in stats:
+                # Already removed along with its source
+                continue
+            
+            victims = [path]
+            if path.parent == self.cache_dir:
+                removed.add(path.name)
+                victims.extend(self.derived_dir.glob(f"{path.stem}-*"))
+            for victim in victims:
+                victim.unlink(missing_ok=True)
+                victim_stat = stats.pop(victim, None)
+                if victim_stat is not None:
+                    total -= victim_stat.st_size
+            derived_removed += sum(1 for victim in victims if victim.parent == self.derived_dir)
+        
+        if removed:
+            self._index = {key: name for key, name in self._index.items() if name not in removed}
+            self._save_index()
+        logger.info("Evicted %s cached images and %s derivatives", len(removed), derived_removed)
+    
+    def _load_index(self) -> Dict[str, str]:
+        """Load the key-to-file index persisted in the cache directory"""
+        
+        try:
+            return json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def _save_index(self) -> None:
+        """Persist the key-to-file index atomically"""
+        
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        tmp_path.replace(self._index_path)
+    
+    def _get_session(self) -> "requests.Session":
+        """Shared HTTP session so repeated fetches reuse connections"""
+        
+        if self._session is None:
+            import requests
+            
+            self._session = requests.Session()
+        return self._session
+    
     def get_placeholder_image(self, width: int = 1200, height: int = 800, text: str = "Portfolio") -> str:
         """Get a placeholder image with custom text"""
         
         # Use a reliable placeholder service
         return f"https://via.placeholder.com/{width}x{height}/667eea/ffffff?text={text.replace(' ', '+')}"
     
+    @staticmethod
+    def get_local_placeholder(width: int = 1200, height: int = 800, text: str = "Portfolio") -> str:
+        """Get an inline SVG placeholder that needs no external request"""
+        
+        svg = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<rect width="100%" height="100%" fill="#667eea"/>'
+            f'<text x="50%" y="50%" fill="#ffffff" font-family="sans-serif" font-size="{max(width // 20, 12)}" '
+            f'text-anchor="middle" dominant-baseline="middle">{text}</text></svg>'
+        )
+        return "data:image/svg+xml;charset=utf-8," + quote(svg)
+    
     @staticmethod
     def generate_image_css() -> str:
         """Generate CSS for professional image handling with modern styling"""
@@ -296,4 +639,48 @@ class ProfessionalAssetManager:
             asset = self._create_image_asset(keyword, section, i)
             assets.append(asset)
         
-        return assets
\ No newline at end of file
+        return assets
+
+
+def add_image_proxy_route(app, asset_manager: ProfessionalAssetManager, url_path: str = IMAGE_PROXY_PATH) -> None:
+    """Serve cached images from the asset manager with ETag and long-lived caching
+    
+    Args:
+        app: The FastAPI (NiceGUI) application
+        asset_manager: Asset manager that owns the image cache
+        url_path: URL prefix of the image proxy
+    """
+    from fastapi import HTTPException, Request, Response
+    from fastapi.responses import FileResponse
+    
+    @app.get(url_path + "/{key}", include_in_schema=False)
+    def cached_image(key: str, request: Request) -> Response:
+        # Sync handler: runs in the threadpool, so a cache miss never blocks the event loop
+        path = asset_manager.get_cached_image(key)
+        if path is None:
+            if not asset_manager.is_registered(key):
+                raise HTTPException(status_code=404, detail="Image not found")
+            
+            # Every provider is down: serve the local placeholder, uncached so
+            # the real image is picked up once a provider recovers
+            placeholder = ProfessionalAssetManager.get_local_placeholder()
+            return Response(
+                content=unquote(placeholder.split(",", 1)[1]),
+                media_type="image/svg+xml",
+                headers={"Cache-Control": "no-store"},
+            )
+        
+        etag = f'"{path.stem}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=2592000",
+        }
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        
+        return FileResponse(path, headers=headers)
+
+
+if __name__ == "__main__":
+    # Build-time entry point: python -m app.core.assets
+    ProfessionalAssetManager().build_manifest()
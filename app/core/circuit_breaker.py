@@ -0,0 +1,94 @@
+"""Per-host circuit breakers for external image providers"""
+
+import logging
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Classic closed / open / half-open circuit breaker
+
+    After ``failure_threshold`` consecutive failures the circuit opens and all
+    calls are refused for ``reset_timeout`` seconds. The next call after that
+    is let through as a probe: success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout elapsed"""
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call to the protected service should be attempted"""
+        with self._lock:
+            state = self.state
+            if state == self.HALF_OPEN:
+                # Let exactly one probe through; it re-arms the timeout
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return state == self.CLOSED
+
+    def record_success(self) -> None:
+        """Reset the breaker after a successful call"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self.failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold"""
+        with self._lock:
+            self.failures += 1
+            if self._state == self.OPEN or self.failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit for %s opened after %s failures", self.name, self.failures)
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class HostBreakers:
+    """Registry of circuit breakers keyed by URL host"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """Return the breaker guarding the host of ``url``"""
+        host = urlsplit(url).hostname or ""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers.setdefault(
+                host, CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            )
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Current state of every known host"""
+        return {host: breaker.state for host, breaker in self._breakers.items()}
+
+
+# Shared by the image proxy and the async validator
+host_breakers = HostBreakers()
@@ -0,0 +1,367 @@
+"""Brotli / zstd / gzip response compression with precompressed static files
+
+Static files are compressed once, at build time or startup, into sidecar
+files next to the original (``portfolio.css.br``, ``.zst``, ``.gz``) at the
+highest compression levels. ``CompressionMiddleware`` negotiates the best
+encoding the client accepts, serves a matching sidecar when one exists, and
+only compresses dynamic responses on the fly (at fast levels).
+
+Brotli and zstd need the optional ``brotli`` and ``zstandard`` packages;
+without them the middleware falls back to gzip.
+"""
+
+import logging
+import mimetypes
+import os
+import posixpath
+import zlib
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Encodings in order of preference, with their sidecar file suffix
+SIDECAR_SUFFIXES = {
+    "br": ".br",
+    "zstd": ".zst",
+    "gzip": ".gz",
+}
+
+AVAILABLE_ENCODINGS = tuple(
+    encoding for encoding, module in (("br", brotli), ("zstd", zstandard), ("gzip", zlib))
+    if module is not None
+)
+
+# Text formats worth compressing; images, fonts and archives already are
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    ".css", ".js", ".mjs", ".map", ".html", ".htm", ".svg", ".json",
+    ".xml", ".txt", ".md", ".csv", ".ico", ".wasm",
+})
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/", "application/json", "application/javascript", "application/xml",
+    "application/manifest+json", "image/svg+xml", "application/wasm",
+)
+
+# Files smaller than this are not worth an extra request header of overhead
+MINIMUM_SIZE = 1000
+
+# Static directories served by the app: URL prefix -> local directory
+STATIC_DIRECTORIES = {
+    "/static": Path("app/static"),
+    "/assets": Path("app/static/build"),
+}
+
+# Precompressed files: absolute source path -> (source mtime, encodings with a sidecar)
+_sidecars: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+
+
+def compress(data: bytes, encoding: str, static: bool = False) -> bytes:
+    """Compress a whole payload; ``static`` selects maximum (slow) levels"""
+
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else 4)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19 if static else 3).compress(data)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(9 if static else 6, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    raise ValueError(f"Unsupported encoding {encoding!r}")
+
+
+def negotiate_encoding(accept_encoding: str, offered: Iterable[str] = AVAILABLE_ENCODINGS) -> Optional[str]:
+    """Pick the first of ``offered`` that the Accept-Encoding header allows"""
+
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in offered:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def precompress_file(path: Path, encodings: Iterable[str] = AVAILABLE_ENCODINGS) -> FrozenSet[str]:
+    """Write sidecars for one file unless they are already up to date"""
+
+    data = None
+    source_mtime = path.stat().st_mtime
+    written = []
+    for encoding in encodings:
+        sidecar = path.with_name(path.name + SIDECAR_SUFFIXES[encoding])
+        if sidecar.exists() and sidecar.stat().st_mtime >= source_mtime:
+            written.append(encoding)
+            continue
+
+        if data is None:
+            data = path.read_bytes()
+        compressed = compress(data, encoding, static=True)
+        if len(compressed) >= len(data):
+            continue
+
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(compressed)
+        tmp.replace(sidecar)
+        written.append(encoding)
+
+    available = frozenset(written)
+    _sidecars[str(path.resolve())] = (source_mtime, available)
+    return available
+
+
+def precompress_directory(root: Path, minimum_size: int = MINIMUM_SIZE) -> int:
+    """Precompress every compressible file under ``root``; returns the file count"""
+
+    count = 0
+    for path in root.rglob("*"):
+        if path.suffix.lower() not in COMPRESSIBLE_EXTENSIONS or not path.is_file():
+            continue
+        try:
+            if path.stat().st_size < minimum_size:
+                continue
+            if precompress_file(path):
+                count += 1
+        except OSError as e:
+            logger.warning("Could not precompress %s: %s", path, e)
+    return count
+
+
+def precompress_static(directories: Iterable[Path] = None) -> int:
+    """Precompress all static directories (blocking; run at build time or in a thread)"""
+
+    roots = {Path(directory).resolve() for directory in (directories or STATIC_DIRECTORIES.values())}
+    # Nested roots (build/ inside static/) would otherwise be walked twice
+    roots = [root for root in roots if not any(parent in roots for parent in root.parents)]
+
+    count = sum(precompress_directory(root) for root in roots if root.is_dir())
+    logger.info("Precompressed %s static files (%s)", count, ', '.join(AVAILABLE_ENCODINGS))
+    return count
+
+
+class _StreamCompressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=4)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        """Compress a chunk; flushes so every chunk can be decoded as it arrives"""
+
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + (self._compressor.finish() if finish else self._compressor.flush())
+        if self.encoding == "zstd":
+            out = self._compressor.compress(data)
+            mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if finish else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            return out + self._compressor.flush(mode)
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Content negotiation for br / zstd / gzip responses
+
+    Requests for precompressed static files are rewritten to the sidecar, so
+    they cost no CPU. Other compressible responses of at least
+    ``minimum_size`` bytes are compressed on the fly. The Accept-Encoding
+    header is hidden from the wrapped app so nothing inside compresses twice.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE, static_directories: Dict[str, Path] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.static_directories = [
+            (prefix.rstrip("/") + "/", str(Path(directory).resolve()))
+            for prefix, directory in (static_directories or STATIC_DIRECTORIES).items()
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        accept_encoding = ""
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+            else:
+                headers.append((name, value))
+        if not accept_encoding:
+            return await self.app(scope, receive, send)
+        scope = {**scope, "headers": headers}
+
+        sidecar = self._find_sidecar(scope["path"], accept_encoding)
+        if sidecar is not None:
+            encoding, media_type = sidecar
+            return await self._serve_sidecar(scope, receive, send, encoding, media_type)
+
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+    def _find_sidecar(self, path: str, accept_encoding: str) -> Optional[Tuple[str, str]]:
+        """Return (encoding, original media type) of a usable sidecar, if any"""
+
+        for prefix, directory in self.static_directories:
+            if path.startswith(prefix):
+                relative = posixpath.normpath(path[len(prefix):])
+                source = os.path.join(directory, relative)
+                entry = _sidecars.get(source)
+                if entry is None:
+                    return None
+
+                # Files rewritten since they were precompressed (e.g. the image
+                # cache index) fall back to on-the-fly compression
+                mtime, available = entry
+                try:
+                    if os.stat(source).st_mtime != mtime:
+                        return None
+                except OSError:
+                    return None
+                encoding = negotiate_encoding(
+                    accept_encoding, [encoding for encoding in SIDECAR_SUFFIXES if encoding in available]
+                )
+                if encoding is None:
+                    return None
+                media_type = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                return encoding, media_type
+        return None
+
+    async def _serve_sidecar(self, scope, receive, send, encoding: str, media_type: str):
+        """Let the static file handler serve the sidecar under the original type"""
+
+        suffix = SIDECAR_SUFFIXES[encoding]
+        scope["path"] = scope["path"] + suffix
+        if scope.get("raw_path"):
+            scope["raw_path"] = scope["raw_path"] + suffix.encode()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] in (200, 206, 304):
+                headers = MutableHeaders(raw=message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if message["status"] != 304:
+                    headers["Content-Type"] = media_type
+                    headers["Content-Encoding"] = encoding
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class _CompressionResponder:
+    """Compresses one dynamic response (modelled on Starlette's GZipResponder)"""
+
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.initial_message = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows whether to compress
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.initial_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.initial_message is not None:
+            initial_message, self.initial_message = self.initial_message, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = _StreamCompressor(self.encoding)
+            body = self.compressor.compress(body, finish=not more_body)
+            headers = MutableHeaders(raw=initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The validator was computed on the uncompressed body, so it no
+            # longer identifies these exact bytes
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(initial_message)
+        else:
+            body = self.compressor.compress(body, finish=not more_body)
+
+        await self.send({**message, "body": body})
+
+
+def add_compression(app: FastAPI, minimum_size: int = MINIMUM_SIZE) -> None:
+    """Install ``CompressionMiddleware`` in place of any GZipMiddleware
+
+    NiceGUI registers its own GZipMiddleware; it is removed because this
+    middleware covers gzip as well and would otherwise be nested with it.
+
+    Args:
+        app: The FastAPI (NiceGUI) application
+        minimum_size: Smallest dynamic response body that gets compressed
+    """
+    app.user_middleware[:] = [m for m in app.user_middleware if m.cls is not GZipMiddleware]
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+
+if __name__ == "__main__":
+    # Build-time entry point: python -m app.core.compression
+    precompress_static()
@@ -1,7 +1,6 @@
 """Application configuration using Pydantic Settings v2"""
 
 import os
-from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -13,10 +12,23 @@ class Settings(BaseSettings):
     app_name: str = Field(default="AI Engineer Portfolio", description="Application name")
     debug: bool = Field(default=False, description="Debug mode")
     version: str = Field(default="1.0.0", description="Application version")
+    content_version: str = Field(
+        default="1",
+        description="Portfolio content version; bump to invalidate pre-rendered sections"
+    )
     
     # Server settings
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8080, description="Server port")
+    workers: int = Field(
+        default=1,
+        description="Worker processes; more than 1 starts the multi-worker launcher with sticky sessions"
+    )
+    shutdown_timeout: float = Field(
+        default=4.0,
+        description="Seconds workers get to shut down on SIGINT; keep below fly.toml kill_timeout"
+    )
+    api_prefix: str = Field(default="/api", description="Prefix of the REST API routes")
     
     # Security settings
     secret_key: str = Field(
@@ -27,6 +39,23 @@ class Settings(BaseSettings):
         default=30,
         description="Access token expiration time in minutes"
     )
+    bcrypt_rounds: int = Field(
+        default=12,
+        description="bcrypt cost factor; existing hashes are upgraded on the next login"
+    )
+    password_workers: int = Field(
+        default=2,
+        description="Threads hashing and verifying passwords"
+    )
+    password_max_pending: int = Field(
+        default=16,
+        description="Password operations queued or running before logins get 503"
+    )
+    rate_limit_requests: int = Field(
+        default=100,
+        description="Requests a client may make per RATE_LIMIT_WINDOW seconds (static files and probes are exempt)"
+    )
+    rate_limit_window: int = Field(default=60, description="Rate limit window in seconds")
     
     # File paths
     static_dir: str = Field(default="app/static", description="Static files directory")
@@ -39,6 +68,9 @@ class Settings(BaseSettings):
     smtp_port: int = Field(default=587, description="SMTP port")
     smtp_username: str = Field(default="", description="SMTP username")
     smtp_password: str = Field(default="", description="SMTP password")
+    smtp_use_tls: bool = Field(default=True, description="Upgrade SMTP connections with STARTTLS")
+    outbox_path: str = Field(default="data/outbox.sqlite3", description="SQLite file backing the email outbox")
+    outbox_max_attempts: int = Field(default=8, description="Delivery attempts before an email is marked failed")
     contact_email: str = Field(
         default="contact@ai-engineer.dev",
         description="Contact email address"
@@ -50,6 +82,36 @@ class Settings(BaseSettings):
         description="Unsplash API access key for professional images"
     )
     
+    # Image proxy cache (kept outside app/static, which is served publicly)
+    image_cache_path: str = Field(
+        default="data/image_cache",
+        description="Directory of cached images, their derivatives and the asset manifest"
+    )
+    image_cache_max_mb: int = Field(
+        default=200,
+        description="Size cap of the local image cache in megabytes"
+    )
+    
+    # Prometheus metrics, kept off the public port
+    metrics_host: str = Field(default="0.0.0.0", description="Interface serving /metrics")
+    metrics_port: int = Field(default=9091, description="Port serving /metrics; 0 disables it")
+    
+    # Shared state (rate limits and caches) across worker processes
+    state_backend: str = Field(
+        default="memory",
+        description="State backend shared by workers: memory, sqlite or redis"
+    )
+    state_path: str = Field(default="data/state.sqlite3", description="SQLite file of the sqlite state backend")
+    state_busy_timeout_ms: int = Field(
+        default=50,
+        description="How long a request waits for a locked sqlite state file before giving up"
+    )
+    redis_url: str = Field(default="redis://localhost:6379/0", description="Server URL of the redis state backend")
+    module_manifest_path: str = Field(
+        default="data/module_manifest.json",
+        description="Cache of discovered API routers and models, rebuilt when their sources change"
+    )
+    
     # Database settings (if needed for future enhancements)
     database_url: str = Field(
         default="sqlite:///./portfolio.db",
@@ -60,12 +122,9 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # .env also holds variables for other tools (and the template's leftovers)
+        extra = "ignore"
 
 
 # Create global settings instance
 settings = Settings()
-
-# Ensure required directories exist
-Path(settings.static_dir).mkdir(parents=True, exist_ok=True)
-Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
-Path(settings.resume_path).mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -50,7 +50,7 @@ def setup_database() -> None:
         # app_logger.info(f"Database connection established: {settings.database_url.split('@')[-1]}")
         pass
     except Exception as e:
-        app_logger.error(f"Failed to connect to database: {e}")
+        app_logger.error("Failed to connect to database: %s", e)
         raise
 
 # Uncomment when you need database functionality
@@ -82,7 +82,7 @@ class DeploymentManager:
             else:
                 return False, f"Failed to build Docker image: {result.stderr}"
         except Exception as e:
-            app_logger.error(f"Error building Docker image: {e}")
+            app_logger.error("Error building Docker image: %s", e)
             return False, f"Error building Docker image: {str(e)}"
     
     @staticmethod
@@ -140,7 +140,7 @@ class DeploymentManager:
             else:
                 return False, f"Failed to start Docker container: {result.stderr}"
         except Exception as e:
-            app_logger.error(f"Error running Docker container: {e}")
+            app_logger.error("Error running Docker container: %s", e)
             return False, f"Error running Docker container: {str(e)}"
     
     @staticmethod
@@ -162,7 +162,7 @@ class DeploymentManager:
             if not os.path.exists("fly.toml"):
                 # If app_name is provided, create a new app
                 if app_name:
-                    app_logger.info(f"Creating new Fly.io app: {app_name}")
+                    app_logger.info("Creating new Fly.io app: %s", app_name)
                     result = subprocess.run(
                         ["flyctl", "launch", "--name", app_name, "--no-deploy"],
                         capture_output=True,
@@ -193,7 +193,7 @@ class DeploymentManager:
             else:
                 return False, f"Failed to deploy to Fly.io: {result.stderr}"
         except Exception as e:
-            app_logger.error(f"Error deploying to Fly.io: {e}")
+            app_logger.error("Error deploying to Fly.io: %s", e)
             return False, f"Error deploying to Fly.io: {str(e)}"
     
     @staticmethod
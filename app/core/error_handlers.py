@@ -20,7 +20,7 @@ def setup_error_handlers(app: FastAPI) -> None:
     async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
         """Handle application-specific exceptions."""
         app_logger.error(
-            f"AppException: {exc.detail}", 
+            "AppException: %s", exc.detail, 
             extra={
                 "status_code": exc.status_code,
                 "path": request.url.path,
@@ -45,7 +45,7 @@ def setup_error_handlers(app: FastAPI) -> None:
             ))
         
         app_logger.warning(
-            f"Validation error: {errors}",
+            "Validation error: %s", errors,
             extra={
                 "path": request.url.path,
                 "method": request.method,
@@ -69,7 +69,7 @@ def setup_error_handlers(app: FastAPI) -> None:
             ))
         
         app_logger.warning(
-            f"Pydantic validation error: {errors}",
+            "Pydantic validation error: %s", errors,
             extra={
                 "path": request.url.path,
                 "method": request.method,
@@ -90,7 +90,7 @@ def setup_error_handlers(app: FastAPI) -> None:
         
         # Log the full traceback
         app_logger.error(
-            f"Unhandled exception: {str(exc)}",
+            "Unhandled exception: %s", exc,
             extra={
                 "traceback": traceback_str,
                 "path": request.url.path,
@@ -149,11 +149,11 @@ def with_error_handling(func: Callable) -> Callable:
         try:
             return await func(*args, **kwargs)
         except AppException as exc:
-            app_logger.error(f"AppException in {func.__name__}: {exc.detail}")
+            app_logger.error("AppException in %s: %s", func.__name__, exc.detail)
             raise
         except Exception as exc:
             app_logger.error(
-                f"Unhandled exception in {func.__name__}: {str(exc)}",
+                "Unhandled exception in %s: %s", func.__name__, exc,
                 extra={"traceback": traceback.format_exc()}
             )
             raise AppException(
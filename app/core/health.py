@@ -2,43 +2,90 @@ import os
 import sys
 import time
 import platform
-import psutil
+import threading
 from typing import Dict, Any, List, Optional
 
 from app.core.logging import app_logger
 
-class HealthCheck:
-    """Health check utility for the application.
+class ResourceSampler:
+    """Samples system resources in a background thread.
     
-    This class provides methods to check the health of various components
-    of the application, including system resources, database connections,
-    and external services.
+    psutil calls (and especially ``cpu_percent`` with an interval) are too
+    slow to run on every probe, so a daemon thread refreshes a snapshot every
+    ``interval`` seconds and health checks just read it.
     """
     
-    @staticmethod
-    def check_system() -> Dict[str, Any]:
-        """Check system health (CPU, memory, disk).
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.sampled_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = None
+        self._static = {
+            "platform": platform.platform(),
+            "python": sys.version,
+        }
+    
+    def start(self) -> None:
+        """Start the sampling thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
         
-        Returns:
-            Dict with system health information
-        """
+        # psutil is imported on first use rather than at startup
+        import psutil
+        
+        # Prime the CPU counters; the first non-blocking reading is meaningless
+        psutil.cpu_percent(interval=None)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the last successful sample (infinite if none yet)."""
+        if self.snapshot is None:
+            return float("inf")
+        return time.monotonic() - self.sampled_at
+    
+    def is_fresh(self) -> bool:
+        """Whether the snapshot is recent, i.e. the sampler is keeping up."""
+        return self.age < self.interval * 3
+    
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Return the latest snapshot, sampling once if the sampler never ran."""
+        if self.snapshot is None:
+            self.sample()
+        return self.snapshot
+    
+    def sample(self) -> Dict[str, Any]:
+        """Take a fresh snapshot of CPU, memory, disk and process usage."""
         try:
-            # Get CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            import psutil
+            
+            if self._process is None:
+                self._process = psutil.Process(os.getpid())
+            
+            # CPU usage since the previous sample; never sleeps
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Get memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
+            memory_percent = psutil.virtual_memory().percent
             
             # Get disk usage for the current directory
-            disk = psutil.disk_usage(os.getcwd())
-            disk_percent = disk.percent
+            disk_percent = psutil.disk_usage(os.getcwd()).percent
             
             # Get process information
-            process = psutil.Process(os.getpid())
-            process_memory_mb = process.memory_info().rss / (1024 * 1024)  # Convert to MB
+            process_memory_mb = self._process.memory_info().rss / (1024 * 1024)  # Convert to MB
             
-            return {
+            snapshot = {
                 "status": "healthy",
                 "cpu": {
                     "percent": cpu_percent,
@@ -56,15 +103,48 @@ class HealthCheck:
                     "memory_mb": round(process_memory_mb, 2),
                     "status": "warning" if process_memory_mb > 500 else "healthy",
                 },
-                "platform": platform.platform(),
-                "python": sys.version,
+                **self._static,
             }
         except Exception as e:
-            app_logger.error(f"Error checking system health: {e}")
-            return {
+            app_logger.error("Error checking system health: %s", e)
+            snapshot = {
                 "status": "error",
                 "message": str(e),
             }
+        
+        self.snapshot = snapshot
+        self.sampled_at = time.monotonic()
+        return snapshot
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+
+# Global sampler; started and stopped with the application
+resource_sampler = ResourceSampler()
+
+
+class HealthCheck:
+    """Health check utility for the application.
+    
+    This class provides methods to check the health of various components
+    of the application, including system resources, database connections,
+    and external services.
+    """
+    
+    @staticmethod
+    def check_system() -> Dict[str, Any]:
+        """Check system health (CPU, memory, disk).
+        
+        Reads the background sampler's snapshot, so it never blocks.
+        
+        Returns:
+            Dict with system health information
+        """
+        snapshot = resource_sampler.get_snapshot()
+        return {**snapshot, "sample_age_s": round(resource_sampler.age, 2)}
     
     @staticmethod
     def check_database() -> Dict[str, Any]:
@@ -84,7 +164,7 @@ class HealthCheck:
                 "message": "Database health check not configured",
             }
         except Exception as e:
-            app_logger.error(f"Error checking database health: {e}")
+            app_logger.error("Error checking database health: %s", e)
             return {
                 "status": "error",
                 "message": str(e),
@@ -139,6 +219,32 @@ class HealthCheck:
             "services": services_health,
         }
 
+    @staticmethod
+    def liveness() -> Dict[str, Any]:
+        """Liveness probe: the process is up and serving requests.
+        
+        Deliberately checks nothing else, so a slow dependency never gets a
+        healthy instance restarted.
+        """
+        return {"status": "alive", "timestamp": time.time()}
+    
+    @staticmethod
+    def readiness() -> Dict[str, Any]:
+        """Readiness probe: the instance can take traffic.
+        
+        Returns:
+            Dict with a ``ready`` flag and the checks it was based on
+        """
+        sampler_fresh = resource_sampler.is_fresh()
+        database_status = HealthCheck.check_database().get("status")
+        return {
+            "ready": sampler_fresh and database_status != "error",
+            "checks": {
+                "resource_sampler": "healthy" if sampler_fresh else "stale",
+                "database": database_status,
+            },
+        }
+
 # Helper function to check if a specific component is healthy
 def is_healthy(component: str = "all") -> bool:
     """Check if a specific component is healthy.
@@ -160,5 +266,5 @@ def is_healthy(component: str = "all") -> bool:
             health = HealthCheck.check_all()
             return health.get("status") == "healthy"
     except Exception as e:
-        app_logger.error(f"Error checking health for {component}: {e}")
+        app_logger.error("Error checking health for %s: %s", component, e)
         return False
\ No newline at end of file
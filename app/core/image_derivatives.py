@@ -0,0 +1,277 @@
+"""Responsive image derivatives built with Pillow
+
+Cached source images from the asset manager are resized into width-stepped
+WebP (and AVIF, when the installed Pillow can encode it) variants. Encoding
+runs in a small process pool so it never competes with the event loop, and
+every variant is memoized on disk next to the source cache. The same module
+precomputes the tiny blurred placeholders stored in the asset manifest.
+"""
+
+import asyncio
+import base64
+import functools
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from PIL import Image, ImageFilter, features
+
+from app.core.assets import IMAGE_PROXY_PATH, ImageAsset, ProfessionalAssetManager
+from app.core.timing import stage
+
+logger = logging.getLogger(__name__)
+
+# Width steps offered in srcset; the largest matches the source assets
+DERIVATIVE_WIDTHS = (320, 640, 960, 1200)
+
+# Width of the low-quality image placeholder inlined into pages
+PLACEHOLDER_WIDTH = 20
+
+# Encoder quality per output format
+FORMAT_QUALITY = {
+    "avif": 50,
+    "webp": 75,
+}
+
+MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def supported_formats() -> List[str]:
+    """Return the derivative formats this Pillow build can encode, best first
+
+    Detected on first use: ``Image.init()`` imports every Pillow plugin, which
+    is too slow to pay for at import time.
+    """
+
+    try:
+        import pillow_avif  # noqa: F401  (optional plugin registering the AVIF encoder)
+    except ImportError:
+        pass
+
+    Image.init()
+    formats = []
+    if "AVIF" in Image.SAVE:
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    return formats
+
+
+def _render_derivative(source: str, target: str, width: int, fmt: str) -> None:
+    """Resize a source image and encode it (runs inside a worker process)"""
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+
+        tmp_target = f"{target}.{os.getpid()}.tmp"
+        image.save(tmp_target, format=fmt.upper(), quality=FORMAT_QUALITY[fmt])
+        os.replace(tmp_target, target)
+
+
+class DerivativeEngine:
+    """Produces and memoizes resized, re-encoded variants of cached images"""
+
+    def __init__(self, asset_manager: ProfessionalAssetManager, max_workers: Optional[int] = None):
+        self.asset_manager = asset_manager
+        self.output_dir = asset_manager.derived_dir
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or min(2, os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Path, asyncio.Future] = {}
+
+    async def get_derivative(self, key: str, width: int, fmt: str) -> Optional[Path]:
+        """Return the derivative of an image, rendering it on first request
+
+        Returns None for unknown images, widths or formats.
+        """
+
+        if width not in DERIVATIVE_WIDTHS or fmt not in supported_formats():
+            return None
+
+        # Source lookup may download the original, so keep it off the event loop
+        source = await asyncio.to_thread(self.asset_manager.get_cached_image, key)
+        if source is None:
+            return None
+
+        # Named after the source content digest, so a re-fetched image never
+        # serves stale variants
+        target = self.output_dir / f"{source.stem}-{width}.{fmt}"
+        try:
+            # Marks it as recently used for the cache's LRU eviction
+            os.utime(target)
+            return target
+        except FileNotFoundError:
+            pass
+
+        # Concurrent requests for the same variant share one encode
+        pending = self._pending.get(target)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(
+                self._get_executor(), _render_derivative, str(source), str(target), width, fmt
+            )
+            self._pending[target] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(target, None))
+
+        try:
+            await asyncio.shield(pending)
+        except Exception as e:
+            logger.error("Failed to render %s derivative %sw of %s: %s", fmt, width, key, e)
+            return None
+
+        # Derivatives share the image cache's size cap
+        await asyncio.to_thread(self.asset_manager.trim_cache)
+        return target
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use"""
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+
+def compute_placeholder(source: Path) -> Dict[str, str]:
+    """Compute the blurred placeholder data URI and dominant colour of an image"""
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+        thumbnail = image.resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR)
+
+    red, green, blue = thumbnail.resize((1, 1), Image.BOX).getpixel((0, 0))
+
+    # WebP keeps the inlined preview to a few hundred bytes; JPEG headers alone are ~600
+    fmt = "webp" if "webp" in supported_formats() else "jpeg"
+    buffer = io.BytesIO()
+    thumbnail.filter(ImageFilter.GaussianBlur(1)).save(buffer, format=fmt.upper(), quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    return {
+        "placeholder": f"data:image/{fmt};base64,{encoded}",
+        "dominant_color": f"#{red:02x}{green:02x}{blue:02x}",
+    }
+
+
+def precompute_placeholders(asset_manager: ProfessionalAssetManager) -> int:
+    """Fill in placeholders for every manifest asset that lacks one
+
+    Blocking (it may download source images); run it at build time or in a
+    worker thread. Returns the number of assets updated.
+    """
+
+    updates = {}
+    for section_assets in asset_manager.get_manifest().values():
+        for asset in section_assets:
+            if asset.placeholder or asset.key in updates:
+                continue
+
+            source = asset_manager.get_cached_image(asset.key)
+            if source is None:
+                continue
+
+            try:
+                updates[asset.key] = compute_placeholder(source)
+            except Exception as e:
+                logger.warning("Could not compute placeholder for %s: %s", asset.key, e)
+
+    if updates:
+        asset_manager.update_manifest(updates)
+        logger.info("Precomputed placeholders for %s images", len(updates))
+    return len(updates)
+
+
+def placeholder_style(asset: ImageAsset) -> str:
+    """Inline CSS showing an asset's placeholder behind the real image"""
+
+    if not asset.placeholder:
+        return ""
+    return (
+        f"background: {asset.dominant_color} url('{asset.placeholder}') center / cover no-repeat;"
+    )
+
+
+def build_srcset(asset: ImageAsset, fmt: str, widths: Sequence[int] = DERIVATIVE_WIDTHS) -> str:
+    """Build a srcset attribute value for one derivative format"""
+
+    return ", ".join(f"{asset.local_url}/{width}.{fmt} {width}w" for width in widths)
+
+
+def picture_html(asset: ImageAsset, sizes: str, css_class: str = "", style: str = "") -> str:
+    """Build a ``<picture>`` element offering every supported derivative format
+
+    Browsers pick the best format and width for the slot; the local proxy URL
+    of the original remains the ``<img>`` fallback. The asset's placeholder is
+    painted as the image background until the image itself arrives.
+    """
+
+    sources = "".join(
+        f'<source type="{MIME_TYPES[fmt]}" srcset="{build_srcset(asset, fmt)}" sizes="{sizes}">'
+        for fmt in supported_formats()
+    )
+
+    # Without a precomputed placeholder fall back to the shimmer animation
+    if not asset.placeholder:
+        css_class = f"{css_class} image-loading".strip()
+    style = f"{placeholder_style(asset)} {style}".strip()
+
+    class_attr = f' class="{css_class}"' if css_class else ""
+    style_attr = f' style="{style}"' if style else ""
+    return (
+        f'<picture>{sources}'
+        f'<img src="{asset.local_url}" alt="{escape(asset.alt_text)}" loading="lazy" decoding="async"'
+        f'{class_attr}{style_attr}></picture>'
+    )
+
+
+def add_image_derivative_route(app, engine: DerivativeEngine, url_path: str = IMAGE_PROXY_PATH) -> None:
+    """Serve derivatives at ``<url_path>/<key>/<width>.<format>``
+
+    Args:
+        app: The FastAPI (NiceGUI) application
+        engine: Derivative engine that renders the variants
+        url_path: URL prefix of the image proxy
+    """
+    from fastapi import HTTPException, Request, Response
+    from fastapi.responses import FileResponse
+
+    @app.get(url_path + "/{key}/{variant}", include_in_schema=False)
+    async def image_derivative(key: str, variant: str, request: Request) -> Response:
+        width, _, fmt = variant.partition(".")
+        with stage("derive"):
+            path = await engine.get_derivative(key, int(width), fmt) if width.isdigit() else None
+        if path is None:
+            raise HTTPException(status_code=404, detail="Image not found")
+
+        etag = f'"{path.stem}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=2592000",
+        }
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        return FileResponse(path, media_type=MIME_TYPES[fmt], headers=headers)
+
+
+if __name__ == "__main__":
+    # Build-time entry point: python -m app.core.image_derivatives
+    precompute_placeholders(ProfessionalAssetManager())
@@ -0,0 +1,140 @@
+"""Asynchronous, pooled validation of external image URLs"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from app.core.assets import AssetManifest, ImageAsset, ProfessionalAssetManager
+from app.core.circuit_breaker import HostBreakers, host_breakers
+from app.core.state import StateBackend, shared_state
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncImageValidator:
+    """Checks many image URLs concurrently without blocking the event loop
+
+    Requests share one keep-alive ``httpx.AsyncClient``, concurrency is capped
+    by a semaphore, results are cached with a TTL in the shared state backend
+    (so workers validate each URL once), and every host is guarded by a
+    circuit breaker so a degraded provider is skipped instead of awaited.
+    ``httpx`` is imported with the first request rather than at startup.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        timeout: float = 5.0,
+        ttl: float = 600.0,
+        negative_ttl: float = 60.0,
+        breakers: HostBreakers = host_breakers,
+        state: StateBackend = shared_state,
+    ):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.breakers = breakers
+        self.state = state
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    async def validate(self, url: str) -> bool:
+        """Check whether an image URL is reachable and serves an image"""
+
+        key = f"image-valid:{url}"
+        try:
+            cached = await self.state.aget(key)
+        except Exception as e:
+            logger.debug("Image validation cache unavailable: %s", e)
+            cached = None
+        if cached is not None:
+            return cached
+
+        try:
+            breaker = self.breakers.for_url(url)
+        except ValueError as e:
+            logger.warning("Invalid image URL %s: %s", url, e)
+            return False
+        if not breaker.allow():
+            return False
+
+        async with self._semaphore:
+            try:
+                response = await self._get_client().head(url)
+                is_image = response.headers.get("content-type", "").startswith("image/")
+                ok = response.status_code == 200 and is_image
+                # A missing image is not a degraded provider; errors, 5xx and
+                # pages served in place of images (e.g. a retired API) are
+                provider_healthy = response.status_code < 500 and (is_image or response.status_code != 200)
+                if response.status_code == 200 and not is_image:
+                    logger.warning(
+                        "Image validation for %s returned non-image content (%s)",
+                        url, response.headers.get("content-type") or "unknown",
+                    )
+            except Exception as e:
+                logger.warning("Image validation failed for %s: %s", url, e)
+                ok = provider_healthy = False
+
+        if provider_healthy:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+        try:
+            await self.state.aset(key, ok, ttl=self.ttl if ok else self.negative_ttl)
+        except Exception as e:
+            logger.debug("Image validation cache unavailable: %s", e)
+        return ok
+
+    async def validate_many(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """Check several URLs concurrently"""
+
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.validate(url) for url in unique_urls))
+        return dict(zip(unique_urls, results))
+
+    async def resolve(self, asset: ImageAsset) -> str:
+        """Pick the best reachable URL for an asset
+
+        Falls back from the primary to the fallback URL and finally to a local
+        placeholder that needs no network at all.
+        """
+
+        if await self.validate(asset.primary_url):
+            return asset.primary_url
+        if await self.validate(asset.fallback_url):
+            return asset.fallback_url
+        return ProfessionalAssetManager.get_local_placeholder(asset.width, asset.height)
+
+    async def resolve_manifest(self, manifest: AssetManifest) -> Dict[str, str]:
+        """Resolve every asset of a manifest, keyed by asset key"""
+
+        assets = [asset for section_assets in manifest.values() for asset in section_assets]
+        urls = await asyncio.gather(*(self.resolve(asset) for asset in assets))
+        return {asset.key: url for asset, url in zip(assets, urls)}
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Create the pooled client on first use (inside the running loop)"""
+
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+                ),
+                follow_redirects=True,
+            )
+        return self._client
@@ -1,42 +1,37 @@
 """Logging configuration for the application"""
 
 import logging
-import sys
 from pathlib import Path
 
+from .logging import BatchFileHandler, add_log_handler, create_formatter
+
+formatter = create_formatter(datefmt=None)
+
 
 def setup_logger(name: str = "portfolio_app", level: int = logging.INFO) -> logging.Logger:
-    """Setup application logger with console and file handlers"""
+    """Setup application logger with console and file output
+    
+    Records propagate to the queue-based pipeline in ``app.core.logging``,
+    which writes them to the console and files from a background thread.
+    """
     
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Create formatters
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
+    # File handler (optional); the pipeline ignores a second "portfolio_file"
     try:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
-        file_handler = logging.FileHandler(log_dir / "portfolio.log")
+        file_handler = BatchFileHandler(log_dir / "portfolio.log", delay=True)
+        file_handler.set_name("portfolio_file")
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # The pipeline sees every logger's records; this file only gets ours
+        file_handler.addFilter(logging.Filter(name))
+        add_log_handler(file_handler)
     except Exception as e:
-        logger.warning(f"Could not setup file logging: {e}")
+        logger.warning("Could not setup file logging: %s", e)
     
     return logger
 
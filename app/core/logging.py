@@ -1,32 +1,244 @@
+import atexit
+import json
 import logging
 import os
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Dict, Any, List
 
-# Configure the root logger
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+from app.core.metrics import Sample, metrics
 
-# Create a logger for the application
-app_logger = logging.getLogger("app")
+# Log calls never touch the disk or the terminal: the root logger's only
+# handler puts records on a bounded queue, and a background thread formats
+# and writes them in batches. Every logger (``app``, ``portfolio_app`` and
+# module loggers) propagates to the root, so all output shares one pipeline.
+# Messages are rendered on the writer thread too, and records dropped by
+# sampling are never rendered at all.
+
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = 256
+# "text" or "json" (one object per line, ``extra`` fields included)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Share of records kept, by level or logger name, e.g. "INFO=0.01,httpx=0.1"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Arguments that are safe to render later on the writer thread
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra`` fields become top-level keys"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a share of low-severity records
+    
+    Rates are looked up by the longest matching logger name prefix, then by
+    level. ERROR and above are never sampled. Kept records carry their
+    ``sample_rate`` so counts can be scaled back up.
+    """
+    
+    def __init__(self, level_rates: Dict[int, float], logger_rates: Dict[str, float]):
+        super().__init__()
+        self.level_rates = level_rates
+        self.logger_rates = logger_rates
+        self._by_logger: Dict[str, Optional[float]] = {}
+        self.dropped = 0
+    
+    @classmethod
+    def from_spec(cls, spec: str) -> "SamplingFilter":
+        """Parse ``"INFO=0.01,httpx=0.1"`` style rates"""
+        level_rates: Dict[int, float] = {}
+        logger_rates: Dict[str, float] = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, rate = item.partition("=")
+            value = min(1.0, max(0.0, float(rate)))
+            level = logging.getLevelName(name.strip().upper())
+            if isinstance(level, int):
+                level_rates[level] = value
+            else:
+                logger_rates[name.strip()] = value
+        return cls(level_rates, logger_rates)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        
+        rate = self._logger_rate(record.name)
+        if rate is None:
+            rate = self.level_rates.get(record.levelno, 1.0)
+        if rate >= 1.0:
+            return True
+        if random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.dropped += 1
+        return False
+    
+    def _logger_rate(self, name: str) -> Optional[float]:
+        if name not in self._by_logger:
+            matches = [
+                prefix for prefix in self.logger_rates
+                if name == prefix or name.startswith(prefix + ".")
+            ]
+            self._by_logger[name] = self.logger_rates[max(matches, key=len)] if matches else None
+        return self._by_logger[name]
+
+
+class _BatchFlush:
+    """Handler mixin: ``emit`` writes without flushing, the listener flushes once per batch"""
+    
+    def flush(self) -> None:
+        pass
+    
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class BatchStreamHandler(_BatchFlush, logging.StreamHandler):
+    """Stream handler flushed once per batch of records"""
+
+
+class BatchRotatingFileHandler(_BatchFlush, RotatingFileHandler):
+    """Rotating file handler flushed once per batch of records"""
+
+
+class BatchFileHandler(_BatchFlush, logging.FileHandler):
+    """File handler flushed once per batch of records"""
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Leave rendering to the writer thread unless an argument could change before then"""
+        args = record.args
+        if args:
+            # A mapping argument may be rendered whole by "%s", so it is never deferred
+            if isinstance(args, Mapping) or not all(isinstance(value, _IMMUTABLE_ARGS) for value in args):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener(QueueListener):
+    """Queue listener that handles records in batches
+    
+    Blocks for one record, then drains up to ``batch_size`` more before
+    flushing the handlers. Handlers can be added while it runs.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = LOG_BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+    
+    def add_handler(self, handler: logging.Handler) -> None:
+        """Add an output handler unless one with the same name is present"""
+        if handler.name and any(h.name == handler.name for h in self.handlers):
+            return
+        # Replaced, not mutated, so the listener thread never sees a half-updated tuple
+        self.handlers = self.handlers + (handler,)
+    
+    def enqueue_sentinel(self) -> None:
+        # Blocking put: the stop marker must not be dropped by a full queue
+        self.queue.put(self._sentinel)
+    
+    def _monitor(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            
+            flushed: List[threading.Event] = []
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                elif isinstance(record, threading.Event):
+                    flushed.append(record)
+                else:
+                    self.handle(record)
+            self._flush_handlers()
+            
+            for event in flushed:
+                event.set()
+            for _ in batch:
+                self.queue.task_done()
+    
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, _BatchFlush):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            except Exception:
+                handler.handleError(None)
+
+
+log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+queue_handler = BoundedQueueHandler(log_queue)
+
+# Sampled out before the record is queued
+sampling_filter = SamplingFilter.from_spec(LOG_SAMPLING)
+queue_handler.addFilter(sampling_filter)
+
+
+def create_formatter(datefmt: Optional[str] = "%Y-%m-%d %H:%M:%S") -> logging.Formatter:
+    """Formatter for the configured ``LOG_FORMAT``"""
+    if LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt=datefmt)
 
-# Set the default level
-app_logger.setLevel(logging.INFO)
 
 # Create a formatter
-formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+formatter = create_formatter()
 
 # Create a console handler
-console_handler = logging.StreamHandler(sys.stdout)
+console_handler = BatchStreamHandler(sys.stdout)
+console_handler.set_name("console")
 console_handler.setFormatter(formatter)
-app_logger.addHandler(console_handler)
+
+log_listener = BatchQueueListener(log_queue, console_handler)
 
 # Create a file handler if LOG_FILE is set in environment
 log_file = os.getenv("LOG_FILE")
@@ -37,19 +249,94 @@ if log_file:
         os.makedirs(log_dir)
     
     # Create a rotating file handler (10 MB max size, keep 5 backup files)
-    file_handler = RotatingFileHandler(
+    file_handler = BatchRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=5,
     )
+    file_handler.set_name("log_file")
     file_handler.setFormatter(formatter)
-    app_logger.addHandler(file_handler)
+    log_listener.add_handler(file_handler)
+
+# Configure the root logger
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+if queue_handler not in root_logger.handlers:
+    root_logger.addHandler(queue_handler)
+
+log_listener.start()
+
+# Create a logger for the application
+app_logger = logging.getLogger("app")
+
+# Set the default level
+app_logger.setLevel(logging.INFO)
 
 # Set log level from environment variable if provided
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 if log_level in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
     app_logger.setLevel(getattr(logging, log_level))
 
+
+def add_log_handler(handler: logging.Handler) -> None:
+    """Write all log records to ``handler`` too (from the background thread)"""
+    log_listener.add_handler(handler)
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Wait until every record logged so far has been written
+    
+    Returns False if the queue was not drained within ``timeout`` seconds.
+    """
+    marker = threading.Event()
+    try:
+        log_queue.put(marker, timeout=timeout)
+    except queue.Full:
+        return False
+    return marker.wait(timeout)
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background thread"""
+    if log_listener._thread is None:
+        return
+    log_listener.stop()
+    if queue_handler.dropped:
+        print(f"Logging queue overflowed: {queue_handler.dropped} records dropped", file=sys.stderr)
+
+
+atexit.register(stop_logging)
+
+
+def restart_logging_after_fork() -> None:
+    """Give a forked server process its own queue and writer thread
+    
+    The parent's writer thread does not exist in the child, and records still
+    queued at the fork belong to the parent. Called by the multi-worker
+    launcher in its workers and proxy only; other forked children (such as
+    the image derivative pool) never start a writer thread of their own.
+    """
+    global log_queue
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler.queue = log_queue
+    log_listener.queue = log_queue
+    if log_listener._thread is not None:
+        log_listener._thread = None
+        log_listener.start()
+
+
+def _collect_metrics() -> List[Sample]:
+    return [
+        ("log_records_dropped_total", "counter", "Log records dropped because the logging queue was full",
+         [({}, queue_handler.dropped)]),
+        ("log_queue_depth", "gauge", "Log records waiting to be written", [({}, log_queue.qsize())]),
+        ("log_records_sampled_out_total", "counter", "Log records skipped by LOG_SAMPLING",
+         [({}, sampling_filter.dropped)]),
+    ]
+
+
+metrics.add_collector(_collect_metrics)
+
 # Helper function to create a logger for a specific module
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """Create a logger for a specific module.
@@ -57,7 +344,7 @@ def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     Args:
         name: The name of the module (typically __name__)
         level: Optional log level override
-        
+    
     Returns:
         A configured logger instance
     """
@@ -69,15 +356,7 @@ def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     else:
         logger.setLevel(app_logger.level)
     
-    # Add handlers if not already present
-    if not logger.handlers:
-        # Add console handler
-        logger.addHandler(console_handler)
-        
-        # Add file handler if available
-        if log_file and 'file_handler' in locals():
-            logger.addHandler(file_handler)
-    
+    # Records propagate to the root logger's queue handler
     return logger
 
 # Helper function to log structured data
@@ -90,13 +369,9 @@ def log_structured(logger: logging.Logger, level: str, message: str, data: Dict[
         message: The log message
         data: Dictionary of structured data to include
     """
-    if level.lower() == "debug":
-        logger.debug(f"{message} - {data}")
-    elif level.lower() == "info":
-        logger.info(f"{message} - {data}")
-    elif level.lower() == "warning":
-        logger.warning(f"{message} - {data}")
-    elif level.lower() == "error":
-        logger.error(f"{message} - {data}")
-    elif level.lower() == "critical":
-        logger.critical(f"{message} - {data}")
\ No newline at end of file
+    levelno = getattr(logging, level.upper(), None)
+    if not isinstance(levelno, int) or not logger.isEnabledFor(levelno):
+        return
+    
+    # The JSON formatter emits ``data`` as a structured field
+    logger.log(levelno, f"{message} - {data}", extra={"data": data})
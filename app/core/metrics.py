@@ -0,0 +1,296 @@
+"""In-process metrics registry rendered in the Prometheus text format
+
+A deliberately small subset of ``prometheus_client``: counters, gauges and
+histograms with fixed label names, plus collector callbacks that read values
+owned by other objects (cache counters, client counts) at scrape time.
+Updates happen on the event loop thread, so no locking is done.
+
+``MetricsServer`` exposes them on a port of their own, so the public port
+never serves ``/metrics``.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import socket
+from bisect import bisect_left
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds (the prometheus_client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# A collected metric: (name, type, help, [(label dict, value), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding one value per label combination"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for label_values, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self._labels(label_values))} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for label_values, (counts, total) in self._series.items():
+            labels = self._labels(label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Owns every metric and renders them for ``/metrics``"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callback producing samples at scrape time"""
+        self._collectors.append(collector)
+
+    def add_cache(self, name: str, counts: Callable[[], Tuple[int, int]]) -> None:
+        """Report a cache's hits and misses, read from ``counts()`` at scrape time"""
+        if not self._caches:
+            self._collectors.append(self._collect_caches)
+        self._caches[name] = counts
+
+    def _collect_caches(self) -> List[Sample]:
+        """Hit/miss counters and hit ratios of every registered cache"""
+
+        requests = []
+        ratios = []
+        for name, counts in self._caches.items():
+            hits, misses = counts()
+            requests.append(({"cache": name, "result": "hit"}, hits))
+            requests.append(({"cache": name, "result": "miss"}, misses))
+            ratios.append(({"cache": name}, hits / (hits + misses) if hits + misses else 0.0))
+        return [
+            ("cache_requests_total", "counter", "Cache lookups by result", requests),
+            ("cache_hit_ratio", "gauge", "Share of cache lookups that were hits", ratios),
+        ]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                logger.warning("Metrics collector %r failed: %s", collector, e)
+                continue
+            for name, metric_type, help, values in samples:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in values:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+
+# Global registry
+metrics = MetricsRegistry()
+
+
+class MetricsServer:
+    """Minimal HTTP server answering ``GET /metrics`` on its own port
+
+    Runs on the event loop of the app it reports on, so collectors see the
+    same state as request handlers. Only the scrape path is served; anything
+    else gets a 404, and every connection is closed after one response.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], Union[str, Awaitable[str]]] = metrics.render,
+        path: str = "/metrics",
+        timeout: float = 5.0,
+    ):
+        self.render = render
+        self.path = path
+        self.timeout = timeout
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None, sock: Optional[socket.socket] = None) -> None:
+        """Listen on ``host:port`` or on an already bound ``sock``"""
+
+        if sock is not None:
+            self._server = await asyncio.start_server(self._handle, sock=sock)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        address = self._server.sockets[0].getsockname()
+        logger.info("Metrics served on http://%s:%s%s", address[0], address[1], self.path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            # Headers are not needed, but must be read before answering
+            while (await asyncio.wait_for(reader.readline(), self.timeout)).strip():
+                pass
+
+            method, _, target = request_line.decode("latin-1").partition(" ")
+            target = target.split(" ", 1)[0].split("?", 1)[0]
+            content_type = "text/plain; charset=utf-8"
+            if target != self.path:
+                status, body = "404 Not Found", b"Not Found"
+            elif method not in ("GET", "HEAD"):
+                status, body = "405 Method Not Allowed", b"Method Not Allowed"
+            else:
+                text = self.render()
+                if inspect.isawaitable(text):
+                    text = await text
+                status, body, content_type = "200 OK", text.encode(), CONTENT_TYPE
+
+            head = (
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(head.encode() + (b"" if method == "HEAD" else body))
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Metrics request failed")
+        finally:
+            writer.close()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP responses by route and status", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "HTTP requests currently being served")
+EVENT_LOOP_LAG = metrics.gauge("event_loop_lag_seconds", "Delay of the most recent event loop lag probe")
+EVENT_LOOP_LAG_MAX = metrics.gauge("event_loop_lag_max_seconds", "Largest event loop lag observed since startup")
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Measure how late the event loop wakes a sleeping task, forever"""
+
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        EVENT_LOOP_LAG.set(lag)
+        if lag > EVENT_LOOP_LAG_MAX.get():
+            EVENT_LOOP_LAG_MAX.set(lag)
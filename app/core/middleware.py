@@ -1,12 +1,34 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.sessions import SessionMiddleware
+import asyncio
+import hashlib
+import ipaddress
+import json
+import math
+import re
 import time
-from typing import Callable, List
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs
 
 # Import settings
+from app.core.compression import STATIC_DIRECTORIES, add_compression
 from app.core.config import settings
+from app.core.health import HealthCheck
+from app.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    metrics,
+)
+from app.core.state import StateBackend
+from app.core.timing import begin_request, format_server_timing
 from app.core.logging import app_logger
 
 def setup_middleware(app: FastAPI) -> None:
@@ -24,8 +46,11 @@ def setup_middleware(app: FastAPI) -> None:
         allow_headers=["*"],
     )
     
-    # Add GZip compression middleware
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Add ETags / 304 responses, inside compression so each encoding gets its own
+    add_conditional_get(app)
+    
+    # Add br/zstd/gzip compression (precompressed sidecars for static files)
+    add_compression(app, minimum_size=1000)
     
     # Add session middleware if secret key is set
     if settings.secret_key and settings.secret_key != "CHANGEME_IN_PRODUCTION":
@@ -36,24 +61,438 @@ def setup_middleware(app: FastAPI) -> None:
         )
     
     # Add request timing middleware
-    @app.middleware("http")
-    async def add_process_time_header(request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+    add_timing(app)
+    
+    # Request metrics, served by MetricsServer on METRICS_PORT
+    add_metrics(app)
+    
+    # Health probes short-circuit every other middleware, so add this last
+    add_health_check(app)
     
     # Log middleware setup
     app_logger.info("Middleware configured successfully")
 
 # Custom middleware classes
 
+class HealthCheckMiddleware:
+    """Answers health probes before the rest of the stack sees them.
+    
+    Installed as the outermost middleware, probes never reach NiceGUI (so no
+    client or page is allocated), GZip or sessions. Responses are plain JSON
+    built from :class:`HealthCheck`, whose checks read cached snapshots.
+    
+    - ``{path}``: full report
+    - ``{path}/live``: liveness
+    - ``{path}/ready``: readiness (503 when not ready)
+    """
+    def __init__(self, app, path: str = "/health"):
+        self.app = app
+        self.routes = {
+            path: self._report,
+            f"{path}/live": self._liveness,
+            f"{path}/ready": self._readiness,
+        }
+    
+    async def __call__(self, scope, receive, send):
+        handler = self.routes.get(scope["path"]) if scope["type"] == "http" else None
+        if handler is None or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        
+        status, payload = handler()
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                [b"content-type", b"application/json"],
+                [b"content-length", str(len(body)).encode()],
+                [b"cache-control", b"no-store"],
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": body if scope["method"] == "GET" else b"",
+        })
+    
+    @staticmethod
+    def _report():
+        return 200, HealthCheck.check_all()
+    
+    @staticmethod
+    def _liveness():
+        return 200, HealthCheck.liveness()
+    
+    @staticmethod
+    def _readiness():
+        report = HealthCheck.readiness()
+        return (200 if report["ready"] else 503), report
+
+
+class ConditionalGetMiddleware:
+    """Strong ETags and 304 responses for static files and API responses.
+    
+    Static files get a content-hash ETag memoized per (mtime, size), so a
+    matching ``If-None-Match`` or ``If-Modified-Since`` turns into a bodiless
+    304. Other successful GET responses with a Content-Length of at most
+    ``max_body_size`` are buffered and hashed; responses that already carry
+    an ETag keep it. Streaming and ``no-store`` responses pass through.
+    
+    Install it inside the compression middleware: precompressed sidecars are
+    then hashed separately, giving every encoding its own validator.
+    """
+    def __init__(self, app, max_body_size: int = 1024 * 1024, static_directories: Dict[str, Path] = None):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.static_directories = [
+            (prefix.rstrip("/") + "/", Path(directory).resolve())
+            for prefix, directory in (static_directories or STATIC_DIRECTORIES).items()
+        ]
+        # Resolved file path -> (mtime_ns, size, etag)
+        self._file_etags: "OrderedDict[str, tuple]" = OrderedDict()
+        self.max_file_etags = 4096
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        
+        request_headers = Headers(scope=scope)
+        path = self._static_file(scope["path"])
+        if path is not None:
+            return await self._static(path, request_headers, scope, receive, send)
+        if scope["method"] == "HEAD":
+            # No body to hash
+            return await self.app(scope, receive, send)
+        return await self._dynamic(request_headers, scope, receive, send)
+    
+    def _static_file(self, url_path: str) -> Optional[Path]:
+        """Map a URL to a file in a static directory, if it is one."""
+        for prefix, directory in self.static_directories:
+            if url_path.startswith(prefix):
+                path = (directory / url_path[len(prefix):]).resolve()
+                if directory in path.parents and path.is_file():
+                    return path
+                return None
+        return None
+    
+    async def _static(self, path: Path, request_headers, scope, receive, send):
+        stat = path.stat()
+        etag = await self._file_etag(path, stat)
+        if self._not_modified(request_headers, etag, stat.st_mtime):
+            # Let the file handler build the headers (Cache-Control etc.), then
+            # turn the response into a bodiless 304
+            return await self.app(scope, receive, self._as_not_modified(send, etag))
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(raw=message["headers"])
+                headers["ETag"] = etag
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def _file_etag(self, path: Path, stat) -> str:
+        """Content-hash ETag of a file, recomputed only when it changes."""
+        key = str(path)
+        cached = self._file_etags.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._file_etags.move_to_end(key)
+            return cached[2]
+        
+        etag = await asyncio.to_thread(_hash_file, path)
+        self._file_etags[key] = (stat.st_mtime_ns, stat.st_size, etag)
+        if len(self._file_etags) > self.max_file_etags:
+            self._file_etags.popitem(last=False)
+        return etag
+    
+    async def _dynamic(self, request_headers, scope, receive, send):
+        start = None
+        body = []
+        
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Only complete bodies of known, bounded size are buffered and
+                # hashed (NiceGUI's middleware re-chunks every response, so the
+                # first body message alone says nothing about the length)
+                headers = Headers(raw=message["headers"])
+                length = headers.get("content-length")
+                if (
+                    message["status"] == 200
+                    and length is not None and length.isdigit() and int(length) <= self.max_body_size
+                    and "no-store" not in headers.get("cache-control", "")
+                ):
+                    start = message
+                else:
+                    await send(message)
+                return
+            
+            if start is None or message["type"] != "http.response.body":
+                return await send(message)
+            
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            
+            response_start, start = start, None
+            content = b"".join(body)
+            headers = MutableHeaders(raw=response_start["headers"])
+            if "etag" not in headers:
+                headers["ETag"] = _hash_bytes(content)
+            
+            last_modified = headers.get("last-modified")
+            mtime = _parse_http_date(last_modified) if last_modified else None
+            if self._not_modified(request_headers, headers["etag"], mtime):
+                send_304 = self._as_not_modified(send, headers["etag"])
+                await send_304(response_start)
+                return await send_304({"type": "http.response.body", "body": b""})
+            
+            await send(response_start)
+            await send({"type": "http.response.body", "body": content})
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    @staticmethod
+    def _not_modified(request_headers, etag: str, mtime: Optional[float]) -> bool:
+        """Evaluate If-None-Match (weak comparison), else If-Modified-Since."""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return etag.removeprefix("W/") in tags
+        
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since and mtime is not None:
+            since = _parse_http_date(if_modified_since)
+            return since is not None and int(mtime) <= since
+        return False
+    
+    @staticmethod
+    def _as_not_modified(send, etag: str):
+        """Wrap ``send`` to turn the response into a bodiless 304."""
+        async def send_304(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                for name in ("content-length", "content-type", "content-encoding", "content-range"):
+                    if name in headers:
+                        del headers[name]
+                headers["ETag"] = etag
+                message = {**message, "status": 304, "headers": headers.raw}
+            elif message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": b""}
+            await send(message)
+        return send_304
+
+
+def _hash_bytes(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return '"' + digest.hexdigest() + '"'
+
+
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class TimingMiddleware:
+    """Reports server time in ``Server-Timing`` and ``X-Process-Time`` headers.
+    
+    A pure ASGI middleware: no request/response objects or body streaming
+    wrappers, just a ``send`` hook that appends headers when the response
+    starts. ``app`` is the time until the response headers were sent; stages
+    recorded with :func:`app.core.timing.stage` are listed before it.
+    """
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        start = perf_counter_ns()
+        stages = begin_request()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                elapsed = perf_counter_ns() - start
+                stages.append(("app", elapsed))
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", format_server_timing(stages)),
+                    (b"x-process-time", f"{elapsed / 1e9:.6f}".encode()),
+                ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+
+class MetricsMiddleware:
+    """Records request metrics, and serves them at ``path`` if one is given.
+    
+    Latency is labelled with the route template (``/img/{key}``) rather than
+    the raw path, so label cardinality stays bounded; requests that match no
+    route are grouped as ``unmatched``. Production serves the metrics on a
+    separate port instead (``MetricsServer``), so ``path`` is None there.
+    """
+    def __init__(self, app, path: Optional[str] = None):
+        self.app = app
+        self.path = path
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        if self.path is not None and scope["path"] == self.path:
+            return await self._metrics_response(send)
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = self._route_template(scope)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
+    
+    @staticmethod
+    def _route_template(scope) -> str:
+        """Rebuild the matched route's path template from its path parameters."""
+        if "endpoint" not in scope:
+            return "unmatched"
+        
+        path = scope.get("root_path", "") + scope["path"]
+        for name, value in scope.get("path_params", {}).items():
+            value = str(value)
+            if not value:
+                continue
+            if path.endswith("/" + value):
+                # Catch-all parameters such as a static mount's {path}
+                path = path[: -len(value)] + "{" + name + "}"
+            else:
+                path = path.replace("/" + value + "/", "/{" + name + "}/", 1)
+        return path
+    
+    async def _metrics_response(self, send):
+        body = metrics.render().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                [b"content-type", METRICS_CONTENT_TYPE.encode()],
+                [b"content-length", str(len(body)).encode()],
+                [b"cache-control", b"no-store"],
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Peers allowed to report the real client address via X-Forwarded-For
+# (loopback and private networks, which covers Fly.io's proxy)
+DEFAULT_TRUSTED_PROXIES = [
+    "127.0.0.0/8", "::1/128",
+    "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "fc00::/7",
+]
+
+class TokenBucketLimiter:
+    """Token bucket rate limiter with O(1) state per key and bounded memory.
+    
+    Each key holds just its token count and last refill time. Keys are kept in
+    LRU order: buckets idle long enough to have refilled completely are
+    indistinguishable from new ones and are dropped for free, and ``max_keys``
+    puts a hard cap on the table even under a flood of distinct keys.
+    """
+    def __init__(self, rate: float, capacity: int, max_keys: int = 10000):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity  # burst size
+        self.max_keys = max_keys
+        self.full_refill_seconds = capacity / rate
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        
+        # Counters for monitoring
+        self.hits = 0
+        self.drops = 0
+        self.evictions = 0
+    
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """Take a token for ``key``.
+        
+        Args:
+            key: Bucket key (typically the client IP)
+            now: Current monotonic time (defaults to ``time.monotonic()``)
+            
+        Returns:
+            0 if the request is allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        
+        if bucket is None:
+            bucket = [float(self.capacity), now]
+            self._buckets[key] = bucket
+            self._evict(now)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.hits += 1
+            return 0.0
+        
+        self.drops += 1
+        return (1 - bucket[0]) / self.rate
+    
+    def _evict(self, now: float) -> None:
+        """Drop fully refilled buckets and enforce the key cap (oldest first)."""
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - last < self.full_refill_seconds:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Return limiter counters."""
+        return {
+            "hits": self.hits,
+            "drops": self.drops,
+            "evictions": self.evictions,
+            "tracked_keys": len(self._buckets),
+        }
+
+
 class RateLimitMiddleware:
-    """Simple rate limiting middleware.
+    """Token bucket rate limiting middleware.
+    
+    Allows ``limit`` requests per ``window`` seconds per client on average,
+    with bursts of up to ``limit``. Memory is bounded by ``max_keys``.
+    X-Forwarded-For is only honoured when the direct peer is a trusted proxy,
+    so clients cannot pick their own rate limit key by spoofing the header.
     
-    This is a basic implementation. For production, consider using a more
-    robust solution with Redis or another distributed cache.
+    Buckets live in this process unless a shared ``backend`` is given, in which
+    case every worker draws from the same buckets. If the backend is
+    unreachable, requests are let through rather than failed.
     """
     def __init__(
         self,
@@ -61,59 +500,105 @@ class RateLimitMiddleware:
         limit: int = 100,
         window: int = 60,
         exempt_paths: List[str] = None,
+        max_keys: int = 10000,
+        trusted_proxies: List[str] = None,
+        backend: Optional[StateBackend] = None,
     ):
         self.app = app
         self.limit = limit  # requests per window
         self.window = window  # window in seconds
-        self.exempt_paths = exempt_paths or []
-        self.requests = {}
+        self.exempt_paths = tuple(exempt_paths or [])
+        self.backend = backend
+        self.limiter = TokenBucketLimiter(rate=limit / window, capacity=limit, max_keys=max_keys)
+        self.trusted_proxies = [
+            ipaddress.ip_network(network)
+            for network in (DEFAULT_TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies)
+        ]
+        metrics.add_collector(self._collect_metrics)
     
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
         
-        # Get client IP
-        client_ip = self._get_client_ip(scope)
-        path = scope["path"]
-        
         # Skip rate limiting for exempt paths
-        if any(path.startswith(exempt) for exempt in self.exempt_paths):
+        if scope["path"].startswith(self.exempt_paths):
             return await self.app(scope, receive, send)
         
         # Check rate limit
-        current_time = time.time()
-        if client_ip in self.requests:
-            requests_info = self.requests[client_ip]
-            # Clean up old requests
-            requests_info = [r for r in requests_info if current_time - r < self.window]
-            
-            if len(requests_info) >= self.limit:
-                # Rate limit exceeded
-                return await self._rate_limit_response(scope, receive, send)
-            
-            requests_info.append(current_time)
-            self.requests[client_ip] = requests_info
-        else:
-            self.requests[client_ip] = [current_time]
+        retry_after = await self._acquire(self._get_client_ip(scope))
+        if retry_after:
+            return await self._rate_limit_response(scope, receive, send, retry_after)
         
         return await self.app(scope, receive, send)
     
+    async def _acquire(self, client_ip: str) -> float:
+        """Take a token from the client's bucket; returns seconds to wait (0 = allowed)."""
+        if self.backend is None:
+            return self.limiter.acquire(client_ip)
+        
+        try:
+            retry_after = await self.backend.atake_token(client_ip, self.limiter.rate, self.limiter.capacity)
+        except Exception as e:
+            app_logger.warning("Rate limit backend unavailable, allowing request: %s", e)
+            return 0.0
+        
+        if retry_after:
+            self.limiter.drops += 1
+        else:
+            self.limiter.hits += 1
+        return retry_after
+    
+    def _collect_metrics(self):
+        """Expose limiter counters on ``/metrics``."""
+        stats = self.limiter.stats()
+        return [
+            ("rate_limit_requests_total", "counter", "Rate limited requests by result", [
+                ({"result": "allowed"}, stats["hits"]),
+                ({"result": "dropped"}, stats["drops"]),
+            ]),
+            ("rate_limit_tracked_keys", "gauge", "Clients tracked by the in-process limiter", [
+                ({}, stats["tracked_keys"]),
+            ]),
+        ]
+    
+    def _is_trusted(self, address: str) -> bool:
+        """Check whether an address belongs to a trusted proxy."""
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+    
     def _get_client_ip(self, scope):
-        """Extract client IP from scope."""
-        headers = dict(scope.get("headers", []))
-        forwarded = headers.get(b"x-forwarded-for", b"").decode("utf8").split(",")[0].strip()
-        if forwarded:
-            return forwarded
-        return scope.get("client", ("", 0))[0] or "unknown"
-    
-    async def _rate_limit_response(self, scope, receive, send):
+        """Extract client IP from scope.
+        
+        Walks X-Forwarded-For from the right, skipping trusted proxies, and
+        returns the first untrusted hop. The header is ignored entirely when
+        the direct peer is not a trusted proxy.
+        """
+        peer = (scope.get("client") or ("", 0))[0] or "unknown"
+        if not self._is_trusted(peer):
+            return peer
+        
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                for hop in reversed(hops):
+                    if not self._is_trusted(hop):
+                        return hop
+                if hops:
+                    return hops[0]
+                break
+        return peer
+    
+    async def _rate_limit_response(self, scope, receive, send, retry_after: float):
         """Send rate limit exceeded response."""
         await send({
             "type": "http.response.start",
             "status": 429,
             "headers": [
                 [b"content-type", b"application/json"],
-                [b"retry-after", str(self.window).encode()],
+                [b"retry-after", str(math.ceil(retry_after)).encode()],
             ],
         })
         await send({
@@ -121,8 +606,89 @@ class RateLimitMiddleware:
             "body": b'{"detail":"Rate limit exceeded. Please try again later."}',
         })
 
+class StaticPageMiddleware:
+    """Serves a pre-rendered HTML snapshot of a page to clients that cannot use it live.
+    
+    Crawlers, link-preview fetchers and other non-browser clients (by
+    User-Agent, or by an Accept header without ``text/html``) and requests
+    with ``?static=1`` (the ``<noscript>`` fallback) get the snapshot instead
+    of a NiceGUI page, so no client object or websocket state is allocated for
+    them. ``render()`` returns the snapshot bytes and is expected to cache
+    them. Responses are publicly cacheable and vary on the headers used here.
+    """
+    
+    # Crawlers, link unfurlers and HTTP libraries
+    USER_AGENTS = re.compile(
+        r"bot|crawl|spider|slurp|preview|facebookexternalhit|embedly|whatsapp|slack|"
+        r"curl|wget|python-|httpx|go-http-client|okhttp|java/|libwww",
+        re.IGNORECASE,
+    )
+    
+    def __init__(self, app, render: Callable[[], bytes], paths: List[str] = None, max_age: int = 300):
+        self.app = app
+        self.render = render
+        self.paths = frozenset(paths or ["/"])
+        self.cache_control = f"public, max-age={max_age}".encode()
+        self.served = 0
+        metrics.add_collector(self._collect_metrics)
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] not in self.paths
+            or scope["method"] not in ("GET", "HEAD")
+            or not self.wants_static(scope)
+        ):
+            return await self.app(scope, receive, send)
+        
+        body = self.render()
+        self.served += 1
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", self.cache_control),
+                (b"etag", _hash_bytes(body).encode()),
+                (b"vary", b"User-Agent, Accept"),
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": body if scope["method"] == "GET" else b"",
+        })
+    
+    @classmethod
+    def wants_static(cls, scope) -> bool:
+        """Whether a page request should get the snapshot"""
+        if scope["query_string"] and parse_qs(scope["query_string"].decode("latin-1")).get("static") == ["1"]:
+            return True
+        
+        headers = Headers(scope=scope)
+        user_agent = headers.get("user-agent", "")
+        if not user_agent or cls.USER_AGENTS.search(user_agent):
+            return True
+        # Browsers always ask for text/html when navigating to a page
+        return "text/html" not in headers.get("accept", "")
+    
+    def _collect_metrics(self):
+        return [
+            ("static_page_responses_total", "counter", "Page requests answered with the static snapshot",
+             [({}, self.served)]),
+        ]
+
+
 # Helper function to add rate limiting
-def add_rate_limiting(app: FastAPI, limit: int = 100, window: int = 60, exempt_paths: List[str] = None) -> None:
+def add_rate_limiting(
+    app: FastAPI,
+    limit: int = 100,
+    window: int = 60,
+    exempt_paths: List[str] = None,
+    max_keys: int = 10000,
+    trusted_proxies: List[str] = None,
+    backend: Optional[StateBackend] = None,
+) -> None:
     """Add rate limiting middleware to the application.
     
     Args:
@@ -130,11 +696,79 @@ def add_rate_limiting(app: FastAPI, limit: int = 100, window: int = 60, exempt_p
         limit: Maximum number of requests per window
         window: Time window in seconds
         exempt_paths: List of path prefixes to exempt from rate limiting
+        max_keys: Maximum number of clients tracked at once
+        trusted_proxies: Networks allowed to set X-Forwarded-For
+            (default: loopback and private networks)
+        backend: Shared state backend for the buckets (default: this process only)
     """
     app.add_middleware(
         RateLimitMiddleware,
         limit=limit,
         window=window,
-        exempt_paths=exempt_paths or ["/static", "/docs", "/redoc", "/openapi.json"],
+        exempt_paths=exempt_paths or ["/static", "/health", "/docs", "/redoc", "/openapi.json"],
+        max_keys=max_keys,
+        trusted_proxies=trusted_proxies,
+        backend=backend,
     )
-    app_logger.info(f"Rate limiting configured: {limit} requests per {window} seconds")
\ No newline at end of file
+    app_logger.info("Rate limiting configured: %s requests per %s seconds", limit, window)
+
+# Helper function to add the static page snapshot
+def add_static_page(app: FastAPI, render: Callable[[], bytes], paths: List[str] = None, max_age: int = 300) -> None:
+    """Serve a static snapshot of pages to crawlers and clients without JavaScript.
+    
+    Add it before the conditional GET middleware, so it ends up inside it
+    and inside compression.
+    
+    Args:
+        app: The FastAPI application
+        render: Returns the snapshot HTML (cached by the caller)
+        paths: Page paths with a snapshot (default: ``/``)
+        max_age: Seconds shared caches may reuse a snapshot
+    """
+    app.add_middleware(StaticPageMiddleware, render=render, paths=paths, max_age=max_age)
+
+# Helper function to add conditional GET support
+def add_conditional_get(app: FastAPI, max_body_size: int = 1024 * 1024) -> None:
+    """Add ETags and If-None-Match / If-Modified-Since handling.
+    
+    Add it before the compression middleware, so it ends up inside it.
+    
+    Args:
+        app: The FastAPI application
+        max_body_size: Largest dynamic response body buffered for hashing
+    """
+    app.add_middleware(ConditionalGetMiddleware, max_body_size=max_body_size)
+
+# Helper function to add request timing
+def add_timing(app: FastAPI) -> None:
+    """Add Server-Timing / X-Process-Time headers to every HTTP response.
+    
+    Args:
+        app: The FastAPI application
+    """
+    app.add_middleware(TimingMiddleware)
+
+# Helper function to add request metrics
+def add_metrics(app: FastAPI, path: Optional[str] = None) -> None:
+    """Record request metrics for the Prometheus exposition.
+    
+    Args:
+        app: The FastAPI application
+        path: URL path serving the metrics on the app's own port (default:
+            not served there; use ``MetricsServer`` on an internal port)
+    """
+    app.add_middleware(MetricsMiddleware, path=path)
+    if path is not None:
+        app_logger.info("Metrics exposed at %s", path)
+
+# Helper function to add the health endpoints
+def add_health_check(app: FastAPI, path: str = "/health") -> None:
+    """Serve health probes from the outermost middleware.
+    
+    Call this after every other ``add_middleware`` so the probes bypass them.
+    
+    Args:
+        app: The FastAPI application
+        path: URL path of the full health report
+    """
+    app.add_middleware(HealthCheckMiddleware, path=path)
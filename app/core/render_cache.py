@@ -0,0 +1,63 @@
+"""Version-keyed render cache for static portfolio content"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """Builds expensive page fragments once per content version and replays them
+
+    NiceGUI elements are bound to a single client and cannot be shared, so the
+    cache stores what can be: pre-rendered HTML markup and the data it was built
+    from. Every new client then gets a handful of ``ui.html`` elements instead of
+    rebuilding each section element by element.
+    """
+
+    def __init__(self, version: str = ""):
+        self._version = version
+        self._entries: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> str:
+        """Content version the cached entries were built for"""
+        return self._version
+
+    def get(self, key: str, builder: Callable[[], Any]) -> Any:
+        """Return the cached entry for ``key``, building it on first use"""
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = builder()
+            self._entries[key] = value
+            logger.debug("Render cache built %r for content version %r", key, self._version)
+            return value
+
+        self.hits += 1
+        return value
+
+    def invalidate(self, version: Optional[str] = None) -> None:
+        """Drop all cached entries, optionally moving to a new content version
+
+        Call this whenever portfolio content changes; the next page view
+        rebuilds each fragment exactly once.
+        """
+
+        self._entries.clear()
+        if version is not None:
+            self._version = version
+        logger.info("Render cache invalidated (content version %r)", self._version)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global render cache shared by every page
+render_cache = RenderCache(settings.content_version)
@@ -0,0 +1,223 @@
+"""Opt-in response cache for idempotent API endpoints
+
+Decorate a GET endpoint with ``@cached_response(ttl=...)`` to reuse its return
+value for identical requests. Entries are keyed by path, query string, the
+caller's credentials and, with ``vary_on``, a value computed from the resolved
+parameters (such as the current user). They are kept in a size-bounded LRU,
+and concurrent misses for the same key share a single computation. With ``stale_ttl`` an expired entry
+is still served while one background refresh replaces it.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import Sample, metrics
+
+logger = logging.getLogger(__name__)
+
+# Every cache created by the decorator, by name, for metrics
+_caches: Dict[str, "ResponseCache"] = {}
+
+
+class ResponseCache:
+    """TTL + LRU cache with single-flight misses and stale-while-revalidate"""
+
+    def __init__(self, name: str, ttl: float = 60.0, stale_ttl: float = 0.0, max_entries: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        # key -> (value, fresh until, stale until)
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+        # Callers still waiting for each pending computation
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it at most once at a time"""
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if now < stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._pending:
+                    self._refresh(key, compute)
+                return value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await self._join(pending)
+
+        self.misses += 1
+        return await self._join(self._start(key, compute))
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _start(self, key: str, compute: Callable[[], Any]) -> asyncio.Task:
+        """Run ``compute`` in its own task, shared by every caller asking for ``key``"""
+
+        task = asyncio.create_task(self._compute(key, compute))
+        self._pending[key] = task
+        # Retrieved here so an exception nobody awaited is not logged
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def _join(self, task: asyncio.Task) -> Any:
+        """Wait for a shared computation; it is cancelled only when its last caller is"""
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        try:
+            value = await compute()
+            now = time.monotonic()
+            self._entries[key] = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            if self._pending.get(key) is asyncio.current_task():
+                del self._pending[key]
+
+    def _refresh(self, key: str, compute: Callable[[], Any]) -> None:
+        """Replace a stale entry in the background; waiting callers join the refresh"""
+
+        def done(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning("Background refresh of %s cache entry failed: %s", self.name, task.exception())
+
+        self._start(key, compute).add_done_callback(done)
+
+
+def _cache_key(request: Request, vary_on_auth: bool) -> str:
+    """Path, sorted query parameters and (optionally) a digest of the credentials"""
+
+    query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}"
+    if vary_on_auth:
+        credentials = request.headers.get("authorization", "") + request.cookies.get("session", "")
+        if credentials:
+            key += "|" + hashlib.sha256(credentials.encode()).hexdigest()[:32]
+    return key
+
+
+def cached_response(
+    ttl: float = 60.0,
+    stale_ttl: float = 0.0,
+    max_entries: int = 256,
+    vary_on_auth: bool = True,
+    vary_on: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    name: Optional[str] = None,
+) -> Callable:
+    """Cache an idempotent endpoint's return value
+
+    Args:
+        ttl: Seconds an entry is served as fresh
+        stale_ttl: Further seconds an expired entry is served while it is
+            refreshed in the background (stale-while-revalidate)
+        max_entries: LRU bound on cached keys
+        vary_on_auth: Key entries by the caller's Authorization header and
+            session cookie
+        vary_on: Called with the endpoint's resolved parameters (including
+            dependencies); its result is added to the key. Endpoints that
+            return per-user data must key on the resolved principal, e.g.
+            ``vary_on=lambda params: params["current_user"].username``, as
+            the raw credentials do not say who the caller is
+        name: Cache name in metrics (defaults to the endpoint's name)
+
+    The decorated endpoint keeps its FastAPI signature; a ``Request``
+    parameter is added behind the scenes when it does not declare one.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        cache = ResponseCache(name or endpoint.__name__, ttl, stale_ttl, max_entries)
+        _caches[cache.name] = cache
+        metrics.add_cache(f"response:{cache.name}", lambda: (cache.hits + cache.stale_hits, cache.misses))
+
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (param.name for param in signature.parameters.values() if param.annotation is Request), None
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "_cache_request"
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop(request_param) if injected else kwargs[request_param]
+
+            async def compute():
+                if inspect.iscoroutinefunction(endpoint):
+                    return await endpoint(*args, **kwargs)
+                return await run_in_threadpool(endpoint, *args, **kwargs)
+
+            key = _cache_key(request, vary_on_auth)
+            if vary_on is not None:
+                key += "|" + hashlib.sha256(repr(vary_on(kwargs)).encode()).hexdigest()[:32]
+            return await cache.get(key, compute)
+
+        wrapper.__signature__ = signature
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def _collect_metrics() -> List[Sample]:
+    """Stale hits and coalesced misses of every response cache
+
+    Plain hits and misses are reported with the other caches (``metrics.add_cache``).
+    """
+
+    events = []
+    for cache in _caches.values():
+        events.append(({"cache": cache.name, "event": "stale_hit"}, cache.stale_hits))
+        events.append(({"cache": cache.name, "event": "coalesced"}, cache.coalesced))
+    return [
+        ("response_cache_events_total", "counter", "Stale hits and coalesced misses per response cache", events),
+    ]
+
+
+metrics.add_collector(_collect_metrics)
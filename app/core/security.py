@@ -1,12 +1,28 @@
 """Security utilities for authentication and authorization"""
 
+import asyncio
+import functools
+import hashlib
+import logging
+import threading
+import time
 import jwt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List
-from passlib.context import CryptContext
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, List, Tuple
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 
 from .config import settings
+from .metrics import Sample, metrics
+from .state import shared_state
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 
 class TokenData(BaseModel):
@@ -22,18 +38,110 @@ class User(BaseModel):
     disabled: bool = False
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@functools.lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """Password hashing context, built on first use so passlib stays out of startup
+    
+    Pinning min and max rounds to the configured cost makes hashes with any
+    other cost "need update", so they are rehashed on login.
+    """
+    from passlib.context import CryptContext
+    
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when too many password operations are already queued"""
+
+
+class PasswordPool:
+    """Bounded thread pool for bcrypt work
+    
+    bcrypt takes hundreds of milliseconds by design and releases the GIL while
+    hashing, so it runs in a few dedicated threads instead of on the event
+    loop. Once ``max_pending`` operations are queued or running, further
+    calls fail fast with ``PasswordPoolSaturated`` rather than queueing
+    logins behind each other.
+    """
+    
+    def __init__(self, workers: int = 2, max_pending: int = 16):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` in the pool"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordPoolSaturated(f"{self.pending} password operations pending")
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password pool
+password_pool = PasswordPool(settings.password_workers, settings.password_max_pending)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await password_pool.run(get_pwd_context().hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Verify a password without blocking the event loop
+    
+    Returns whether it matched and, if the stored hash uses an outdated cost,
+    a replacement hash to store. Pass ``hashed_password=None`` for unknown
+    users: a dummy hash is checked so the response time does not reveal
+    which usernames exist.
+    """
+    if hashed_password is None:
+        await password_pool.run(get_pwd_context().dummy_verify)
+        return False, None
+    return await password_pool.run(get_pwd_context().verify_and_update, plain_password, hashed_password)
+
+
+def _collect_password_metrics() -> List[Sample]:
+    return [
+        ("password_pool_pending", "gauge", "Password operations queued or running",
+         [({}, password_pool.pending)]),
+        ("password_pool_rejected_total", "counter", "Password operations refused because the pool was full",
+         [({}, password_pool.rejected)]),
+    ]
+
+
+metrics.add_collector(_collect_password_metrics)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -50,22 +158,181 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode JWT token"""
+class VerifiedTokenCache:
+    """Bounded LRU of verified tokens, keyed by token digest
+    
+    A token is verified (signature, expiry, claims) once; afterwards it is a
+    dict lookup until its ``exp``. Revoked tokens are remembered until they
+    would have expired anyway, at most ``max_revoked`` of them; beyond that
+    the revocations closest to expiry are dropped first. Cached ``TokenData``
+    is shared between requests and must be treated as read-only. The cache
+    is per process; ``revoke_token`` also records revocations in the shared
+    state backend, so other workers reject the token too.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_revoked: int = 4096):
+        self.max_entries = max_entries
+        self.max_revoked = max_revoked
+        # digest -> (token data, exp as a Unix timestamp)
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, float]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        # verify_token also runs in threadpool workers (sync dependencies)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Fixed-size key, so raw tokens are never kept in memory"""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    def get(self, digest: bytes) -> Optional[TokenData]:
+        """Return cached token data, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            token_data, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return token_data
+    
+    def put(self, digest: bytes, token_data: TokenData, expires_at: float) -> None:
+        """Remember a verified token until ``expires_at``"""
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = (token_data, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def is_revoked(self, digest: bytes) -> bool:
+        return digest in self._revoked
+    
+    def revoke(self, token: str) -> None:
+        """Reject a token from now on, even though its signature is valid"""
+        try:
+            expires_at = float(jwt.decode(token, options={"verify_signature": False})["exp"])
+        except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+            # Tokens without a valid exp never pass verification anyway
+            expires_at = None
+        
+        digest = self.digest(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(digest, None)
+            if expires_at is None or expires_at <= now:
+                return
+            # Forget revocations of tokens that have expired by now
+            self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+            self._revoked[digest] = expires_at
+            while len(self._revoked) > self.max_revoked:
+                del self._revoked[min(self._revoked, key=self._revoked.__getitem__)]
+    
+    def clear(self) -> None:
+        """Drop all cached verifications (revocations are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache of verified tokens
+token_cache = VerifiedTokenCache()
+metrics.add_cache("jwt", lambda: (token_cache.hits, token_cache.misses))
+
+
+def _decode_token(token: str) -> Optional[Tuple[TokenData, float]]:
+    """Fully verify a token; returns its data and expiry, or None if invalid"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        username: str = payload.get("sub")
+        # Tokens without exp would stay valid (and cached) forever
+        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"], options={"require": ["exp", "sub"]})
+        username: str = payload["sub"]
         roles: List[str] = payload.get("roles", [])
         
-        if username is None:
-            return None
-        
-        return TokenData(username=username, roles=roles)
+        return TokenData(username=username, roles=roles), float(payload["exp"])
     except jwt.PyJWTError:
         return None
 
 
-def get_current_active_user(token_data: TokenData) -> User:
+def verify_token(token: str) -> Optional[TokenData]:
+    """Verify and decode JWT token
+    
+    Tokens seen before are served from ``token_cache`` until they expire.
+    """
+    digest = token_cache.digest(token)
+    if token_cache.is_revoked(digest):
+        return None
+    
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+    
+    decoded = _decode_token(token)
+    if decoded is None:
+        return None
+    
+    token_data, expires_at = decoded
+    token_cache.put(digest, token_data, expires_at)
+    return token_data
+
+
+def _revocation_key(token: str) -> str:
+    return "jwt-revoked:" + token_cache.digest(token).hex()
+
+
+async def revoke_token(token: str) -> None:
+    """Revoke a token (e.g. on logout) before its expiry, in every worker"""
+    token_cache.revoke(token)
+    
+    decoded = _decode_token(token)
+    if decoded is None:
+        return  # Never accepted anyway
+    ttl = decoded[1] - time.time()
+    try:
+        await shared_state.aset(_revocation_key(token), True, ttl=ttl)
+    except Exception as e:
+        logger.warning("Could not share token revocation, other workers accept it until expiry: %s", e)
+
+
+async def is_revoked_elsewhere(token: str) -> bool:
+    """Whether another worker revoked ``token`` (False if the backend is unavailable)"""
+    try:
+        return bool(await shared_state.aget(_revocation_key(token)))
+    except Exception as e:
+        logger.warning("Token revocation check unavailable: %s", e)
+        return False
+
+
+# Reads the bearer token of API requests; tokens are issued by POST /auth/token
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/token")
+
+
+async def get_current_token_data(token: str = Depends(oauth2_scheme)) -> TokenData:
+    """Verified data of the request's bearer token, or 401"""
+    token_data = verify_token(token)
+    if token_data is not None and await is_revoked_elsewhere(token):
+        token_cache.revoke(token)
+        token_data = None
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_data
+
+
+async def get_current_active_user(token_data: TokenData = Depends(get_current_token_data)) -> User:
     """Get current active user from token data"""
     # In a real application, you would fetch user from database
     # For demo purposes, return a mock user
@@ -0,0 +1,124 @@
+"""Cold-start profiling
+
+With scale-to-zero deployments, everything ``main`` does at import time is
+paid by the first visitor. ``startup_step("name")`` times an initialisation
+step in ``main``; running this module imports ``main`` under
+``python -X importtime`` and reports, per module, the import time (the module
+and everything it imported first) and the init time (its own body), followed
+by the recorded steps:
+
+    python -m app.core.startup [--top N] [--module main]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# (step name, seconds) in the order they ran
+startup_steps: List[Tuple[str, float]] = []
+
+# Packages whose modules are reported individually
+FIRST_PARTY = ("app", "main")
+
+
+@contextmanager
+def startup_step(name: str) -> Iterator[None]:
+    """Record how long the enclosed initialisation step takes"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_steps.append((name, time.perf_counter() - start))
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self µs, cumulative µs)"""
+
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+
+def profile_startup(module: str = "main") -> Tuple[List[Tuple[str, int, int]], List[Tuple[str, float]], float]:
+    """Import ``module`` in a fresh interpreter
+
+    Returns the per-module import times, the recorded startup steps and the
+    wall-clock seconds the import took.
+    """
+
+    # The report goes through a file: stdout is shared with the log writer thread
+    with tempfile.TemporaryDirectory() as directory:
+        report_path = Path(directory) / "report.json"
+        code = (
+            "import json, time; start = time.perf_counter(); "
+            f"import {module}; elapsed = time.perf_counter() - start; "
+            "from app.core.startup import startup_steps; "
+            f"open({str(report_path)!r}, 'w').write(json.dumps({{'steps': startup_steps, 'elapsed': elapsed}}))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+        report = json.loads(report_path.read_text())
+
+    steps = [(name, seconds) for name, seconds in report["steps"]]
+    return parse_importtime(result.stderr), steps, report["elapsed"]
+
+
+def format_report(
+    modules: List[Tuple[str, int, int]], steps: List[Tuple[str, float]], elapsed: float, top: int = 20
+) -> str:
+    """Render the profile as plain-text tables"""
+
+    lines = [f"Imported in {elapsed * 1000:.0f} ms", ""]
+
+    first_party = [m for m in modules if m[0].split(".")[0] in FIRST_PARTY]
+    lines.append(f"{'First-party module':<45} {'import ms':>10} {'init ms':>10}")
+    for name, self_us, cumulative_us in sorted(first_party, key=lambda m: -m[2])[:top]:
+        lines.append(f"{name:<45} {cumulative_us / 1000:>10.1f} {self_us / 1000:>10.1f}")
+
+    # Third-party and stdlib time summed per top-level package
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        if package not in FIRST_PARTY:
+            packages[package] = packages.get(package, 0) + self_us
+    lines += ["", f"{'Package':<45} {'import ms':>10}"]
+    for package, total_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"{package:<45} {total_us / 1000:>10.1f}")
+
+    if steps:
+        lines += ["", f"{'Startup step':<45} {'ms':>10}"]
+        for name, seconds in steps:
+            lines.append(f"{name:<45} {seconds * 1000:>10.1f}")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report import and init time of the application")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    args = parser.parse_args()
+
+    modules, steps, elapsed = profile_startup(args.module)
+    print(format_report(modules, steps, elapsed, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Pluggable state backends shared between worker processes
+
+Rate-limit buckets, image validation results and JWT revocations go through
+a ``StateBackend``, so running several uvicorn workers neither multiplies
+limits nor lets a token revoked in one worker through in another. The render,
+response and verified-token caches hold Python objects on hot paths and stay
+per process. Three backends are available:
+
+- ``memory``: per-process dictionaries (single worker, tests)
+- ``sqlite``: a WAL-mode SQLite file shared by workers on the same host
+- ``redis``: any Redis-protocol server (needs the optional ``redis`` package)
+
+Async code uses the ``a``-prefixed methods, which run the SQLite and Redis
+calls in a worker thread instead of on the event loop.
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StateBackend(abc.ABC):
+    """Interface of a shared state backend
+
+    Values must be JSON-serializable. Bucket timestamps use wall-clock time,
+    the only clock that is comparable across processes and hosts.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def take_token(self, key: str, rate: float, capacity: int) -> float:
+        """Take a token from the bucket ``key``
+
+        Returns 0 if a token was available, otherwise the seconds until one is.
+        """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None if missing or expired"""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, expiring after ``ttl`` seconds"""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present"""
+
+    def close(self) -> None:
+        """Release connections held by the backend"""
+
+    async def atake_token(self, key: str, rate: float, capacity: int) -> float:
+        """``take_token`` without blocking the event loop"""
+        return await asyncio.to_thread(self.take_token, key, rate, capacity)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """``get`` without blocking the event loop"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """``set`` without blocking the event loop"""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def adelete(self, key: str) -> None:
+        """``delete`` without blocking the event loop"""
+        await asyncio.to_thread(self.delete, key)
+
+
+def _refill(tokens: float, last: float, now: float, rate: float, capacity: int) -> Tuple[float, float]:
+    """Apply the token bucket algorithm; returns (new token count, wait seconds)"""
+
+    tokens = min(capacity, tokens + max(0.0, now - last) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBackend(StateBackend):
+    """Per-process state with bounded, LRU-ordered tables"""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._values: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take_token(self, key: str, rate: float, capacity: int) -> float:
+        now = time.time()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (float(capacity), now))
+            tokens, wait = _refill(tokens, last, now, rate, capacity)
+            self._buckets[key] = (tokens, now)
+            self._trim(self._buckets, lambda item: now - item[1] >= capacity / rate)
+        return wait
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (value, now + ttl if ttl is not None else None)
+            self._trim(self._values, lambda item: item[1] is not None and item[1] <= now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    # Dictionary updates never block, so skip the thread hop
+    async def atake_token(self, key: str, rate: float, capacity: int) -> float:
+        return self.take_token(key, rate, capacity)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set(key, value, ttl)
+
+    async def adelete(self, key: str) -> None:
+        self.delete(key)
+
+    def _trim(self, table: OrderedDict, expired) -> None:
+        """Drop expired entries from the old end and enforce the key cap"""
+
+        while table:
+            oldest = next(iter(table))
+            if len(table) <= self.max_keys and not expired(table[oldest]):
+                break
+            del table[oldest]
+
+
+class SQLiteBackend(StateBackend):
+    """State shared by the workers of one host through a WAL-mode SQLite file
+
+    Each thread gets its own connection. Token buckets are updated inside an
+    immediate transaction, so concurrent workers cannot both spend the last
+    token. Expired rows are purged every ``purge_interval`` writes.
+
+    These calls sit on the request path, so a locked database is waited on
+    for at most ``busy_timeout_ms`` before ``sqlite3.OperationalError`` is
+    raised; callers treat that like an unreachable backend.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self, db_path: Optional[Path] = None, purge_interval: int = 1000, busy_timeout_ms: Optional[int] = None
+    ):
+        self.db_path = Path(db_path or settings.state_path)
+        self.purge_interval = purge_interval
+        self.busy_timeout_ms = settings.state_busy_timeout_ms if busy_timeout_ms is None else busy_timeout_ms
+        self._local = threading.local()
+        self._writes = 0
+
+    def take_token(self, key: str, rate: float, capacity: int) -> float:
+        now = time.time()
+        db = self._connection()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT tokens, last FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, last = row if row is not None else (float(capacity), now)
+            tokens, wait = _refill(tokens, last, now, rate, capacity)
+            # A bucket is as good as new once it has had time to refill completely
+            db.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, last, expires_at) VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + capacity / rate),
+            )
+        self._maybe_purge(db, now)
+        return wait
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        db = self._connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl if ttl is not None else None),
+            )
+        self._maybe_purge(db, now)
+
+    def delete(self, key: str) -> None:
+        db = self._connection()
+        with db:
+            db.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def _maybe_purge(self, db: sqlite3.Connection, now: float) -> None:
+        """Delete expired rows every ``purge_interval`` writes"""
+
+        self._writes += 1
+        if self._writes % self.purge_interval:
+            return
+        with db:
+            db.execute("DELETE FROM buckets WHERE expires_at <= ?", (now,))
+            db.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open this thread's connection on first use"""
+
+        db = getattr(self._local, "db", None)
+        if db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly where needed
+            db = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, last REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._local.db = db
+        return db
+
+
+# Token bucket update executed atomically on the Redis server. Returns the
+# wait as a string because Redis truncates Lua numbers to integers.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBackend(StateBackend):
+    """State shared across hosts through a Redis-protocol server
+
+    Works with Redis, Valkey, KeyDB or a local stand-in such as ``fakeredis``;
+    pass ``client`` to inject one. All keys are namespaced with ``prefix``.
+    The synchronous client is thread-safe, so the async methods share it.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "portfolio:"):
+        self.url = url or settings.redis_url
+        self.prefix = prefix
+        self._client = client
+        self._script = None
+
+    def take_token(self, key: str, rate: float, capacity: int) -> float:
+        if self._script is None:
+            self._script = self._get_client().register_script(_TOKEN_BUCKET_SCRIPT)
+        wait = self._script(keys=[self.prefix + "bucket:" + key], args=[rate, capacity, time.time()])
+        return float(wait)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get_client().get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        self._get_client().set(self.prefix + key, json.dumps(value), px=px)
+
+    def delete(self, key: str) -> None:
+        self._get_client().delete(self.prefix + key)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._script = None
+
+    def _get_client(self):
+        """Connect on first use; ``redis`` is only imported when this backend is used"""
+
+        if self._client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("STATE_BACKEND=redis requires the 'redis' package") from e
+            self._client = redis.Redis.from_url(self.url, socket_timeout=1.0)
+        return self._client
+
+
+def create_state_backend(name: Optional[str] = None) -> StateBackend:
+    """Build the backend selected by ``STATE_BACKEND``"""
+
+    name = (name or settings.state_backend).lower()
+    backends: Dict[str, type] = {
+        MemoryBackend.name: MemoryBackend,
+        SQLiteBackend.name: SQLiteBackend,
+        RedisBackend.name: RedisBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown state backend {name!r}; expected one of {sorted(backends)}")
+
+    logger.info("Using %s state backend", name)
+    return backends[name]()
+
+
+# Shared by the rate limiter, the image validator and JWT revocations
+shared_state = create_state_backend()
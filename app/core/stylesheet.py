@@ -0,0 +1,142 @@
+"""Fingerprinted stylesheet pipeline
+
+Collects the portfolio CSS sources, minifies them and writes a single
+content-hashed file that can be served with ``Cache-Control: immutable``.
+Because the file name changes whenever the content does, browsers never need
+to revalidate it and pages only carry one ``<link>`` tag.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Iterable, List, Union
+
+from fastapi import FastAPI, Request, Response
+from fastapi.staticfiles import StaticFiles
+
+logger = logging.getLogger(__name__)
+
+# URL prefix and directory for fingerprinted build output
+BUILD_URL_PATH = "/assets"
+BUILD_DIR = Path("app/static/build")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Comments and quoted strings are matched together, so quotes inside comments
+# and comment markers inside strings are both taken literally
+_COMMENT_OR_STRING_RE = re.compile(r"""/\*.*?\*/|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""", re.DOTALL)
+_STRING_PLACEHOLDER_RE = re.compile(r"\x00(\d+)\x00")
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+# Space after a colon never matters. Space before one does in selectors,
+# where it is a descendant combinator (".a :hover" is not ".a:hover"), so it
+# is only dropped for declaration colons: those followed by ";" or "}"
+# before any "{"
+_COLON_RE = re.compile(r":\s+")
+_DECLARATION_COLON_RE = re.compile(r"\s+:(?=[^{};]*[;}])")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a CSS string
+
+    Quoted strings (``content: "a: b"``) are set aside first and put back
+    unchanged.
+    """
+
+    strings: List[str] = []
+
+    def set_aside(match: re.Match) -> str:
+        if match.group().startswith("/*"):
+            return ""
+        strings.append(match.group())
+        return f"\x00{len(strings) - 1}\x00"
+
+    css = _COMMENT_OR_STRING_RE.sub(set_aside, css)
+    css = _WHITESPACE_RE.sub(" ", css)
+    css = _PUNCTUATION_RE.sub(r"\1", css)
+    css = _COLON_RE.sub(":", css)
+    css = _DECLARATION_COLON_RE.sub(":", css)
+    css = css.replace(";}", "}")
+    css = _STRING_PLACEHOLDER_RE.sub(lambda match: strings[int(match.group(1))], css)
+    return css.strip()
+
+
+def build_stylesheet(
+    sources: Iterable[Union[str, Path]],
+    name: str = "portfolio",
+    output_dir: Path = BUILD_DIR,
+) -> str:
+    """Bundle CSS sources into a content-hashed file and return its URL
+
+    Sources may be file paths or raw CSS strings and are concatenated in order,
+    so later sources win on equal specificity. Stale bundles with the same
+    name are removed.
+
+    Args:
+        sources: CSS file paths and/or CSS text
+        name: Base name of the bundle
+        output_dir: Directory the bundle is written to
+
+    Returns:
+        URL path of the fingerprinted stylesheet
+    """
+    parts = []
+    for source in sources:
+        if isinstance(source, Path):
+            parts.append(source.read_text(encoding="utf-8"))
+        else:
+            parts.append(source)
+
+    css = minify_css("\n".join(parts))
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    filename = f"{name}.{digest}.css"
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    target = output_dir / filename
+    if not target.exists():
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(css, encoding="utf-8")
+        tmp.replace(target)
+        logger.info("Built stylesheet %s (%s bytes)", filename, len(css))
+
+    # Also removes the precompressed sidecars (.br/.zst/.gz) of old bundles
+    for stale in output_dir.glob(f"{name}.*.css*"):
+        if stale.name != filename and not stale.name.startswith(filename + "."):
+            stale.unlink(missing_ok=True)
+
+    return f"{BUILD_URL_PATH}/{filename}"
+
+
+def add_immutable_static_files(app: FastAPI, url_path: str = BUILD_URL_PATH, local_directory: Path = BUILD_DIR) -> None:
+    """Serve a directory of fingerprinted files with long-lived immutable caching
+
+    Args:
+        app: The FastAPI (NiceGUI) application
+        url_path: URL prefix to serve the files under
+        local_directory: Directory containing the fingerprinted files
+    """
+    local_directory.mkdir(parents=True, exist_ok=True)
+    handler = StaticFiles(directory=local_directory)
+
+    @app.get(url_path + "/{path:path}", include_in_schema=False)
+    async def immutable_static_file(request: Request, path: str = "") -> Response:
+        response = await handler.get_response(path, request.scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+def build_portfolio_stylesheet() -> str:
+    """Build the portfolio bundle: image styles first, page styles overriding them"""
+    from app.core.assets import ProfessionalAssetManager
+
+    return build_stylesheet([
+        ProfessionalAssetManager.generate_image_css(),
+        Path("app/static/css/portfolio.css"),
+    ])
+
+
+if __name__ == "__main__":
+    # Build-time entry point: python -m app.core.stylesheet
+    print(build_portfolio_stylesheet())
@@ -0,0 +1,50 @@
+"""Per-request stage timings reported in the ``Server-Timing`` header
+
+``TimingMiddleware`` opens a collector for each request; code anywhere below
+it can wrap a stage in ``with stage("render"):`` and the duration shows up in
+the browser's devtools. Outside a request, ``stage`` is a no-op.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Iterator, List, Optional, Tuple
+
+# (stage name, duration in nanoseconds) pairs of the current request. A list
+# is stored rather than replaced, so tasks spawned by the request (which get
+# a copy of the context) still report into the same collector.
+_stages: ContextVar[Optional[List[Tuple[str, int]]]] = ContextVar("server_timing_stages", default=None)
+
+
+def begin_request() -> List[Tuple[str, int]]:
+    """Start collecting stages for the current request"""
+    stages: List[Tuple[str, int]] = []
+    _stages.set(stages)
+    return stages
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as a Server-Timing stage"""
+    stages = _stages.get()
+    if stages is None:
+        yield
+        return
+
+    start = perf_counter_ns()
+    try:
+        yield
+    finally:
+        stages.append((name, perf_counter_ns() - start))
+
+
+def record(name: str, duration_ns: int) -> None:
+    """Record a stage measured elsewhere"""
+    stages = _stages.get()
+    if stages is not None:
+        stages.append((name, duration_ns))
+
+
+def format_server_timing(stages: List[Tuple[str, int]]) -> bytes:
+    """Format stages as a Server-Timing header value (durations in ms)"""
+    return ", ".join(f"{name};dur={duration / 1e6:.2f}" for name, duration in stages).encode("latin-1")
@@ -1,7 +1,8 @@
 import os
 import importlib
 import inspect
-from typing import List, Dict, Any, Optional, Type, Callable
+import json
+from typing import List, Dict, Any, Optional, Set, Tuple, Type, Callable
 from fastapi import FastAPI, APIRouter
 import pkgutil
 from pathlib import Path
@@ -9,11 +10,124 @@ from pathlib import Path
 from app.core.logging import app_logger
 from app.core.config import settings
 
+MANIFEST_VERSION = 1
+
+def _source_mtimes(package_dir: Path) -> Dict[str, int]:
+    """Modification times of a package's top-level modules, keyed by file name"""
+    return {
+        entry.name: entry.stat().st_mtime_ns
+        for entry in os.scandir(package_dir)
+        if entry.is_file() and entry.name.endswith(".py")
+    }
+
+def _load_manifest() -> Dict[str, Any]:
+    """Read the module manifest, or return an empty one"""
+    try:
+        manifest = json.loads(Path(settings.module_manifest_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "entries": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "entries": {}}
+    return manifest
+
+def _save_manifest(manifest: Dict[str, Any]) -> None:
+    """Write the module manifest atomically, so concurrent workers never read half a file"""
+    path = Path(settings.module_manifest_path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        app_logger.warning("Could not write module manifest %s: %s", path, e)
+
+def _cached_discovery(
+    key: str, package_dir: Path, scan: Callable[[], Tuple[List[List[str]], bool]]
+) -> List[Any]:
+    """Objects found by ``scan``, using the manifest while the package is unchanged
+    
+    ``scan`` imports the package and returns ``[module, attribute]`` pairs,
+    plus whether every module imported. A manifest entry is reused only if
+    the package's file names and mtimes still match; otherwise, or if a
+    listed object no longer imports, the package is scanned again and the
+    entry rewritten. Results of a scan in which a module failed to import
+    are never written, so the next start scans again.
+    
+    Args:
+        key: Manifest entry name
+        package_dir: Directory whose modules are discovered
+        scan: Full discovery, used when the manifest is missing or stale
+        
+    Returns:
+        The discovered objects
+    """
+    mtimes = _source_mtimes(package_dir)
+    manifest = _load_manifest()
+    entry = manifest["entries"].get(key)
+    
+    if entry is not None and entry.get("mtimes") == mtimes:
+        try:
+            return [import_string(f"{module}.{attr}") for module, attr in entry["objects"]]
+        except ImportError as e:
+            app_logger.warning("Module manifest entry %s is outdated (%s); rescanning", key, e)
+    
+    objects, complete = scan()
+    if complete:
+        manifest["entries"][key] = {"mtimes": mtimes, "objects": objects}
+        _save_manifest(manifest)
+    return [import_string(f"{module}.{attr}") for module, attr in objects]
+
+def _route_endpoints(router: APIRouter) -> Set[Any]:
+    return {getattr(route, "endpoint", route) for route in router.routes}
+
+def _scan_routers(package_name: str, package_dir: Path) -> Tuple[List[List[str]], bool]:
+    """Find the routers to include from a package, importing every module
+    
+    Modules that fail to import are logged and skipped, and the scan is
+    reported as incomplete. A router is skipped when it is the same object as one already found (an
+    import alias) or when all of its routes are already part of a larger
+    router, as with the routers that ``app/api/router.py`` includes into
+    ``api_router``.
+    """
+    candidates: List[Tuple[str, str, APIRouter]] = []
+    seen: Set[int] = set()
+    complete = True
+    for _, module_name, is_pkg in pkgutil.iter_modules([str(package_dir)]):
+        if is_pkg:
+            continue  # Skip packages for now
+        
+        try:
+            module = importlib.import_module(f"{package_name}.{module_name}")
+        except Exception as e:
+            app_logger.error("Could not import %s.%s: %s", package_name, module_name, e)
+            complete = False
+            continue
+        
+        for attr_name, attr in vars(module).items():
+            if isinstance(attr, APIRouter) and id(attr) not in seen:
+                seen.add(id(attr))
+                candidates.append((module.__name__, attr_name, attr))
+    
+    # Largest routers first, so aggregates win over the routers they include
+    candidates.sort(key=lambda candidate: len(candidate[2].routes), reverse=True)
+    registered: Set[Any] = set()
+    objects = []
+    for module_name, attr_name, router in candidates:
+        endpoints = _route_endpoints(router)
+        if endpoints and endpoints <= registered:
+            app_logger.debug("Skipping router %s.%s: already included", module_name, attr_name)
+            continue
+        registered |= endpoints
+        objects.append([module_name, attr_name])
+    return objects, complete
+
 def setup_routers(app: FastAPI, api_prefix: str = "/api") -> None:
     """Automatically set up all routers in the app/api directory.
     
-    This function scans the app/api directory for modules containing APIRouter instances
-    and includes them in the FastAPI application with the specified prefix.
+    The routers to include are read from the module manifest while the
+    sources of app/api are unchanged; otherwise the directory is scanned for
+    modules containing APIRouter instances and the manifest is rebuilt.
+    Routers that another found router already includes are skipped.
     
     Args:
         app: The FastAPI application instance
@@ -25,35 +139,20 @@ def setup_routers(app: FastAPI, api_prefix: str = "/api") -> None:
         
         # Check if the api directory exists
         if not api_dir.exists() or not api_dir.is_dir():
-            app_logger.warning(f"API directory not found: {api_dir}")
+            app_logger.warning("API directory not found: %s", api_dir)
             return
         
-        # Import all modules in the api directory
         package_name = "app.api"
+        routers = _cached_discovery(
+            f"routers:{package_name}", api_dir, lambda: _scan_routers(package_name, api_dir)
+        )
         
-        # Track the number of routers added
-        router_count = 0
-        
-        # Scan the package for modules
-        for _, module_name, is_pkg in pkgutil.iter_modules([str(api_dir)]):
-            if is_pkg:
-                continue  # Skip packages for now
-            
-            # Import the module
-            module = importlib.import_module(f"{package_name}.{module_name}")
-            
-            # Look for APIRouter instances in the module
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if isinstance(attr, APIRouter):
-                    # Include the router in the app
-                    app.include_router(attr, prefix=api_prefix)
-                    router_count += 1
-                    app_logger.info(f"Added router from {module_name}.{attr_name}")
+        for router in routers:
+            app.include_router(router, prefix=api_prefix)
         
-        app_logger.info(f"Set up {router_count} routers with prefix '{api_prefix}'")
+        app_logger.info("Set up %s routers with prefix '%s'", len(routers), api_prefix)
     except Exception as e:
-        app_logger.error(f"Error setting up routers: {e}")
+        app_logger.error("Error setting up routers: %s", e)
 
 def validate_environment() -> List[str]:
     """Validate required environment variables.
@@ -103,19 +202,13 @@ def import_string(dotted_path: str) -> Any:
     except AttributeError as e:
         raise ImportError(f"Module '{module_path}' does not define a '{class_name}' attribute") from e
 
-def get_subclasses(base_class: Type, package: str) -> List[Type]:
-    """Get all subclasses of a base class in a package.
+def _scan_subclasses(base_class: Type, package: str, package_dir: Path) -> Tuple[List[List[str]], bool]:
+    """Import every module of a package and list the subclasses of ``base_class`` found
     
-    Args:
-        base_class: The base class to find subclasses of
-        package: The package to search in (e.g., "app.models")
-        
-    Returns:
-        List of subclasses
+    Import errors propagate, so the scan is always complete when it returns.
     """
-    subclasses = []
-    package_dir = Path(importlib.import_module(package).__file__).parent
-    
+    objects = []
+    seen: Set[Type] = set()
     for _, module_name, is_pkg in pkgutil.iter_modules([str(package_dir)]):
         if is_pkg:
             continue  # Skip packages for now
@@ -124,12 +217,28 @@ def get_subclasses(base_class: Type, package: str) -> List[Type]:
         module = importlib.import_module(f"{package}.{module_name}")
         
         # Look for subclasses in the module
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if inspect.isclass(attr) and issubclass(attr, base_class) and attr != base_class:
-                subclasses.append(attr)
+        for attr_name, attr in vars(module).items():
+            if inspect.isclass(attr) and issubclass(attr, base_class) and attr != base_class and attr not in seen:
+                seen.add(attr)
+                objects.append([module.__name__, attr_name])
+    return objects, True
+
+def get_subclasses(base_class: Type, package: str) -> List[Type]:
+    """Get all subclasses of a base class in a package.
     
-    return subclasses
+    Results are cached in the module manifest until a module of the package
+    changes.
+    
+    Args:
+        base_class: The base class to find subclasses of
+        package: The package to search in (e.g., "app.models")
+        
+    Returns:
+        List of subclasses
+    """
+    package_dir = Path(importlib.import_module(package).__file__).parent
+    key = f"subclasses:{package}:{base_class.__module__}.{base_class.__qualname__}"
+    return _cached_discovery(key, package_dir, lambda: _scan_subclasses(base_class, package, package_dir))
 
 def create_dir_if_not_exists(directory: str) -> None:
     """Create a directory if it doesn't exist.
@@ -0,0 +1,562 @@
+"""Multi-worker serving with sticky NiceGUI sessions
+
+``ui.run`` serves everything from one process, so one CPU core handles every
+page and websocket. ``serve`` is the production launcher for ``WORKERS > 1``:
+
+* the supervisor (this process) has already imported ``main``, so the app,
+  its manifests and the built stylesheet are loaded once and shared
+  copy-on-write by the forked children
+* each worker runs the NiceGUI app on its own loopback port
+* a proxy process listens on ``HOST:PORT`` and forwards to the workers
+
+A NiceGUI client only exists in the worker that rendered its page, so every
+socket.io request (the websocket and its reconnects, or long-polling) must
+reach that worker. Each worker adds its index to the socket.io query of the
+pages it renders; the proxy records the owner of each ``client_id`` on first
+sight and routes by client id from then on, including the client's upload
+URLs. Other requests are spread round-robin. Each worker serves its metrics
+on a loopback port of its own; the proxy scrapes them all and serves the
+merged result, labelled ``worker``, on ``METRICS_PORT``.
+
+Every request passes through the proxy, one extra Python process and a
+loopback hop that adds some latency and CPU per request and per websocket
+frame; in exchange the workers need no shared socket or external balancer.
+
+On SIGINT or SIGTERM (``kill_signal`` in fly.toml) the proxy stops accepting
+and drains first, then the workers run their shutdown handlers, all within
+``SHUTDOWN_TIMEOUT``. Workers that die are forked again from the supervisor.
+"""
+
+import asyncio
+import gc
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+# socket.io query parameter naming the worker that rendered the page
+WORKER_QUERY_PARAM = "worker"
+
+# Hop-by-hop headers are never forwarded (RFC 9110, section 7.6.1)
+HOP_BY_HOP_HEADERS = frozenset({
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization",
+    b"proxy-connection", b"te", b"trailer", b"transfer-encoding", b"upgrade",
+})
+
+# Added by the proxy's own server; forwarding the workers' copies would send them twice
+PROXY_SERVER_HEADERS = frozenset({b"date", b"server"})
+
+# Index of this worker process; None in the supervisor, the proxy and single-process mode
+worker_index: Optional[int] = None
+
+
+def is_primary_worker() -> bool:
+    """True in single-process mode and in worker 0
+
+    Background jobs that must run once per machine (the email outbox) only
+    start where this holds.
+    """
+    return worker_index in (None, 0)
+
+
+def is_single_process() -> bool:
+    """True unless this process is one of the workers started by ``serve``"""
+    return worker_index is None
+
+
+class StickyProxy:
+    """ASGI app forwarding HTTP and websocket requests to the workers"""
+
+    def __init__(
+        self,
+        ports: List[int],
+        max_clients: int = 100_000,
+        metrics_ports: Optional[List[int]] = None,
+        metrics_socket: Optional[socket.socket] = None,
+    ):
+        self.ports = ports
+        self.max_clients = max_clients
+        self.metrics_ports = metrics_ports or []
+        self.metrics_socket = metrics_socket
+        self._metrics_server = None
+        # client_id -> worker index, least recently seen first
+        self.owners: "OrderedDict[str, int]" = OrderedDict()
+        self._round_robin = itertools.cycle(range(len(ports)))
+        self._transports: Dict[int, Any] = {}
+
+    def route(self, path: str, query_string: bytes) -> int:
+        """Index of the worker that must handle a request"""
+
+        client_id = None
+        if path.startswith("/_nicegui_ws/"):
+            query = parse_qs(query_string.decode("latin-1"))
+            client_id = query.get("client_id", [None])[0]
+            tagged = query.get(WORKER_QUERY_PARAM, [""])[0]
+            if client_id and client_id not in self.owners and tagged.isdigit() and int(tagged) < len(self.ports):
+                self._remember(client_id, int(tagged))
+        elif path.startswith("/_nicegui/client/"):
+            client_id = path.split("/")[3]
+
+        if not client_id:
+            return next(self._round_robin)
+
+        owner = self.owners.get(client_id)
+        if owner is not None:
+            self.owners.move_to_end(client_id)
+            return owner
+        # Unknown client (e.g. its worker restarted): any worker will tell it to reload
+        return zlib.crc32(client_id.encode()) % len(self.ports)
+
+    def _remember(self, client_id: str, index: int) -> None:
+        self.owners[client_id] = index
+        if len(self.owners) > self.max_clients:
+            self.owners.popitem(last=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        index = self.route(scope["path"], scope["query_string"])
+        if scope["type"] == "http":
+            await self._forward_http(index, scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._forward_websocket(index, scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.metrics_socket is not None:
+                    from app.core.metrics import MetricsServer
+
+                    self._metrics_server = MetricsServer(self.render_metrics)
+                    await self._metrics_server.start(sock=self.metrics_socket)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._metrics_server is not None:
+                    await self._metrics_server.stop()
+                for transport in self._transports.values():
+                    await transport.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _forwarded_headers(self, scope) -> List[Tuple[bytes, bytes]]:
+        """Request headers for the worker, with the peer appended to X-Forwarded-For
+
+        The workers trust X-Forwarded-* from the proxy only, so they see the
+        same client address and scheme as a single-process server would.
+        """
+        headers = []
+        forwarded_for = b""
+        for name, value in scope["headers"]:
+            name = name.lower()
+            if name == b"x-forwarded-for":
+                forwarded_for = value
+            elif name not in HOP_BY_HOP_HEADERS and name != b"x-forwarded-proto":
+                headers.append((name, value))
+
+        peer = (scope.get("client") or ("",))[0].encode("latin-1")
+        if peer:
+            forwarded_for = forwarded_for + b", " + peer if forwarded_for else peer
+        if forwarded_for:
+            headers.append((b"x-forwarded-for", forwarded_for))
+        headers.append((b"x-forwarded-proto", scope.get("scheme", "http").encode("latin-1")))
+        return headers
+
+    @staticmethod
+    def _target(scope) -> bytes:
+        """Request path and query string as received"""
+        target = scope.get("raw_path") or scope["path"].encode()
+        if scope["query_string"]:
+            target += b"?" + scope["query_string"]
+        return target
+
+    def _transport(self, index: int):
+        if index not in self._transports:
+            import httpx
+
+            # Long-polling requests hold a connection each, so the pool is unbounded
+            self._transports[index] = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=64),
+            )
+        return self._transports[index]
+
+    async def _forward_http(self, index: int, scope, receive, send) -> None:
+        import httpx
+
+        headers = self._forwarded_headers(scope)
+        has_body = any(name in (b"content-length", b"transfer-encoding") for name, _ in scope["headers"])
+
+        async def body():
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                yield message.get("body", b"")
+                more_body = message.get("more_body", False)
+
+        url = httpx.URL(scheme="http", host="127.0.0.1", port=self.ports[index], raw_path=self._target(scope))
+        request = httpx.Request(
+            scope["method"], url, headers=headers, content=body() if has_body else None,
+            # Upstream is local: fail fast on connect, but let long-polls wait
+            extensions={"timeout": {"connect": 5.0, "read": None, "write": None, "pool": None}},
+        )
+        try:
+            response = await self._transport(index).handle_async_request(request)
+        except httpx.TransportError as e:
+            logger.warning("Worker %s unavailable: %s", index, e)
+            await send({"type": "http.response.start", "status": 502, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"Bad Gateway"})
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name, value) for name, value in response.headers.raw
+                    if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() not in PROXY_SERVER_HEADERS
+                ],
+            })
+            async for chunk in response.stream:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    async def render_metrics(self) -> str:
+        """Scrape every worker and merge their metrics"""
+
+        texts = await asyncio.gather(*(self._scrape(index) for index in range(len(self.metrics_ports))))
+        return merge_worker_metrics(dict(enumerate(texts)))
+
+    async def _scrape(self, index: int) -> Optional[str]:
+        """Metrics text of one worker, or None if it did not answer"""
+
+        import httpx
+
+        url = httpx.URL(scheme="http", host="127.0.0.1", port=self.metrics_ports[index], path="/metrics")
+        request = httpx.Request("GET", url, extensions={"timeout": {"connect": 2.0, "read": 5.0, "write": 5.0, "pool": 5.0}})
+        try:
+            response = await self._transport(index).handle_async_request(request)
+            try:
+                body = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+        except httpx.TransportError as e:
+            logger.warning("Could not scrape worker %s: %s", index, e)
+            return None
+        return body.decode() if response.status_code == 200 else None
+
+    async def _forward_websocket(self, index: int, scope, receive, send) -> None:
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+
+        # The handshake headers are negotiated separately on each leg
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in self._forwarded_headers(scope)
+            if name != b"host" and not name.startswith(b"sec-websocket-")
+        ]
+        try:
+            upstream = await connect(
+                f"ws://127.0.0.1:{self.ports[index]}{self._target(scope).decode('latin-1')}",
+                additional_headers=headers,
+                subprotocols=scope.get("subprotocols") or None,
+                # socket.io pings on its own; frames are relayed as they are
+                ping_interval=None, compression=None, max_size=None, open_timeout=5,
+            )
+        except Exception as e:
+            logger.warning("Worker %s refused websocket: %s", index, e)
+            await send({"type": "websocket.close", "code": 1011})
+            return
+
+        await send({"type": "websocket.accept", "subprotocol": upstream.subprotocol})
+
+        async def client_to_worker() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    await upstream.close()
+                    return
+                await upstream.send(message["text"] if message.get("text") is not None else message["bytes"])
+
+        async def worker_to_client() -> None:
+            try:
+                async for data in upstream:
+                    if isinstance(data, str):
+                        await send({"type": "websocket.send", "text": data})
+                    else:
+                        await send({"type": "websocket.send", "bytes": data})
+            except ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": 1000})
+
+        tasks = [asyncio.ensure_future(client_to_worker()), asyncio.ensure_future(worker_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await upstream.close()
+
+
+def merge_worker_metrics(texts: Dict[int, Optional[str]]) -> str:
+    """Merge the Prometheus text of several workers into one exposition
+
+    Samples get a ``worker`` label and are grouped under their family's
+    HELP/TYPE lines. ``worker_up`` reports which workers answered (text
+    not None).
+    """
+
+    # family -> (HELP/TYPE lines, samples of every worker)
+    families: "OrderedDict[str, Tuple[Dict[str, str], List[str]]]" = OrderedDict()
+    families["worker_up"] = (
+        {
+            "HELP": "# HELP worker_up Whether the worker answered the metrics scrape",
+            "TYPE": "# TYPE worker_up gauge",
+        },
+        [f'worker_up{{worker="{index}"}} {0 if text is None else 1}' for index, text in texts.items()],
+    )
+
+    for index, text in texts.items():
+        family = None
+        for line in (text or "").splitlines():
+            if line.startswith("#"):
+                parts = line.split(" ", 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    families.setdefault(family, ({}, []))[0].setdefault(parts[1], line)
+                continue
+            if not line.strip() or family is None:
+                continue
+
+            name, brace, rest = line.partition("{")
+            if not brace:
+                name, _, rest = line.partition(" ")
+                rest = "} " + rest
+            separator = "" if rest.startswith("}") else ","
+            families[family][1].append(f'{name}{{worker="{index}"{separator}{rest}')
+
+    lines = []
+    for headers, samples in families.values():
+        lines.extend(headers[kind] for kind in ("HELP", "TYPE") if kind in headers)
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(
+    index: int, sock: socket.socket, metrics_sock: socket.socket, run_options: Dict[str, Any], shutdown_timeout: float
+) -> None:
+    global worker_index
+    worker_index = index
+
+    from nicegui import app, ui
+    from nicegui.server import CustomServerConfig, Server
+
+    from app.core.metrics import MetricsServer
+
+    # Scraped by the proxy only
+    metrics_server = MetricsServer()
+
+    async def start_metrics_server() -> None:
+        await metrics_server.start(sock=metrics_sock)
+
+    app.on_startup(start_metrics_server)
+    app.on_shutdown(metrics_server.stop)
+
+    # Outside the main process, ui.run only applies the page configuration
+    multiprocessing.current_process().name = f"Worker-{index}"
+    ui.run(reload=False, show=False, **run_options)
+    app.config.socket_io_js_query_params[WORKER_QUERY_PARAM] = str(index)
+
+    config = CustomServerConfig(
+        app, log_level="warning",
+        # Only the proxy may report the client address and scheme
+        proxy_headers=True, forwarded_allow_ips="127.0.0.1",
+        timeout_graceful_shutdown=max(1, int(shutdown_timeout)),
+    )
+    Server.create_singleton(config)
+    Server.instance.run(sockets=[sock])
+
+
+def _run_proxy(
+    sock: socket.socket,
+    ports: List[int],
+    metrics_ports: List[int],
+    metrics_sock: Optional[socket.socket],
+    shutdown_timeout: float,
+) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(
+        StickyProxy(ports, metrics_ports=metrics_ports, metrics_socket=metrics_sock),
+        log_level="warning", lifespan="on",
+        # Addresses are passed on to the workers untouched
+        proxy_headers=False,
+        timeout_graceful_shutdown=max(1, int(shutdown_timeout / 2)),
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    run_options: Dict[str, Any], host: str, port: int, workers: int, shutdown_timeout: float = 4.0
+) -> None:
+    """Serve the already imported NiceGUI app from ``workers`` processes
+
+    ``run_options`` are the ``ui.run`` page options (title, favicon, ...).
+    Blocks until SIGINT or SIGTERM, then shuts everything down gracefully.
+    """
+
+    from app.core.compression import precompress_static
+    from app.core.config import settings
+
+    if settings.state_backend == "memory":
+        logger.warning("STATE_BACKEND=memory keeps rate limits per worker; use sqlite or redis to share them")
+
+    public = _bind(host, port)
+    internal = [_bind("127.0.0.1", 0) for _ in range(workers)]
+    ports = [sock.getsockname()[1] for sock in internal]
+    # Per-worker metrics on loopback, merged by the proxy on METRICS_PORT
+    metrics_public = _bind(settings.metrics_host, settings.metrics_port) if settings.metrics_port else None
+    metrics_internal = [_bind("127.0.0.1", 0) for _ in range(workers)]
+    metrics_ports = [sock.getsockname()[1] for sock in metrics_internal]
+
+    # Done before forking so every worker (and every respawned one) inherits
+    # the table of sidecars instead of only the worker that wrote them
+    precompress_static()
+
+    # Objects loaded so far are never collected, so the GC does not touch
+    # (and copy) the pages the children share
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, Tuple[str, int]] = {}
+
+    def spawn(role: str, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            children[pid] = (role, index)
+            return
+
+        # Child: exits through os._exit so the supervisor's atexit handlers never run here
+        from app.core.logging import restart_logging_after_fork, stop_logging
+
+        restart_logging_after_fork()
+        status = 0
+        try:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if role == "proxy":
+                for sock in internal + metrics_internal:
+                    sock.close()
+                _run_proxy(public, ports, metrics_ports, metrics_public, shutdown_timeout)
+            else:
+                for sock in [public, metrics_public] + internal + metrics_internal:
+                    if sock is not None and sock not in (internal[index], metrics_internal[index]):
+                        sock.close()
+                _run_worker(index, internal[index], metrics_internal[index], run_options, shutdown_timeout)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            logger.exception("%s %s crashed", role, index)
+            status = 1
+        finally:
+            stop_logging()
+            sys.stdout.flush()
+            os._exit(status)
+
+    stopping: List[int] = []
+
+    def request_stop(signum, frame) -> None:
+        stopping.append(signum)
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    for index in range(workers):
+        spawn("worker", index)
+    spawn("proxy", 0)
+    logger.info("Serving on http://%s:%s with %s workers (ports %s)", host, port, workers, ports)
+
+    last_spawn: Dict[Tuple[str, int], float] = {}
+    while not stopping:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid in children:
+            role, index = children.pop(pid)
+            logger.error("%s %s exited with status %s, restarting", role, index, os.waitstatus_to_exitcode(status))
+            # A child that keeps crashing is restarted at most once a second
+            delay = last_spawn.get((role, index), 0) + 1.0 - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            last_spawn[(role, index)] = time.monotonic()
+            if not stopping:
+                spawn(role, index)
+            continue
+        time.sleep(0.1)
+
+    _shutdown(children, shutdown_timeout)
+
+
+def _shutdown(children: Dict[int, Tuple[str, int]], timeout: float) -> None:
+    """Stop the proxy, then the workers; kill whatever is left at the deadline"""
+
+    deadline = time.monotonic() + timeout
+    proxies = [pid for pid, (role, _) in children.items() if role == "proxy"]
+    workers = [pid for pid, (role, _) in children.items() if role == "worker"]
+
+    for group, group_deadline in ((proxies, time.monotonic() + timeout / 2), (workers, deadline)):
+        for pid in group:
+            try:
+                os.kill(pid, signal.SIGINT)
+            except ProcessLookupError:
+                pass
+        remaining = set(group)
+        while remaining and time.monotonic() < group_deadline:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.discard(pid)
+            time.sleep(0.05)
+        for pid in remaining:
+            logger.warning("Killing %s %s after the shutdown timeout", *children[pid])
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+    logger.info("All workers stopped")
@@ -80,7 +80,7 @@ def api_demo_page():
             status.text = "Examples loaded successfully"
             status.classes('text-green-600')
         except Exception as e:
-            app_logger.error(f"Error fetching examples: {e}")
+            app_logger.error("Error fetching examples: %s", e)
             status.text = f"Error: {str(e)}"
             status.classes('text-red-600')
     
@@ -100,12 +100,9 @@ def api_demo_page():
         with ui.row().classes('w-full justify-center mt-4'):
             ui.button('Back to Home', on_click=lambda: ui.navigate('/'))
 
-# Define a health check page for Fly.io
-@ui.page('/health')
-def health_check_page():
-    # Fly.io health checks typically look for a 200 OK status.
-    # This page will return 200 OK. Content can be simple.
-    ui.label('{"status": "healthy"}')
+# Health checks for Fly.io are not a page: /health, /health/live and
+# /health/ready are answered as JSON by HealthCheckMiddleware
+# (see app.core.middleware.add_health_check), without creating a NiceGUI client.
 
 # Protected page example
 @ui.page('/protected')
@@ -0,0 +1,336 @@
+"""Durable email outbox for the contact form
+
+Messages are written to a small SQLite queue and delivered by an async worker,
+so request handlers never wait on SMTP. Delivery reuses one authenticated SMTP
+connection and failed messages are retried with exponential backoff.
+``smtplib`` and the email package are only imported once a message is sent.
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSender:
+    """Sends messages over a single reused SMTP connection"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._server: Optional["smtplib.SMTP"] = None
+        self._lock = threading.Lock()
+
+    def send(self, message: "EmailMessage") -> None:
+        """Deliver a message, reconnecting once if the server dropped us"""
+
+        import smtplib
+
+        with self._lock:
+            try:
+                self._connect().send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+                self._connect().send_message(message)
+            except smtplib.SMTPResponseException:
+                # The server answered, so the connection itself is still usable
+                raise
+            except OSError:
+                self._discard()
+                raise
+
+    def close(self) -> None:
+        """Politely close the connection"""
+
+        with self._lock:
+            if self._server is not None:
+                import smtplib
+
+                try:
+                    self._server.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._server = None
+
+    def _discard(self) -> None:
+        """Drop a connection in an unknown state so the next send reconnects"""
+
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+
+    def _connect(self) -> "smtplib.SMTP":
+        """Return the open connection, establishing it on first use"""
+
+        if self._server is not None:
+            return self._server
+
+        import smtplib
+
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        self._server = server
+        logger.info("Connected to SMTP server %s:%s", self.host, self.port)
+        return server
+
+
+class EmailOutbox:
+    """SQLite-backed queue of outgoing emails with an async delivery worker
+
+    The queue lives on disk, so messages accepted before a restart or crash are
+    still delivered afterwards. All database access happens on the event loop
+    thread; only the SMTP round trip runs in a worker thread.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        sender: SMTPSender,
+        db_path: Optional[Path] = None,
+        max_attempts: int = 8,
+        base_delay: float = 5.0,
+        max_delay: float = 900.0,
+        poll_interval: float = 30.0,
+    ):
+        self.sender = sender
+        self.db_path = db_path or Path(settings.outbox_path)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._db: Optional[sqlite3.Connection] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, subject: str, body: str, reply_to: str = "", recipient: str = "") -> int:
+        """Queue a message for delivery and return its id"""
+
+        cursor = self._connection().execute(
+            "INSERT INTO outbox (recipient, subject, body, reply_to, attempts, next_attempt_at, status, created_at) "
+            "VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+            (
+                _header_value(recipient or settings.contact_email), _header_value(subject), body,
+                _header_value(reply_to), time.time(), self.PENDING, time.time(),
+            ),
+        )
+        self._connection().commit()
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return cursor.lastrowid
+
+    def start(self) -> None:
+        """Start the delivery worker on the running event loop"""
+
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the worker and close the SMTP connection"""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.sender.close)
+
+    async def run(self) -> None:
+        """Deliver due messages until cancelled"""
+
+        while True:
+            try:
+                await self.deliver_due()
+            except Exception as e:
+                logger.error("Outbox delivery pass failed: %s", e)
+
+            if self._wakeup is None:
+                self._wakeup = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_wait())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def deliver_due(self) -> int:
+        """Try every message whose retry time has come; returns the number sent"""
+
+        sent = 0
+        for message_id, recipient, subject, body, reply_to, attempts in self._due_messages():
+            try:
+                message = self._build_message(recipient, subject, body, reply_to)
+                await asyncio.to_thread(self.sender.send, message)
+            except Exception as e:
+                self._record_failure(message_id, attempts + 1, e, permanent=_is_permanent(e))
+                continue
+
+            self._connection().execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = NULL WHERE id = ?",
+                (self.SENT, attempts + 1, message_id),
+            )
+            self._connection().commit()
+            sent += 1
+            logger.info("Delivered outbox message %s", message_id)
+
+        return sent
+
+    def pending_count(self) -> int:
+        """Number of messages still waiting for delivery"""
+
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = ?", (self.PENDING,)
+        ).fetchone()
+        return row[0]
+
+    def _due_messages(self) -> List[Tuple[int, str, str, str, str, int]]:
+        """Pending messages whose next attempt is due, oldest first"""
+
+        return self._connection().execute(
+            "SELECT id, recipient, subject, body, reply_to, attempts FROM outbox "
+            "WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT 50",
+            (self.PENDING, time.time()),
+        ).fetchall()
+
+    def _record_failure(self, message_id: int, attempts: int, error: Exception, permanent: bool = False) -> None:
+        """Schedule a retry with exponential backoff, or give up
+
+        Permanent errors (a message that cannot be built or that the server
+        rejected outright) fail the message at once instead of blocking the queue.
+        """
+
+        if permanent or attempts >= self.max_attempts:
+            status = self.FAILED
+            next_attempt_at = 0.0
+            logger.error("Giving up on outbox message %s after %s attempts: %s", message_id, attempts, error)
+        else:
+            status = self.PENDING
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            next_attempt_at = time.time() + delay + random.uniform(0, delay * 0.1)
+            logger.warning("Outbox message %s failed (attempt %s), retrying in %.0fs: %s", message_id, attempts, delay, error)
+
+        self._connection().execute(
+            "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (status, attempts, next_attempt_at, str(error), message_id),
+        )
+        self._connection().commit()
+
+    def _next_wait(self) -> float:
+        """Seconds until the next scheduled retry, capped by the poll interval"""
+
+        row = self._connection().execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?", (self.PENDING,)
+        ).fetchone()
+        if row[0] is None:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, row[0] - time.time()))
+
+    def _build_message(self, recipient: str, subject: str, body: str, reply_to: str) -> "EmailMessage":
+        """Assemble the outgoing email"""
+
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["From"] = settings.smtp_username or settings.contact_email
+        message["To"] = recipient
+        message["Subject"] = subject
+        if reply_to:
+            message["Reply-To"] = reply_to
+        message.set_content(body)
+        return message
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the queue database on first use"""
+
+        if self._db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "recipient TEXT NOT NULL, "
+                "subject TEXT NOT NULL, "
+                "body TEXT NOT NULL, "
+                "reply_to TEXT NOT NULL DEFAULT '', "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, "
+                "status TEXT NOT NULL, "
+                "last_error TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+            self._db.commit()
+        return self._db
+
+
+def _header_value(value: str) -> str:
+    """Fold line breaks, which would inject headers (and make EmailMessage raise)"""
+
+    return " ".join(value.split()) if "\r" in value or "\n" in value else value
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether retrying ``error`` can never succeed"""
+
+    import smtplib
+
+    if isinstance(error, (ValueError, TypeError)):
+        # The message itself is malformed
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    # 5xx after DATA: the server rejected this message's content
+    return isinstance(error, smtplib.SMTPDataError) and 500 <= error.smtp_code < 600
+
+
+def create_outbox() -> Optional[EmailOutbox]:
+    """Build the outbox from settings, or None when SMTP is not configured"""
+
+    if not settings.smtp_server:
+        return None
+
+    sender = SMTPSender(
+        host=settings.smtp_server,
+        port=settings.smtp_port,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        use_tls=settings.smtp_use_tls,
+    )
+    return EmailOutbox(sender, max_attempts=settings.outbox_max_attempts)
@@ -1,15 +1,13 @@
 """Portfolio service for handling business logic and external integrations"""
 
 import os
-import smtplib
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from pathlib import Path
 
 from nicegui import ui
 from app.core.config import settings
+from app.services.outbox import EmailOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +15,9 @@ logger = logging.getLogger(__name__)
 class PortfolioService:
     """Service class for portfolio-related operations"""
     
-    def __init__(self):
+    def __init__(self, outbox: Optional[EmailOutbox] = None):
         self.resume_path = Path(settings.resume_path) / settings.resume_filename
+        self.outbox = outbox
         
     def send_contact_message(self, name: str, email: str, subject: str, message: str) -> bool:
         """Send contact form message via email"""
@@ -28,11 +27,8 @@ class PortfolioService:
             ui.notify("Please fill in all fields", type="negative")
             return False
         
-        # For demo purposes, we'll just show a success notification
-        # In production, you would integrate with an email service
         try:
-            # Simulate email sending
-            self._simulate_email_send(name, email, subject, message)
+            self._queue_email(name, email, subject, message)
             
             ui.notify(
                 f"Thank you {name}! Your message has been sent successfully. I'll get back to you soon!",
@@ -42,62 +38,39 @@ class PortfolioService:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send contact message: {e}")
+            logger.error("Failed to send contact message: %s", e)
             ui.notify("Sorry, there was an error sending your message. Please try again later.", type="negative")
             return False
     
-    def _simulate_email_send(self, name: str, email: str, subject: str, message: str):
-        """Simulate email sending (replace with actual email service in production)"""
+    def _queue_email(self, name: str, email: str, subject: str, message: str):
+        """Queue the contact message for background delivery (demo mode just logs it)"""
         
         # Log the contact attempt
-        logger.info(f"Contact form submission from {name} ({email}): {subject}")
+        logger.info("Contact form submission from %s (%s): %s", name, email, subject)
         
-        # In production, you would use services like:
-        # - SendGrid
-        # - AWS SES
-        # - Mailgun
-        # - SMTP server
-        
-        if settings.smtp_server and settings.smtp_username and settings.smtp_password:
-            self._send_actual_email(name, email, subject, message)
-        else:
+        if self.outbox is None:
             # For demo, just log the message
-            logger.info(f"Demo mode - Contact message: {message}")
-    
-    def _send_actual_email(self, name: str, email: str, subject: str, message: str):
-        """Send actual email using SMTP (if configured)"""
+            logger.info("Demo mode - Contact message: %s", message)
+            return
         
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = settings.smtp_username
-            msg['To'] = settings.contact_email
-            msg['Subject'] = f"Portfolio Contact: {subject}"
-            
-            body = f"""
-            New contact form submission:
-            
-            Name: {name}
-            Email: {email}
-            Subject: {subject}
-            
-            Message:
-            {message}
-            """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            server = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
-            server.starttls()
-            server.login(settings.smtp_username, settings.smtp_password)
-            text = msg.as_string()
-            server.sendmail(settings.smtp_username, settings.contact_email, text)
-            server.quit()
-            
-            logger.info(f"Email sent successfully from {email}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send email: {e}")
-            raise
+        body = f"""
+        New contact form submission:
+        
+        Name: {name}
+        Email: {email}
+        Subject: {subject}
+        
+        Message:
+        {message}
+        """
+        
+        # Only a local SQLite insert; the outbox worker does the SMTP round trip
+        message_id = self.outbox.enqueue(
+            subject=f"Portfolio Contact: {subject}",
+            body=body,
+            reply_to=email,
+        )
+        logger.info("Queued contact email %s from %s", message_id, email)
     
     def download_resume(self):
         """Handle resume download"""
@@ -171,9 +144,9 @@ CERTIFICATIONS
         try:
             with open(self.resume_path, 'w') as f:
                 f.write(resume_content)
-            logger.info(f"Demo resume created at {self.resume_path}")
+            logger.info("Demo resume created at %s", self.resume_path)
         except Exception as e:
-            logger.error(f"Failed to create demo resume: {e}")
+            logger.error("Failed to create demo resume: %s", e)
     
     def get_portfolio_stats(self) -> dict:
         """Get portfolio statistics for display"""
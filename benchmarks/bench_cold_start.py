@@ -0,0 +1,100 @@
+"""Benchmark: time to first response after a cold start
+
+Starts ``python main.py`` the way a scale-to-zero machine does and polls until
+the liveness probe answers, then requests the portfolio page. Both times are
+measured from process spawn. Exits non-zero when the median time to the first
+page exceeds the budget, so it can gate CI.
+
+Run from the project root:
+
+    python -m benchmarks.bench_cold_start [--runs 5] [--budget 4.0]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Look like a browser, so / renders the live NiceGUI page rather than the static snapshot
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "text/html"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=BROWSER_HEADERS), timeout=10) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def cold_start(timeout: float) -> Tuple[float, float]:
+    """Spawn the app once; returns seconds until /health/live and / answered 200"""
+
+    port = free_port()
+    env = {**os.environ, "HOST": "127.0.0.1", "PORT": str(port), "DEBUG": "false", "BROWSER": "true"}
+    base = f"http://127.0.0.1:{port}"
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=PROJECT_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while get(f"{base}/health/live") != 200:
+            if process.poll() is not None:
+                raise RuntimeError(f"main.py exited with code {process.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"No response within {timeout} s")
+            time.sleep(0.01)
+        live = time.perf_counter() - start
+
+        status = get(f"{base}/")
+        if status != 200:
+            raise RuntimeError(f"GET / returned {status}")
+        page = time.perf_counter() - start
+        return live, page
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=4.0, help="Seconds allowed until the first page")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = [cold_start(args.timeout) for _ in range(args.runs)]
+    live = statistics.median(result[0] for result in results)
+    page = statistics.median(result[1] for result in results)
+
+    print(f"{args.runs} cold starts (median)")
+    print(f"  first /health/live: {live * 1000:7.0f} ms")
+    print(f"  first page:         {page * 1000:7.0f} ms  (budget {args.budget * 1000:.0f} ms)")
+
+    if page > args.budget:
+        print("FAIL: time to first page is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
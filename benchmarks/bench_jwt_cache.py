@@ -0,0 +1,45 @@
+"""Micro-benchmark: cost of verifying the same access token repeatedly
+
+Compares the full ``jwt.decode`` path (signature check, JSON parsing and
+``TokenData`` construction) with ``verify_token``, which serves tokens it has
+already verified from ``token_cache``.
+
+Run from the project root:
+
+    python -m benchmarks.bench_jwt_cache [iterations]
+"""
+
+import sys
+import time
+from datetime import timedelta
+
+from app.core.security import _decode_token, create_access_token, token_cache, verify_token
+
+
+def run(verify, token: str, iterations: int) -> float:
+    """Verify ``token`` ``iterations`` times; returns seconds per call"""
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verify(token)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    token = create_access_token({"sub": "admin", "roles": ["admin", "user"]}, timedelta(minutes=30))
+
+    token_cache.clear()
+    verify_token(token)  # Warm the cache
+    results = {
+        "decode": run(_decode_token, token, iterations),
+        "cached": run(verify_token, token, iterations),
+    }
+
+    print(f"{iterations} verifications per variant")
+    for variant, seconds in results.items():
+        print(f"{variant:>8}: {seconds * 1e6:7.2f} us/call  ({results['decode'] / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
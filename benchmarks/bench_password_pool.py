@@ -0,0 +1,75 @@
+"""Benchmark: event loop latency while logins verify bcrypt passwords
+
+Runs a burst of concurrent logins while a probe task, standing in for every
+other request served by the same process, wakes up every 5 ms and records
+how late it was. Compares verifying inline in the ``async def`` (the old
+login path) with ``check_password``, which runs in the bounded password pool.
+
+Run from the project root (``BCRYPT_ROUNDS`` sets the cost):
+
+    python -m benchmarks.bench_password_pool [logins]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from app.core.security import check_password, get_pwd_context, password_pool, verify_password
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: list, stop: asyncio.Event) -> None:
+    """Record how late each wake-up is"""
+
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(loop.time() - started - PROBE_INTERVAL)
+
+
+async def run(variant: str, hashed: str, logins: int):
+    """Run ``logins`` concurrent logins; returns (wall seconds, probe lags)"""
+
+    async def login():
+        if variant == "inline":
+            verify_password("password", hashed)
+        else:
+            await check_password("password", hashed)
+
+    lags: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    return elapsed, lags
+
+
+def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    # Never more than the pool admits, so no login is rejected
+    password_pool.max_pending = max(password_pool.max_pending, logins)
+    pwd_context = get_pwd_context()
+    hashed = pwd_context.hash("password")
+    rounds = pwd_context.handler().parsehash(hashed)["rounds"]
+
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, {password_pool.workers} pool workers")
+    for variant in ("inline", "pool"):
+        elapsed, lags = asyncio.run(run(variant, hashed, logins))
+        print(
+            f"{variant:>7}: logins done in {elapsed * 1e3:7.1f} ms, other requests delayed "
+            f"p50 {statistics.median(lags) * 1e3:6.1f} ms, max {max(lags) * 1e3:7.1f} ms"
+        )
+    password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
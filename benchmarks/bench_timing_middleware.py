@@ -0,0 +1,92 @@
+"""Micro-benchmark: per-request overhead of the request timing middleware
+
+Compares a trivial Starlette endpoint with no timing middleware, with the old
+``@app.middleware("http")`` (BaseHTTPMiddleware) version, and with the pure
+ASGI ``TimingMiddleware``. Requests are driven straight through the ASGI
+interface, so the numbers exclude sockets and HTTP parsing.
+
+Run from the project root:
+
+    python -m benchmarks.bench_timing_middleware [requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware import TimingMiddleware
+
+
+async def endpoint(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(variant: str) -> Starlette:
+    app = Starlette(routes=[Route("/", endpoint)])
+
+    if variant == "base_http":
+        @app.middleware("http")
+        async def add_process_time_header(request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = str(time.time() - start_time)
+            return response
+    elif variant == "asgi":
+        app.add_middleware(TimingMiddleware)
+
+    return app
+
+
+async def run(app, requests: int) -> float:
+    """Send ``requests`` GET / requests through the app; returns seconds per request"""
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/", "raw_path": b"/", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    def make_receive():
+        # Like a server: deliver the request body once, then wait for a
+        # disconnect that never comes (streaming responses cancel the wait)
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()
+
+        return receive
+
+    async def send(message):
+        pass
+
+    # Warm up (builds the middleware stack)
+    for _ in range(200):
+        await app(dict(scope), make_receive(), send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), make_receive(), send)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = {
+        variant: asyncio.run(run(build_app(variant), requests))
+        for variant in ("none", "base_http", "asgi")
+    }
+
+    baseline = results["none"]
+    print(f"{requests} requests per variant")
+    for variant, seconds in results.items():
+        print(f"{variant:>10}: {seconds * 1e6:7.1f} us/request  (+{(seconds - baseline) * 1e6:6.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Shared fixtures"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Headers of a browser navigation, so / renders the live NiceGUI page
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0", "Accept": "text/html"}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stop_logging():
+    """Drain the log writer thread while pytest's captured stdout is still open"""
+    yield
+    from app.core.logging import stop_logging
+
+    stop_logging()
+
+
+@pytest.fixture(scope="session")
+def app_client(tmp_path_factory):
+    """The full application (main.py) behind a test client"""
+
+    from app.core.config import settings
+
+    # Router discovery must not write the manifest into the working tree
+    settings.module_manifest_path = str(tmp_path_factory.mktemp("manifest") / "module_manifest.json")
+    # Every test request comes from the same client
+    settings.rate_limit_requests = 10_000
+
+    import main  # noqa: F401  (registers the pages and middleware)
+    from nicegui import app
+
+    # Tests start their own MetricsServer on a free port
+    settings.metrics_port = 0
+
+    if not app.config.has_run_config:
+        # What ui.run() would configure, without starting a server
+        app.config.add_run_config(
+            reload=False, title=main.PAGE_TITLE, viewport="width=device-width, initial-scale=1",
+            favicon=None, dark=False, language="en-US", binding_refresh_interval=0.1,
+            reconnect_timeout=3.0, tailwind=True, prod_js=True, show_welcome_message=False,
+        )
+    with TestClient(app) as client:
+        yield client
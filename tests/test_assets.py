@@ -0,0 +1,99 @@
+"""Asset manifest persistence, cache placement and image fetching"""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from app.core.assets import ProfessionalAssetManager
+from app.core.compression import STATIC_DIRECTORIES
+
+
+def test_default_cache_is_not_publicly_served():
+    cache_dir = ProfessionalAssetManager().cache_dir.resolve()
+
+    for directory in STATIC_DIRECTORIES.values():
+        assert not cache_dir.is_relative_to(Path(directory).resolve())
+
+
+def test_manifest_is_reused_until_its_inputs_change(tmp_path):
+    manager = ProfessionalAssetManager(cache_dir=tmp_path)
+    manifest = manager.build_manifest()
+
+    assert ProfessionalAssetManager(cache_dir=tmp_path)._load_manifest() == manifest
+
+    changed = ProfessionalAssetManager(cache_dir=tmp_path)
+    changed.PRIMARY_URL_TEMPLATE = "https://images.example.com/1200x800/?{keyword}&sig={seed}"
+    assert changed._load_manifest() is None
+    assert changed.get_manifest()["hero"][0].primary_url.startswith("https://images.example.com/")
+
+
+def test_eviction_covers_derivatives(tmp_path):
+    manager = ProfessionalAssetManager(cache_dir=tmp_path, max_cache_bytes=2500)
+    manager.derived_dir.mkdir()
+
+    def write(path: Path, size: int, mtime: float) -> Path:
+        path.write_bytes(b"x" * size)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    old = write(tmp_path / "aaaa.jpg", 1000, 100)
+    old_derivative = write(manager.derived_dir / "aaaa-320.webp", 200, 400)
+    new = write(tmp_path / "bbbb.jpg", 1000, 200)
+    new_derivative = write(manager.derived_dir / "bbbb-320.webp", 200, 300)
+    manager._index = {"old": old.name, "new": new.name}
+
+    # 2400 bytes fit the cap
+    manager.trim_cache()
+    assert old.exists() and old_derivative.exists()
+
+    # The least recently used source goes, taking its derivatives with it
+    write(manager.derived_dir / "bbbb-640.webp", 400, 500)
+    manager.trim_cache()
+    assert not old.exists() and not old_derivative.exists()
+    assert new.exists() and new_derivative.exists()
+    assert manager._index == {"new": new.name}
+
+
+def test_least_recently_used_derivatives_are_evicted_first(tmp_path):
+    manager = ProfessionalAssetManager(cache_dir=tmp_path, max_cache_bytes=1500)
+    manager.derived_dir.mkdir()
+    source = tmp_path / "aaaa.jpg"
+    source.write_bytes(b"x" * 1000)
+    stale = manager.derived_dir / "aaaa-320.webp"
+    stale.write_bytes(b"x" * 400)
+    fresh = manager.derived_dir / "aaaa-640.webp"
+    fresh.write_bytes(b"x" * 400)
+    os.utime(stale, (100, 100))
+
+    manager.trim_cache()
+    assert source.exists() and fresh.exists() and not stale.exists()
+
+
+class FakeResponse:
+    def __init__(self, content_type: str):
+        self.headers = {"content-type": content_type}
+        self.content = b"\xff\xd8 image bytes"
+
+    def raise_for_status(self):
+        pass
+
+
+def test_non_image_responses_count_as_breaker_failures(tmp_path, monkeypatch):
+    from app.core import assets
+    from app.core.circuit_breaker import HostBreakers
+
+    breakers = HostBreakers(failure_threshold=2)
+    monkeypatch.setattr(assets, "host_breakers", breakers)
+    manager = ProfessionalAssetManager(cache_dir=tmp_path)
+    content_types = {"html.example.com": "text/html", "images.example.com": "image/jpeg"}
+    session = SimpleNamespace(get=lambda url, timeout: FakeResponse(content_types[urlsplit(url).hostname]))
+    monkeypatch.setattr(manager, "_get_session", lambda: session)
+    manager._sources["a"] = ("https://html.example.com/a", "https://images.example.com/a")
+    manager._sources["b"] = ("https://html.example.com/b", "https://images.example.com/b")
+
+    assert manager._fetch_and_store("a").exists()
+    assert manager._fetch_and_store("b").exists()
+
+    assert breakers.for_url("https://html.example.com/").state == "open"
+    assert breakers.for_url("https://images.example.com/").failures == 0
@@ -0,0 +1,56 @@
+"""Image URL validation and its circuit breakers"""
+
+import asyncio
+
+import httpx
+
+from app.core.circuit_breaker import HostBreakers
+from app.core.image_validator import AsyncImageValidator
+from app.core.state import MemoryBackend
+
+
+def make_validator(handler) -> AsyncImageValidator:
+    validator = AsyncImageValidator(breakers=HostBreakers(failure_threshold=2), state=MemoryBackend())
+    validator._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return validator
+
+
+def validate(validator: AsyncImageValidator, *urls: str):
+    async def run():
+        try:
+            return [await validator.validate(url) for url in urls]
+        finally:
+            await validator.aclose()
+
+    return asyncio.run(run())
+
+
+def test_image_responses_are_valid():
+    validator = make_validator(lambda request: httpx.Response(200, headers={"content-type": "image/jpeg"}))
+
+    assert validate(validator, "https://images.example.com/a.jpg") == [True]
+    assert validator.breakers.for_url("https://images.example.com/").failures == 0
+
+
+def test_non_image_responses_count_as_failures():
+    validator = make_validator(lambda request: httpx.Response(200, headers={"content-type": "text/html"}))
+
+    assert validate(validator, "https://images.example.com/a", "https://images.example.com/b") == [False, False]
+    assert validator.breakers.for_url("https://images.example.com/").state == "open"
+
+
+def test_missing_images_do_not_open_the_circuit():
+    validator = make_validator(lambda request: httpx.Response(404, headers={"content-type": "text/html"}))
+
+    assert validate(validator, "https://images.example.com/a", "https://images.example.com/b") == [False, False]
+    assert validator.breakers.for_url("https://images.example.com/").failures == 0
+
+
+def test_unexpected_errors_count_as_failures():
+    def handler(request):
+        raise RuntimeError("boom")
+
+    validator = make_validator(handler)
+
+    assert validate(validator, "https://images.example.com/a", "https://images.example.com/b") == [False, False]
+    assert validator.breakers.for_url("https://images.example.com/").state == "open"
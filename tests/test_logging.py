@@ -0,0 +1,19 @@
+"""Routing of records to the log handlers"""
+
+import logging
+
+from app.core.logger import app_logger
+from app.core.logging import log_listener
+
+
+def make_record(name: str) -> logging.LogRecord:
+    return logging.LogRecord(name, logging.INFO, __file__, 1, "message", (), None)
+
+
+def test_portfolio_log_only_gets_portfolio_records():
+    handler = next(handler for handler in log_listener.handlers if handler.name == "portfolio_file")
+
+    assert handler.filter(make_record(app_logger.name))
+    assert handler.filter(make_record(f"{app_logger.name}.contact"))
+    assert not handler.filter(make_record("app.core.assets"))
+    assert not handler.filter(make_record("uvicorn.access"))
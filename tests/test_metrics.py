@@ -0,0 +1,55 @@
+"""Metrics exposition on its own port"""
+
+import asyncio
+
+from app.core.metrics import CONTENT_TYPE, MetricsServer
+
+
+async def fetch(port: int, request: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def scrape(server: MetricsServer, *requests: bytes):
+    async def run():
+        await server.start("127.0.0.1", 0)
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            return [await fetch(port, request) for request in requests]
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+def test_metrics_server_serves_only_the_scrape_path():
+    ok, missing, post = scrape(
+        MetricsServer(lambda: "up 1.0\n"),
+        b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n",
+        b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n",
+        b"POST /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n",
+    )
+
+    assert ok.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert f"Content-Type: {CONTENT_TYPE}".encode() in ok
+    assert ok.endswith(b"\r\n\r\nup 1.0\n")
+    assert missing.startswith(b"HTTP/1.1 404 ")
+    assert post.startswith(b"HTTP/1.1 405 ")
+
+
+def test_metrics_server_awaits_async_renderers():
+    async def render():
+        return "merged 2.0\n"
+
+    (response,) = scrape(MetricsServer(render), b"GET /metrics?x=1 HTTP/1.1\r\n\r\n")
+    assert response.endswith(b"merged 2.0\n")
+
+
+def test_public_port_does_not_serve_metrics(app_client):
+    response = app_client.get("/metrics")
+
+    assert "# TYPE" not in response.text
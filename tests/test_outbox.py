@@ -0,0 +1,128 @@
+"""Email outbox delivery against a local SMTP server (aiosmtpd)"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from app.services.outbox import EmailOutbox, SMTPSender
+
+
+class RecordingHandler:
+    """Accepts messages, optionally answering the first ones with a transient error"""
+
+    def __init__(self, transient_failures: int = 0):
+        self.transient_failures = transient_failures
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.transient_failures:
+            self.transient_failures -= 1
+            return "451 Try again later"
+        self.messages.append(envelope.content.decode())
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    def start(handler: RecordingHandler):
+        controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+        controller.start()
+        servers.append(controller)
+        return controller
+
+    servers = []
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def make_outbox(tmp_path, port: int) -> EmailOutbox:
+    sender = SMTPSender("127.0.0.1", port, use_tls=False, timeout=5)
+    return EmailOutbox(sender, db_path=tmp_path / "outbox.sqlite3", max_attempts=3)
+
+
+def statuses(outbox: EmailOutbox):
+    return outbox._connection().execute("SELECT status, attempts FROM outbox ORDER BY id").fetchall()
+
+
+def test_delivers_pending_messages(tmp_path, smtp_server):
+    handler = RecordingHandler()
+    outbox = make_outbox(tmp_path, smtp_server(handler).port)
+    outbox.enqueue("Hello", "First body", reply_to="visitor@example.com", recipient="me@example.com")
+    outbox.enqueue("Again", "Second body", recipient="me@example.com")
+
+    assert asyncio.run(outbox.deliver_due()) == 2
+    assert statuses(outbox) == [(EmailOutbox.SENT, 1), (EmailOutbox.SENT, 1)]
+    assert "Subject: Hello" in handler.messages[0]
+    assert "Reply-To: visitor@example.com" in handler.messages[0]
+    assert outbox.pending_count() == 0
+    outbox.sender.close()
+
+
+def test_transient_failure_is_retried(tmp_path, smtp_server):
+    handler = RecordingHandler(transient_failures=1)
+    outbox = make_outbox(tmp_path, smtp_server(handler).port)
+    outbox.enqueue("Hello", "Body", recipient="me@example.com")
+
+    assert asyncio.run(outbox.deliver_due()) == 0
+    assert statuses(outbox) == [(EmailOutbox.PENDING, 1)]
+    next_attempt_at = outbox._connection().execute("SELECT next_attempt_at FROM outbox").fetchone()[0]
+    assert next_attempt_at > time.time()
+
+    # Not due yet, so nothing is sent
+    assert asyncio.run(outbox.deliver_due()) == 0
+
+    outbox._connection().execute("UPDATE outbox SET next_attempt_at = 0")
+    assert asyncio.run(outbox.deliver_due()) == 1
+    assert statuses(outbox) == [(EmailOutbox.SENT, 2)]
+    outbox.sender.close()
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    # Nothing listens on this port
+    outbox = make_outbox(tmp_path, free_port())
+    outbox.enqueue("Hello", "Body", recipient="me@example.com")
+
+    for _ in range(3):
+        outbox._connection().execute("UPDATE outbox SET next_attempt_at = 0 WHERE status = ?", (EmailOutbox.PENDING,))
+        asyncio.run(outbox.deliver_due())
+
+    assert statuses(outbox) == [(EmailOutbox.FAILED, 3)]
+
+
+def test_poison_message_does_not_block_the_queue(tmp_path, smtp_server):
+    handler = RecordingHandler()
+    outbox = make_outbox(tmp_path, smtp_server(handler).port)
+    # Written directly, as enqueue() would fold the line break
+    outbox._connection().execute(
+        "INSERT INTO outbox (recipient, subject, body, reply_to, attempts, next_attempt_at, status, created_at) "
+        "VALUES ('me@example.com', 'Bad\nBcc: victim@example.com', 'Body', '', 0, 0, ?, 0)",
+        (EmailOutbox.PENDING,),
+    )
+    outbox.enqueue("Good", "Body", recipient="me@example.com")
+
+    assert asyncio.run(outbox.deliver_due()) == 1
+    assert statuses(outbox) == [(EmailOutbox.FAILED, 1), (EmailOutbox.SENT, 1)]
+    assert len(handler.messages) == 1
+    outbox.sender.close()
+
+
+def test_enqueue_folds_header_line_breaks(tmp_path, smtp_server):
+    handler = RecordingHandler()
+    outbox = make_outbox(tmp_path, smtp_server(handler).port)
+    outbox.enqueue("Hi\r\nBcc: victim@example.com", "Body", reply_to="a@example.com\nX-Evil: 1", recipient="me@example.com")
+
+    assert asyncio.run(outbox.deliver_due()) == 1
+    assert "Subject: Hi Bcc: victim@example.com" in handler.messages[0]
+    assert "\nX-Evil" not in handler.messages[0]
+    outbox.sender.close()
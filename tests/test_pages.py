@@ -0,0 +1,43 @@
+"""Rendering of the portfolio page"""
+
+from dataclasses import replace
+from types import MappingProxyType
+
+from app.core.render_cache import render_cache
+from tests.conftest import BROWSER_HEADERS
+
+PLACEHOLDER = "data:image/webp;base64,UklGRiIAAABXRUJQVlA4IBYAAAAwAQCdASoBAAEADsD+JaQAA3AAAAAA"
+
+
+def test_portfolio_page_renders(app_client):
+    response = app_client.get("/", headers=BROWSER_HEADERS)
+
+    assert response.status_code == 200
+    assert "client_id" in response.text
+
+
+def test_portfolio_page_renders_with_placeholders(app_client, monkeypatch):
+    import main
+
+    manifest = {
+        section: tuple(replace(asset, placeholder=PLACEHOLDER, dominant_color="#223344") for asset in assets)
+        for section, assets in main.asset_manager.get_manifest().items()
+    }
+    monkeypatch.setattr(main.asset_manager, "_manifest", MappingProxyType(manifest))
+    render_cache.invalidate()
+    try:
+        response = app_client.get("/", headers=BROWSER_HEADERS)
+    finally:
+        monkeypatch.undo()
+        render_cache.invalidate()
+
+    assert response.status_code == 200
+    assert PLACEHOLDER in response.text
+
+
+def test_api_is_mounted(app_client):
+    response = app_client.get("/api/examples/")
+
+    assert response.status_code == 200
+    assert [example["id"] for example in response.json()] == [1, 2]
+    assert app_client.get("/api/examples/3").status_code == 404
@@ -0,0 +1,68 @@
+"""Token bucket rate limiting"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import RateLimitMiddleware, TokenBucketLimiter, add_rate_limiting
+from app.core.state import MemoryBackend
+
+
+def test_bucket_allows_a_burst_then_refills():
+    limiter = TokenBucketLimiter(rate=2.0, capacity=3)
+
+    assert [limiter.acquire("client", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("client", now=0.0) == 0.5
+    # Half a second later one token has been added
+    assert limiter.acquire("client", now=0.5) == 0.0
+    assert limiter.acquire("client", now=0.5) > 0
+    assert limiter.stats()["drops"] == 2
+
+
+def test_bucket_table_is_bounded():
+    limiter = TokenBucketLimiter(rate=1.0, capacity=5, max_keys=2)
+
+    for key in ("a", "b", "c"):
+        limiter.acquire(key, now=0.0)
+
+    assert limiter.stats()["tracked_keys"] == 2
+    # "a" was evicted, so it starts again with a full bucket
+    assert [limiter.acquire("a", now=0.0) for _ in range(5)] == [0.0] * 5
+
+
+def client_ip(peer: str, forwarded_for: str = None) -> str:
+    middleware = RateLimitMiddleware(None, trusted_proxies=["10.0.0.0/8"])
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return middleware._get_client_ip({"client": (peer, 1234), "headers": headers})
+
+
+def test_forwarded_for_is_used_behind_trusted_proxies():
+    assert client_ip("10.0.0.1", "203.0.113.7") == "203.0.113.7"
+    # Trusted hops are skipped from the right; a spoofed left-most entry is not used
+    assert client_ip("10.0.0.1", "198.51.100.1, 203.0.113.7, 10.0.0.2") == "203.0.113.7"
+    assert client_ip("10.0.0.1") == "10.0.0.1"
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers():
+    assert client_ip("203.0.113.7", "198.51.100.1") == "203.0.113.7"
+
+
+def make_client(backend=None) -> TestClient:
+    app = FastAPI()
+    app.get("/api")(lambda: {"ok": True})
+    app.get("/health")(lambda: {"status": "ok"})
+    add_rate_limiting(app, limit=2, window=60, backend=backend)
+    return TestClient(app)
+
+
+def test_requests_over_the_limit_get_429_with_retry_after():
+    for backend in (None, MemoryBackend()):
+        client = make_client(backend)
+
+        assert [client.get("/api").status_code for _ in range(2)] == [200, 200]
+        response = client.get("/api")
+
+        assert response.status_code == 429
+        # One token per 30 seconds
+        assert response.headers["retry-after"] == "30"
+        # Exempt paths are never limited
+        assert client.get("/health").status_code == 200
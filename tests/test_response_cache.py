@@ -0,0 +1,153 @@
+"""Response cache: single flight, TTL/LRU, stale-while-revalidate and keys"""
+
+import asyncio
+import itertools
+
+from fastapi import Depends, FastAPI, Header
+from fastapi.testclient import TestClient
+
+from app.core.response_cache import ResponseCache, cached_response
+
+
+def counter():
+    """An async compute function returning 1, 2, 3... and counting its calls"""
+    values = itertools.count(1)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return next(values)
+
+    return compute
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ResponseCache("test", ttl=60)
+    compute = counter()
+
+    async def run():
+        return await asyncio.gather(*(cache.get("key", compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1, 1, 1, 1, 1]
+    assert (cache.misses, cache.coalesced) == (1, 4)
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    cache = ResponseCache("test", ttl=60)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "value"
+
+        leader = asyncio.create_task(cache.get("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get("key", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader, await waiter
+
+    leader, value = asyncio.run(run())
+    assert leader.cancelled()
+    assert value == "value"
+    assert len(cache) == 1
+
+
+def test_last_cancelled_caller_cancels_the_computation():
+    cache = ResponseCache("test", ttl=60)
+    cancelled = []
+
+    async def run():
+        async def compute():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        caller = asyncio.create_task(cache.get("key", compute))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert cancelled == [True]
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache("test", ttl=0.05)
+    compute = counter()
+
+    async def run():
+        first = await cache.get("key", compute)
+        cached = await cache.get("key", compute)
+        await asyncio.sleep(0.06)
+        return first, cached, await cache.get("key", compute)
+
+    assert asyncio.run(run()) == (1, 1, 2)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache("test", ttl=60, max_entries=2)
+
+    async def run():
+        for key in ("a", "b"):
+            await cache.get(key, counter())
+        await cache.get("a", counter())  # a is now the most recently used
+        await cache.get("c", counter())
+
+    asyncio.run(run())
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_stale_entry_is_served_while_refreshed():
+    cache = ResponseCache("test", ttl=0.05, stale_ttl=60)
+    compute = counter()
+
+    async def run():
+        await cache.get("key", compute)
+        await asyncio.sleep(0.06)
+        stale = await cache.get("key", compute)
+        await asyncio.sleep(0.05)  # let the background refresh finish
+        return stale, await cache.get("key", compute)
+
+    assert asyncio.run(run()) == (1, 2)
+    assert (cache.stale_hits, cache.hits) == (1, 1)
+
+
+def test_keys_isolate_queries_credentials_and_principals():
+    principals = {"token-a": "alice", "token-b": "bob", "token-c": "alice"}
+    calls = itertools.count(1)
+
+    def current_user(authorization: str = Header("")):
+        return principals.get(authorization.removeprefix("Bearer "), "anonymous")
+
+    app = FastAPI()
+
+    @app.get("/items")
+    @cached_response(ttl=60, name="test_items")
+    async def items(q: str = ""):
+        return {"q": q, "call": next(calls)}
+
+    @app.get("/me")
+    @cached_response(ttl=60, vary_on_auth=False, vary_on=lambda params: params["user"], name="test_me")
+    async def me(user: str = Depends(current_user)):
+        return {"user": user, "call": next(calls)}
+
+    with TestClient(app) as client:
+        first = client.get("/items", params={"q": "x"}).json()
+        assert client.get("/items", params={"q": "x"}).json() == first
+        assert client.get("/items", params={"q": "y"}).json() != first
+        assert client.get("/items", params={"q": "x"}, headers={"Authorization": "Bearer token-a"}).json() != first
+
+        alice = client.get("/me", headers={"Authorization": "Bearer token-a"}).json()
+        bob = client.get("/me", headers={"Authorization": "Bearer token-b"}).json()
+        assert (alice["user"], bob["user"]) == ("alice", "bob")
+        # Another token of the same principal shares the entry
+        assert client.get("/me", headers={"Authorization": "Bearer token-c"}).json() == alice
@@ -0,0 +1,174 @@
+"""Password hashing, token verification and the auth endpoints"""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.core import security
+from app.core.security import check_password, get_password_hash, hash_password, verify_password
+from app.core.state import MemoryBackend
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    """Minimum bcrypt cost, so the tests do not spend seconds hashing"""
+    monkeypatch.setattr(security.settings, "bcrypt_rounds", 4)
+    security.get_pwd_context.cache_clear()
+    yield
+    security.get_pwd_context.cache_clear()
+
+
+def test_verify_password():
+    hashed = get_password_hash("secret")
+
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_check_password_in_pool():
+    hashed = asyncio.run(hash_password("secret"))
+
+    assert asyncio.run(check_password("secret", hashed)) == (True, None)
+    assert asyncio.run(check_password("wrong", hashed))[0] is False
+    # Unknown users still pay for a verification, and never succeed
+    assert asyncio.run(check_password("secret", None)) == (False, None)
+
+
+def test_check_password_rehashes_other_cost():
+    from passlib.hash import bcrypt
+
+    hashed = bcrypt.using(rounds=5).hash("secret")
+    ok, new_hash = asyncio.run(check_password("secret", hashed))
+
+    assert ok
+    assert new_hash is not None and new_hash.startswith("$2b$04$")
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    """A fresh verified-token cache and shared revocation store"""
+    cache = security.VerifiedTokenCache(max_revoked=2)
+    monkeypatch.setattr(security, "token_cache", cache)
+    monkeypatch.setattr(security, "shared_state", MemoryBackend())
+    return cache
+
+
+def make_token(username: str = "demo", **expires) -> str:
+    return security.create_access_token({"sub": username, "roles": ["user"]}, timedelta(**(expires or {"minutes": 5})))
+
+
+def test_verified_tokens_are_cached(token_cache, monkeypatch):
+    token = make_token()
+
+    assert security.verify_token(token).username == "demo"
+    # The second verification never decodes the token
+    monkeypatch.setattr(security, "_decode_token", lambda token: pytest.fail("token decoded twice"))
+    assert security.verify_token(token).username == "demo"
+    assert (token_cache.hits, token_cache.misses) == (1, 1)
+
+
+def test_cached_tokens_expire(token_cache):
+    token = make_token(seconds=1)
+    assert security.verify_token(token) is not None
+
+    digest = token_cache.digest(token)
+    token_data, _ = token_cache._entries[digest]
+    token_cache._entries[digest] = (token_data, time.time() - 1)
+
+    assert token_cache.get(digest) is None
+    assert len(token_cache) == 0
+
+
+def test_tokens_without_expiry_are_rejected(token_cache):
+    token = jwt.encode({"sub": "demo"}, security.settings.secret_key, algorithm="HS256")
+
+    assert security.verify_token(token) is None
+
+
+def test_revoked_tokens_fail_verification(token_cache):
+    token = make_token()
+    assert security.verify_token(token) is not None
+
+    asyncio.run(security.revoke_token(token))
+
+    assert security.verify_token(token) is None
+    assert len(token_cache) == 0
+
+
+def test_revocations_are_bounded(token_cache):
+    tokens = [make_token(minutes=minutes) for minutes in (1, 2, 3)]
+    for token in tokens:
+        token_cache.revoke(token)
+
+    # The revocation closest to expiry made room for the newest one
+    assert [token_cache.is_revoked(token_cache.digest(token)) for token in tokens] == [False, True, True]
+
+
+def test_me_requires_a_valid_token(app_client, token_cache):
+    assert app_client.get("/api/auth/me").status_code == 401
+    assert app_client.get("/api/auth/me", headers={"Authorization": "Bearer nonsense"}).status_code == 401
+
+
+def test_me_is_cached_per_user(app_client, token_cache):
+    from app.api.auth import read_users_me
+
+    read_users_me.cache.clear()
+    hits = read_users_me.cache.hits
+    alice = {"Authorization": f"Bearer {make_token('alice')}"}
+    bob = {"Authorization": f"Bearer {make_token('bob')}"}
+
+    assert app_client.get("/api/auth/me", headers=alice).json()["username"] == "alice"
+    assert app_client.get("/api/auth/me", headers=bob).json()["username"] == "bob"
+    assert app_client.get("/api/auth/me", headers=alice).json()["username"] == "alice"
+    assert read_users_me.cache.hits == hits + 1
+
+
+def test_logout_revokes_the_token(app_client, token_cache):
+    headers = {"Authorization": f"Bearer {make_token()}"}
+    assert app_client.get("/api/auth/me", headers=headers).status_code == 200
+
+    assert app_client.post("/api/auth/logout", headers=headers).status_code == 204
+    assert app_client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_revocation_reaches_other_workers(app_client, token_cache):
+    token = make_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert app_client.get("/api/auth/me", headers=headers).status_code == 200
+
+    # Another worker revoked the token: only the shared state knows
+    asyncio.run(security.shared_state.aset(security._revocation_key(token), True, ttl=60))
+
+    assert app_client.get("/api/auth/me", headers=headers).status_code == 401
+    assert token_cache.is_revoked(token_cache.digest(token))
+
+
+def login(app_client, password: str = "password"):
+    return app_client.post("/api/auth/token", data={"username": "demo", "password": password})
+
+
+def test_login_rehashes_outdated_hash(app_client, monkeypatch):
+    from passlib.hash import bcrypt
+
+    from app.api.auth import fake_users_db
+
+    monkeypatch.setitem(fake_users_db["demo"], "hashed_password", bcrypt.using(rounds=5).hash("password"))
+
+    response = login(app_client)
+
+    assert response.status_code == 200
+    assert security.verify_token(response.json()["access_token"]).username == "demo"
+    assert fake_users_db["demo"]["hashed_password"].startswith("$2b$04$")
+    assert login(app_client, "wrong").status_code == 401
+
+
+def test_login_is_refused_while_password_pool_is_saturated(app_client, monkeypatch):
+    monkeypatch.setattr(security.password_pool, "max_pending", 0)
+
+    response = login(app_client)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,101 @@
+"""Token bucket and TTL semantics shared by every state backend"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.core.state import MemoryBackend, RedisBackend, SQLiteBackend
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(tmp_path / "state.sqlite3")
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        backend = RedisBackend(client=fakeredis.FakeRedis())
+    yield backend
+    backend.close()
+
+
+def test_bucket_allows_capacity_then_waits(backend):
+    assert [backend.take_token("client", rate=1.0, capacity=3) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait = backend.take_token("client", rate=1.0, capacity=3)
+    assert 0 < wait <= 1.0
+    # Other keys have their own bucket
+    assert backend.take_token("other", rate=1.0, capacity=3) == 0.0
+
+
+def test_bucket_refills_over_time(backend):
+    backend.take_token("client", rate=20.0, capacity=1)
+    assert backend.take_token("client", rate=20.0, capacity=1) > 0
+
+    time.sleep(0.1)
+    assert backend.take_token("client", rate=20.0, capacity=1) == 0.0
+
+
+def test_values_round_trip_and_delete(backend):
+    assert backend.get("missing") is None
+
+    backend.set("key", {"ok": True, "items": [1, 2]})
+    assert backend.get("key") == {"ok": True, "items": [1, 2]}
+
+    backend.set("flag", False)
+    assert backend.get("flag") is False
+
+    backend.delete("key")
+    assert backend.get("key") is None
+
+
+def test_values_expire_after_ttl(backend):
+    backend.set("short", 1, ttl=0.05)
+    backend.set("long", 2, ttl=60)
+
+    assert backend.get("short") == 1
+    time.sleep(0.1)
+    assert backend.get("short") is None
+    assert backend.get("long") == 2
+
+
+def test_async_methods(backend):
+    async def run():
+        await backend.aset("key", "value", ttl=60)
+        value = await backend.aget("key")
+        await backend.adelete("key")
+        return value, await backend.aget("key"), await backend.atake_token("client", 1.0, 1)
+
+    assert asyncio.run(run()) == ("value", None, 0.0)
+
+
+def test_sqlite_gives_up_quickly_on_a_locked_database(tmp_path):
+    backend = SQLiteBackend(tmp_path / "state.sqlite3", busy_timeout_ms=20)
+    backend.set("key", 1)
+
+    other = sqlite3.connect(tmp_path / "state.sqlite3", isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError):
+            backend.take_token("client", 1.0, 1)
+        assert time.monotonic() - started < 1.0
+    finally:
+        other.rollback()
+        other.close()
+        backend.close()
+
+
+def test_backends_must_implement_the_interface():
+    from app.core.state import StateBackend
+
+    class Incomplete(StateBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
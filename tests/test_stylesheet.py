@@ -0,0 +1,31 @@
+"""CSS minification"""
+
+from app.core.stylesheet import minify_css
+
+
+def test_minify_strips_comments_and_whitespace():
+    css = """
+    /* header */
+    .hero ,  .card > p {
+        color : red ;
+        margin: 0 auto;
+    }
+    """
+    assert minify_css(css) == ".hero,.card>p{color:red;margin:0 auto}"
+
+
+def test_minify_keeps_descendant_pseudo_class_selectors():
+    assert minify_css(".a :hover { color: red; }") == ".a :hover{color:red}"
+    assert minify_css(".a:hover , .b ::before{content: 'x'}") == ".a:hover,.b ::before{content:'x'}"
+
+
+def test_minify_handles_media_queries_and_nesting():
+    css = "@media (min-width : 600px) { .a :focus { outline : none } }"
+    assert minify_css(css) == "@media (min-width :600px){.a :focus{outline:none}}"
+
+
+def test_minify_leaves_quoted_strings_untouched():
+    css = """.a::before { content: "a: b ,  c" ; } .b { font-family: 'Inter , sans' } /* it's "ok" */"""
+    assert minify_css(css) == """.a::before{content:"a: b ,  c"}.b{font-family:'Inter , sans'}"""
+    # Comment markers and escaped quotes inside strings are text
+    assert minify_css(r""".c { content: "/* \"x\" */" }""") == r""".c{content:"/* \"x\" */"}"""
@@ -0,0 +1,118 @@
+"""Router and model discovery through the module manifest"""
+
+import json
+import os
+import textwrap
+
+import pytest
+from pydantic import BaseModel
+
+from app.core import utils
+
+ROUTER_MODULE = """
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/{name}")
+
+@router.get("/")
+def index():
+    return {{}}
+"""
+
+AGGREGATE_MODULE = """
+from fastapi import APIRouter
+
+from {package}.first import router as first_router
+from {package}.second import router as second_router
+
+api_router = APIRouter()
+api_router.include_router(first_router)
+api_router.include_router(second_router)
+"""
+
+MODEL_MODULE = """
+from pydantic import BaseModel
+
+class Item(BaseModel):
+    name: str
+"""
+
+
+@pytest.fixture
+def manifest_path(tmp_path, monkeypatch):
+    path = tmp_path / "module_manifest.json"
+    monkeypatch.setattr(utils.settings, "module_manifest_path", str(path))
+    return path
+
+
+@pytest.fixture
+def make_package(tmp_path, monkeypatch):
+    """Write an importable package of the given modules; returns its name and directory"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def make(name: str, **modules: str):
+        package_dir = tmp_path / name
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text("")
+        for module_name, source in modules.items():
+            (package_dir / f"{module_name}.py").write_text(textwrap.dedent(source))
+        return name, package_dir
+
+    return make
+
+
+def scan_models(package: str, package_dir):
+    return utils._scan_subclasses(BaseModel, package, package_dir)
+
+
+def test_manifest_is_reused_while_sources_are_unchanged(manifest_path, make_package):
+    package, package_dir = make_package("manifest_models", items=MODEL_MODULE)
+
+    first = utils._cached_discovery("models", package_dir, lambda: scan_models(package, package_dir))
+    again = utils._cached_discovery("models", package_dir, lambda: pytest.fail("package scanned again"))
+
+    assert [model.__name__ for model in first] == ["Item"]
+    assert again == first
+    assert json.loads(manifest_path.read_text())["entries"]["models"]["objects"] == [[f"{package}.items", "Item"]]
+
+
+def test_changed_module_invalidates_the_manifest(manifest_path, make_package):
+    package, package_dir = make_package("mtime_models", items=MODEL_MODULE)
+    utils._cached_discovery("models", package_dir, lambda: scan_models(package, package_dir))
+
+    stat = (package_dir / "items.py").stat()
+    os.utime(package_dir / "items.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    scans = []
+
+    def scan():
+        scans.append(True)
+        return scan_models(package, package_dir)
+
+    utils._cached_discovery("models", package_dir, scan)
+    assert scans == [True]
+
+
+def test_routers_included_by_another_are_skipped(manifest_path, make_package):
+    package, package_dir = make_package(
+        "dedupe_api",
+        first=ROUTER_MODULE.format(name="first"),
+        second=ROUTER_MODULE.format(name="second"),
+        router=AGGREGATE_MODULE.format(package="dedupe_api"),
+    )
+
+    objects, complete = utils._scan_routers(package, package_dir)
+
+    # first.router and second.router are also imported into router.py under other names
+    assert objects == [[f"{package}.router", "api_router"]]
+    assert complete
+
+
+def test_failed_import_is_not_written_to_the_manifest(manifest_path, make_package):
+    package, package_dir = make_package(
+        "broken_api", first=ROUTER_MODULE.format(name="first"), broken="raise RuntimeError('boom')\n"
+    )
+
+    routers = utils._cached_discovery("routers", package_dir, lambda: utils._scan_routers(package, package_dir))
+
+    assert [router.prefix for router in routers] == ["/first"]
+    assert not manifest_path.exists()
@@ -0,0 +1,78 @@
+"""Routing, forwarding and metrics merging of the multi-worker proxy"""
+
+import asyncio
+
+import httpx
+
+from app.core.workers import StickyProxy, merge_worker_metrics
+
+
+def test_socketio_requests_stick_to_the_tagged_worker():
+    proxy = StickyProxy([8001, 8002, 8003])
+
+    assert proxy.route("/_nicegui_ws/socket.io/", b"client_id=abc&worker=2&EIO=4") == 2
+    # Later requests of the client are routed by id, whatever their tag says
+    assert proxy.route("/_nicegui_ws/socket.io/", b"client_id=abc&EIO=4&sid=x") == 2
+    assert proxy.route("/_nicegui/client/abc/upload/1", b"") == 2
+
+
+def test_other_requests_are_spread_round_robin():
+    proxy = StickyProxy([8001, 8002])
+
+    assert [proxy.route("/", b"") for _ in range(4)] == [0, 1, 0, 1]
+
+
+def test_out_of_range_tags_are_ignored():
+    proxy = StickyProxy([8001, 8002])
+
+    index = proxy.route("/_nicegui_ws/socket.io/", b"client_id=abc&worker=7")
+    assert index in (0, 1)
+    assert "abc" not in proxy.owners
+
+
+def test_forwarded_responses_drop_hop_by_hop_and_server_headers():
+    def upstream(request):
+        return httpx.Response(200, content=b"ok", headers=[
+            ("content-type", "text/plain"), ("date", "Mon, 01 Jan 2024 00:00:00 GMT"),
+            ("server", "uvicorn"), ("connection", "keep-alive"), ("x-worker", "0"),
+        ])
+
+    proxy = StickyProxy([8001])
+    proxy._transports[0] = httpx.MockTransport(upstream)
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "raw_path": b"/", "query_string": b"",
+             "headers": [(b"host", b"example.com")], "client": ("203.0.113.7", 1234), "scheme": "http"}
+    asyncio.run(proxy._forward_http(0, scope, receive, send))
+
+    # The proxy's own server adds date and server once
+    names = [name.lower() for name, _ in sent[0]["headers"]]
+    assert sorted(names) == [b"content-length", b"content-type", b"x-worker"]
+    assert b"".join(message.get("body", b"") for message in sent[1:]) == b"ok"
+
+
+def test_merge_worker_metrics_labels_samples_by_worker():
+    text = (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{method="GET"} 2.0\n'
+        "# HELP clients Connected clients\n"
+        "# TYPE clients gauge\n"
+        "clients 3.0\n"
+    )
+
+    merged = merge_worker_metrics({0: text, 1: text, 2: None}).splitlines()
+
+    assert merged.count("# TYPE requests_total counter") == 1
+    assert 'requests_total{worker="0",method="GET"} 2.0' in merged
+    assert 'requests_total{worker="1",method="GET"} 2.0' in merged
+    assert 'clients{worker="1"} 3.0' in merged
+    assert 'worker_up{worker="2"} 0' in merged
+    # Samples of a family follow its own TYPE line
+    assert merged.index('requests_total{worker="1",method="GET"} 2.0') < merged.index("# TYPE clients gauge")